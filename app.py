@@ -1,8 +1,10 @@
 import streamlit as st
 from utils.styles import inject_mobile_css
-from utils.helpers import bottom_nav, is_coach_view
-from utils.supabase_client import fetch_all, fetch_view, confirm_request, update_row
+from utils.helpers import bottom_nav, is_coach_view, session_emoji
+from utils.supabase_client import fetch_all, fetch_sessions, fetch_view, confirm_request, update_row
 from utils.auth import login_gate, logout
+from utils.cards import show_cards
+from utils import leaderboard
 
 st.set_page_config(
     page_title="StringerS Badminton Academy",
@@ -61,40 +63,24 @@ st.markdown(
     unsafe_allow_html=True,
 )
 
-sessions = fetch_view("session_slots")
-if not sessions:
+upcoming = fetch_sessions(upcoming=True)
+if not upcoming:
     st.info("No upcoming sessions. Ask your coach to create one!")
 else:
-    from datetime import date as dt_date
-
-    upcoming = [s for s in sessions if s["date"] >= str(dt_date.today())]
-    upcoming.sort(key=lambda s: (s["date"], s["slot"]))
-
-    if not upcoming:
-        st.info("No upcoming sessions. Check back soon!")
-    else:
-        for s in upcoming:
-            slots_left = s.get("slots_left", "?")
-            confirmed = s.get("confirmed_count", 0)
-            pending = s.get("pending_count", 0)
-            slot_emoji = "🌅" if s["slot"] == "morning" else "🌆"
-
-            venue = s.get('venue', 'Pro-Sports')
-            courts = s.get('court_numbers', '1')
-
-            st.markdown(f"""
-            <div class="game-card">
-                <h3>{slot_emoji} {s['date']}  &bull;  {s['slot'].title()}</h3>
-                <p>
-                    <span class="material-symbols-rounded" style="font-size:16px;vertical-align:middle;">location_on</span>
-                    {venue} — Court {courts} &nbsp;|&nbsp;
-                    💰 ₹{s.get('fee_per_player', 0)} per player
-                </p>
-                <p>🟢 {confirmed} confirmed &nbsp;|&nbsp;
-                   ⏳ {pending} pending &nbsp;|&nbsp;
-                   <strong>{slots_left} slots left</strong></p>
-            </div>
-            """, unsafe_allow_html=True)
+    show_cards("session", [
+        {
+            "emoji": session_emoji(s),
+            "date": s["date"],
+            "slot": s["slot"],
+            "venue": s.get("venue", "Pro-Sports"),
+            "courts": s.get("court_numbers", "1"),
+            "fee": s.get("fee_per_player", 0),
+            "confirmed": s.get("confirmed_count", 0),
+            "pending": s.get("pending_count", 0),
+            "slots_left": s.get("slots_left", "?"),
+        }
+        for s in upcoming
+    ])
 
 st.divider()
 
@@ -113,6 +99,15 @@ if my_bal:
     c2.metric("Paid", f"₹{my_bal.get('total_paid', 0):.0f}")
     c3.metric("Due", f"₹{my_bal.get('balance_due', 0):.0f}")
 
+_ranks = leaderboard.my_ranks(current["id"])
+_badges = [
+    f"#{r['rank']} {leaderboard.METRICS[metric].lower()}"
+    for metric in leaderboard.METRICS
+    if (r := _ranks.get(("month", metric))) and r.get("rank")
+]
+if _badges:
+    st.caption("🏆 This month: " + " • ".join(_badges))
+
 st.divider()
 
 # ── Activity Center ──
@@ -0,0 +1,134 @@
+-- ============================================================
+-- Migration v10 — Venues and courts as data, no double-booked courts
+-- Run this in Supabase SQL Editor
+-- ============================================================
+
+CREATE EXTENSION IF NOT EXISTS btree_gist;   -- '=' on venue inside a GiST index
+CREATE EXTENSION IF NOT EXISTS intarray;     -- '&&' on court arrays inside a GiST index
+
+-- 1. Venues and their courts (replaces the VENUES dict in utils/supabase_client.py)
+CREATE TABLE IF NOT EXISTS venues (
+    name       TEXT PRIMARY KEY,
+    is_active  BOOLEAN DEFAULT TRUE,
+    created_at TIMESTAMPTZ DEFAULT NOW()
+);
+
+CREATE TABLE IF NOT EXISTS courts (
+    venue  TEXT NOT NULL REFERENCES venues(name) ON UPDATE CASCADE ON DELETE CASCADE,
+    number INTEGER NOT NULL CHECK (number >= 1),
+    PRIMARY KEY (venue, number)
+);
+
+INSERT INTO venues (name) VALUES ('Pro-Sports'), ('Hermes') ON CONFLICT DO NOTHING;
+INSERT INTO courts (venue, number)
+SELECT 'Pro-Sports', n FROM generate_series(1, 3) n
+UNION ALL
+SELECT 'Hermes', n FROM generate_series(1, 7) n
+ON CONFLICT DO NOTHING;
+
+ALTER TABLE venues ENABLE ROW LEVEL SECURITY;
+ALTER TABLE courts ENABLE ROW LEVEL SECURITY;
+CREATE POLICY "allow_all_venues" ON venues FOR ALL USING (true) WITH CHECK (true);
+CREATE POLICY "allow_all_courts" ON courts FOR ALL USING (true) WITH CHECK (true);
+
+-- The hard-coded venue CHECK gives way to a foreign key
+ALTER TABLE sessions DROP CONSTRAINT IF EXISTS sessions_venue_check;
+ALTER TABLE sessions ADD CONSTRAINT sessions_venue_fkey
+    FOREIGN KEY (venue) REFERENCES venues(name) ON UPDATE CASCADE;
+ALTER TABLE session_series ADD CONSTRAINT session_series_venue_fkey
+    FOREIGN KEY (venue) REFERENCES venues(name) ON UPDATE CASCADE;
+
+-- 2. Typed courts and booking period on sessions
+--    courts is the source of truth; court_numbers / num_courts are kept in
+--    step by the trigger below for display.
+ALTER TABLE sessions ADD COLUMN IF NOT EXISTS courts           INTEGER[];
+ALTER TABLE sessions ADD COLUMN IF NOT EXISTS duration_minutes INTEGER NOT NULL DEFAULT 120
+    CHECK (duration_minutes > 0);
+ALTER TABLE sessions ADD COLUMN IF NOT EXISTS period           TSRANGE;
+ALTER TABLE session_series ADD COLUMN IF NOT EXISTS courts           INTEGER[];
+ALTER TABLE session_series ADD COLUMN IF NOT EXISTS duration_minutes INTEGER NOT NULL DEFAULT 120;
+
+-- Slot text ('07:30 PM', or the pre-v5 'morning'/'evening') → start time
+CREATE OR REPLACE FUNCTION slot_start_time(slot TEXT)
+RETURNS TIME
+LANGUAGE sql IMMUTABLE AS $$
+    SELECT CASE lower(trim(slot))
+        WHEN 'morning' THEN TIME '07:00'
+        WHEN 'evening' THEN TIME '19:00'
+        ELSE to_timestamp(trim(slot), 'HH12:MI AM')::time
+    END;
+$$;
+
+CREATE OR REPLACE FUNCTION sessions_sync_courts()
+RETURNS TRIGGER
+LANGUAGE plpgsql AS $$
+BEGIN
+    IF NEW.courts IS NULL THEN
+        NEW.courts := string_to_array(NEW.court_numbers, ',')::INTEGER[];
+    END IF;
+    NEW.courts        := uniq(sort(NEW.courts));
+    NEW.court_numbers := array_to_string(NEW.courts, ',');
+    NEW.num_courts    := cardinality(NEW.courts);
+    NEW.period        := tsrange(
+        NEW.date + slot_start_time(NEW.slot),
+        NEW.date + slot_start_time(NEW.slot) + make_interval(mins => NEW.duration_minutes)
+    );
+    RETURN NEW;
+END $$;
+
+DROP TRIGGER IF EXISTS sessions_sync_courts ON sessions;
+CREATE TRIGGER sessions_sync_courts
+    BEFORE INSERT OR UPDATE ON sessions
+    FOR EACH ROW EXECUTE FUNCTION sessions_sync_courts();
+
+-- Backfill existing rows through the trigger
+UPDATE sessions SET courts = string_to_array(court_numbers, ',')::INTEGER[];
+UPDATE session_series SET courts = string_to_array(court_numbers, ',')::INTEGER[];
+
+ALTER TABLE sessions ALTER COLUMN courts SET NOT NULL;
+ALTER TABLE sessions ALTER COLUMN period SET NOT NULL;
+
+-- 3. No two sessions may hold the same court at the same venue at overlapping
+--    times. If this fails, list the existing clashes with:
+--      SELECT a.id, b.id, a.venue, a.period, a.courts & b.courts
+--      FROM sessions a JOIN sessions b
+--        ON a.id < b.id AND a.venue = b.venue AND a.courts && b.courts AND a.period && b.period;
+ALTER TABLE sessions DROP CONSTRAINT IF EXISTS sessions_no_court_overlap;
+ALTER TABLE sessions ADD CONSTRAINT sessions_no_court_overlap
+    EXCLUDE USING gist (venue WITH =, courts gist__int_ops WITH &&, period WITH &&);
+
+-- 4. Which courts at a venue are free for a given start and duration?
+--    Answered from the exclusion constraint's GiST index.
+CREATE OR REPLACE FUNCTION free_courts(
+    p_venue   TEXT,
+    p_date    DATE,
+    p_start   TIME,
+    p_minutes INTEGER DEFAULT 120,
+    p_exclude UUID DEFAULT NULL       -- the session being edited
+)
+RETURNS TABLE (number INTEGER)
+LANGUAGE sql STABLE AS $$
+    SELECT c.number
+    FROM courts c
+    WHERE c.venue = p_venue
+      AND NOT EXISTS (
+          SELECT 1 FROM sessions s
+          WHERE s.venue = p_venue
+            AND s.courts && ARRAY[c.number]
+            AND s.period && tsrange(p_date + p_start, p_date + p_start + make_interval(mins => p_minutes))
+            AND s.id IS DISTINCT FROM p_exclude
+      )
+    ORDER BY c.number;
+$$;
+
+-- session_slots was created with s.* — recreate it so the new columns show up
+DROP VIEW IF EXISTS session_slots;
+CREATE VIEW session_slots AS
+SELECT
+    s.*,
+    s.max_players - COUNT(a.id) FILTER (WHERE a.status = 'confirmed') AS slots_left,
+    COUNT(a.id) FILTER (WHERE a.status = 'confirmed') AS confirmed_count,
+    COUNT(a.id) FILTER (WHERE a.status = 'pending')   AS pending_count
+FROM sessions s
+LEFT JOIN attendance a ON a.session_id = s.id
+GROUP BY s.id;
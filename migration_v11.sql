@@ -0,0 +1,56 @@
+-- ============================================================
+-- Migration v11 — Typed session start time
+-- Run this in Supabase SQL Editor
+-- ============================================================
+
+-- 1. start_time is the source of truth; slot stays as its display text
+--    ('07:30 PM'). Sorting and "upcoming" filters now run on (date, start_time)
+--    instead of comparing slot strings, where '07:30 PM' < '08:00 AM'.
+ALTER TABLE sessions ADD COLUMN IF NOT EXISTS start_time TIME;
+
+CREATE OR REPLACE FUNCTION sessions_sync_courts()
+RETURNS TRIGGER
+LANGUAGE plpgsql AS $$
+BEGIN
+    -- Whichever of start_time / slot the write changed wins; derive the other.
+    IF TG_OP = 'INSERT' THEN
+        IF NEW.start_time IS NULL THEN
+            NEW.start_time := slot_start_time(NEW.slot);
+        END IF;
+        NEW.slot := to_char(NEW.start_time, 'HH12:MI AM');
+    ELSIF NEW.start_time IS DISTINCT FROM OLD.start_time THEN
+        NEW.slot := to_char(NEW.start_time, 'HH12:MI AM');
+    ELSIF NEW.slot IS DISTINCT FROM OLD.slot THEN
+        NEW.start_time := slot_start_time(NEW.slot);
+    END IF;
+
+    IF NEW.courts IS NULL THEN
+        NEW.courts := string_to_array(NEW.court_numbers, ',')::INTEGER[];
+    END IF;
+    NEW.courts        := uniq(sort(NEW.courts));
+    NEW.court_numbers := array_to_string(NEW.courts, ',');
+    NEW.num_courts    := cardinality(NEW.courts);
+    NEW.period        := tsrange(
+        NEW.date + NEW.start_time,
+        NEW.date + NEW.start_time + make_interval(mins => NEW.duration_minutes)
+    );
+    RETURN NEW;
+END $$;
+
+-- 2. Backfill from slot (the trigger normalizes legacy 'morning'/'evening' too)
+UPDATE sessions SET start_time = slot_start_time(slot) WHERE start_time IS NULL;
+ALTER TABLE sessions ALTER COLUMN start_time SET NOT NULL;
+
+CREATE INDEX IF NOT EXISTS sessions_date_start_idx ON sessions (date, start_time);
+
+-- 3. Recreate session_slots so it exposes start_time
+DROP VIEW IF EXISTS session_slots;
+CREATE VIEW session_slots AS
+SELECT
+    s.*,
+    s.max_players - COUNT(a.id) FILTER (WHERE a.status = 'confirmed') AS slots_left,
+    COUNT(a.id) FILTER (WHERE a.status = 'confirmed') AS confirmed_count,
+    COUNT(a.id) FILTER (WHERE a.status = 'pending')   AS pending_count
+FROM sessions s
+LEFT JOIN attendance a ON a.session_id = s.id
+GROUP BY s.id;
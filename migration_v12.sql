@@ -0,0 +1,22 @@
+-- ============================================================
+-- Migration v12 — Saved court sheets
+-- Run this in Supabase SQL Editor
+-- ============================================================
+
+-- Which court and team each confirmed player was put on (utils/matchmaking.py).
+-- Past sheets are how the engine knows who has already partnered whom.
+CREATE TABLE IF NOT EXISTS court_assignments (
+    id         UUID DEFAULT gen_random_uuid() PRIMARY KEY,
+    session_id UUID NOT NULL REFERENCES sessions(id) ON DELETE CASCADE,
+    player_id  UUID NOT NULL REFERENCES players(id) ON DELETE CASCADE,
+    court      INTEGER NOT NULL,
+    team       SMALLINT NOT NULL CHECK (team IN (1, 2)),
+    created_at TIMESTAMPTZ DEFAULT NOW(),
+    UNIQUE (session_id, player_id)
+);
+
+CREATE INDEX IF NOT EXISTS court_assignments_player_idx
+    ON court_assignments (player_id, created_at DESC);
+
+ALTER TABLE court_assignments ENABLE ROW LEVEL SECURITY;
+CREATE POLICY "allow_all_court_assignments" ON court_assignments FOR ALL USING (true) WITH CHECK (true);
@@ -0,0 +1,154 @@
+-- ============================================================
+-- Migration v13 — Co-attendance graph
+-- Run this in Supabase SQL Editor
+-- ============================================================
+
+-- 1. Sparse, symmetric "played in the same session" counts, and per-player
+--    counts per weekly slot. Both are kept current by the triggers below as
+--    attendance rows become (or stop being) confirmed, so nothing ever has
+--    to self-join attendance over the full history again.
+CREATE TABLE IF NOT EXISTS co_attendance (
+    player_id  UUID NOT NULL REFERENCES players(id) ON DELETE CASCADE,
+    partner_id UUID NOT NULL REFERENCES players(id) ON DELETE CASCADE,
+    games      INTEGER NOT NULL DEFAULT 0,
+    updated_at TIMESTAMPTZ NOT NULL DEFAULT NOW(),
+    PRIMARY KEY (player_id, partner_id)
+);
+
+CREATE TABLE IF NOT EXISTS slot_attendance (
+    player_id  UUID NOT NULL REFERENCES players(id) ON DELETE CASCADE,
+    weekday    SMALLINT NOT NULL CHECK (weekday BETWEEN 1 AND 7),   -- ISO, 1 = Monday
+    start_time TIME NOT NULL,
+    games      INTEGER NOT NULL DEFAULT 0,
+    updated_at TIMESTAMPTZ NOT NULL DEFAULT NOW(),
+    PRIMARY KEY (player_id, weekday, start_time)
+);
+
+-- utils/coattendance.py tops up its in-memory copy from an updated_at watermark
+CREATE INDEX IF NOT EXISTS co_attendance_updated_idx   ON co_attendance (updated_at);
+CREATE INDEX IF NOT EXISTS slot_attendance_updated_idx ON slot_attendance (updated_at);
+
+ALTER TABLE co_attendance   ENABLE ROW LEVEL SECURITY;
+ALTER TABLE slot_attendance ENABLE ROW LEVEL SECURITY;
+CREATE POLICY "allow_all_co_attendance"   ON co_attendance   FOR ALL USING (true) WITH CHECK (true);
+CREATE POLICY "allow_all_slot_attendance" ON slot_attendance FOR ALL USING (true) WITH CHECK (true);
+
+-- 2. Statement-level triggers, so confirming a whole roster in one UPDATE
+--    (bulk_confirm) counts each new pair once. The pair deltas are the pairs
+--    of the session's confirmed set after the statement minus those before it.
+CREATE OR REPLACE FUNCTION apply_co_attendance(changes JSONB)
+RETURNS VOID
+LANGUAGE plpgsql AS $$
+BEGIN
+    IF jsonb_array_length(changes) = 0 THEN
+        RETURN;
+    END IF;
+
+    WITH changed AS (
+        SELECT * FROM jsonb_to_recordset(changes) AS c(session_id UUID, player_id UUID, delta INTEGER)
+    ),
+    after_set AS (
+        SELECT session_id, player_id FROM attendance
+        WHERE status = 'confirmed' AND session_id IN (SELECT session_id FROM changed)
+    ),
+    before_set AS (
+        (SELECT session_id, player_id FROM after_set
+         EXCEPT
+         SELECT session_id, player_id FROM changed WHERE delta > 0)
+        UNION
+        SELECT session_id, player_id FROM changed WHERE delta < 0
+    ),
+    pairs_after AS (
+        SELECT x.session_id, x.player_id AS a, y.player_id AS b
+        FROM after_set x JOIN after_set y ON y.session_id = x.session_id AND y.player_id <> x.player_id
+    ),
+    pairs_before AS (
+        SELECT x.session_id, x.player_id AS a, y.player_id AS b
+        FROM before_set x JOIN before_set y ON y.session_id = x.session_id AND y.player_id <> x.player_id
+    ),
+    deltas AS (
+        SELECT a, b, 1 AS d FROM (SELECT * FROM pairs_after EXCEPT SELECT * FROM pairs_before) gained
+        UNION ALL
+        SELECT a, b, -1 FROM (SELECT * FROM pairs_before EXCEPT SELECT * FROM pairs_after) lost
+    )
+    INSERT INTO co_attendance (player_id, partner_id, games)
+    SELECT a, b, SUM(d) FROM deltas GROUP BY a, b
+    ON CONFLICT (player_id, partner_id)
+    DO UPDATE SET games = co_attendance.games + EXCLUDED.games, updated_at = NOW();
+
+    -- Sessions removed by a cascading delete are already gone; skip their slot.
+    INSERT INTO slot_attendance (player_id, weekday, start_time, games)
+    SELECT c.player_id, EXTRACT(ISODOW FROM s.date), s.start_time, SUM(c.delta)
+    FROM jsonb_to_recordset(changes) AS c(session_id UUID, player_id UUID, delta INTEGER)
+    JOIN sessions s ON s.id = c.session_id
+    GROUP BY c.player_id, EXTRACT(ISODOW FROM s.date), s.start_time
+    ON CONFLICT (player_id, weekday, start_time)
+    DO UPDATE SET games = slot_attendance.games + EXCLUDED.games, updated_at = NOW();
+END $$;
+
+CREATE OR REPLACE FUNCTION co_attendance_on_insert()
+RETURNS TRIGGER
+LANGUAGE plpgsql AS $$
+BEGIN
+    PERFORM apply_co_attendance(COALESCE((
+        SELECT jsonb_agg(jsonb_build_object('session_id', session_id, 'player_id', player_id, 'delta', 1))
+        FROM new_rows WHERE status = 'confirmed'
+    ), '[]'::jsonb));
+    RETURN NULL;
+END $$;
+
+CREATE OR REPLACE FUNCTION co_attendance_on_update()
+RETURNS TRIGGER
+LANGUAGE plpgsql AS $$
+BEGIN
+    PERFORM apply_co_attendance(COALESCE((
+        SELECT jsonb_agg(jsonb_build_object(
+            'session_id', n.session_id, 'player_id', n.player_id,
+            'delta', CASE WHEN n.status = 'confirmed' THEN 1 ELSE -1 END))
+        FROM new_rows n JOIN old_rows o ON o.id = n.id
+        WHERE (n.status = 'confirmed') <> (o.status = 'confirmed')
+    ), '[]'::jsonb));
+    RETURN NULL;
+END $$;
+
+CREATE OR REPLACE FUNCTION co_attendance_on_delete()
+RETURNS TRIGGER
+LANGUAGE plpgsql AS $$
+BEGIN
+    PERFORM apply_co_attendance(COALESCE((
+        SELECT jsonb_agg(jsonb_build_object('session_id', session_id, 'player_id', player_id, 'delta', -1))
+        FROM old_rows WHERE status = 'confirmed'
+    ), '[]'::jsonb));
+    RETURN NULL;
+END $$;
+
+DROP TRIGGER IF EXISTS attendance_co_insert ON attendance;
+DROP TRIGGER IF EXISTS attendance_co_update ON attendance;
+DROP TRIGGER IF EXISTS attendance_co_delete ON attendance;
+CREATE TRIGGER attendance_co_insert AFTER INSERT ON attendance
+    REFERENCING NEW TABLE AS new_rows
+    FOR EACH STATEMENT EXECUTE FUNCTION co_attendance_on_insert();
+CREATE TRIGGER attendance_co_update AFTER UPDATE ON attendance
+    REFERENCING OLD TABLE AS old_rows NEW TABLE AS new_rows
+    FOR EACH STATEMENT EXECUTE FUNCTION co_attendance_on_update();
+CREATE TRIGGER attendance_co_delete AFTER DELETE ON attendance
+    REFERENCING OLD TABLE AS old_rows
+    FOR EACH STATEMENT EXECUTE FUNCTION co_attendance_on_delete();
+
+-- 3. One-time backfill from history
+INSERT INTO co_attendance (player_id, partner_id, games)
+SELECT a1.player_id, a2.player_id, COUNT(*)
+FROM attendance a1
+JOIN attendance a2
+  ON a2.session_id = a1.session_id AND a2.player_id <> a1.player_id AND a2.status = 'confirmed'
+WHERE a1.status = 'confirmed'
+GROUP BY a1.player_id, a2.player_id
+ON CONFLICT (player_id, partner_id) DO UPDATE SET games = EXCLUDED.games, updated_at = NOW();
+
+INSERT INTO slot_attendance (player_id, weekday, start_time, games)
+SELECT a.player_id, EXTRACT(ISODOW FROM s.date), s.start_time, COUNT(*)
+FROM attendance a
+JOIN sessions s ON s.id = a.session_id
+WHERE a.status = 'confirmed'
+GROUP BY a.player_id, EXTRACT(ISODOW FROM s.date), s.start_time
+ON CONFLICT (player_id, weekday, start_time) DO UPDATE SET games = EXCLUDED.games, updated_at = NOW();
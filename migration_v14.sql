@@ -0,0 +1,94 @@
+-- ============================================================
+-- Migration v14 — Rating history and running skill profiles
+-- Run this in Supabase SQL Editor
+-- ============================================================
+
+-- 1. ratings becomes an append-only history: every save is a new row
+ALTER TABLE ratings DROP CONSTRAINT IF EXISTS ratings_player_id_rated_by_key;
+CREATE INDEX IF NOT EXISTS ratings_player_rated_at_idx ON ratings (player_id, rated_at);
+
+CREATE OR REPLACE FUNCTION ratings_append_only()
+RETURNS TRIGGER
+LANGUAGE plpgsql AS $$
+BEGIN
+    RAISE EXCEPTION 'ratings are append-only; insert a new rating instead';
+END $$;
+
+DROP TRIGGER IF EXISTS ratings_no_update ON ratings;
+CREATE TRIGGER ratings_no_update
+    BEFORE UPDATE ON ratings
+    FOR EACH ROW EXECUTE FUNCTION ratings_append_only();
+
+-- 2. One row per player with running count, mean and EWMA per dimension,
+--    updated in O(1) as each rating is inserted.
+CREATE TABLE IF NOT EXISTS rating_profiles (
+    player_id          UUID PRIMARY KEY REFERENCES players(id) ON DELETE CASCADE,
+    n                  INTEGER NOT NULL DEFAULT 0,
+    mean_footwork      DOUBLE PRECISION,
+    mean_stamina       DOUBLE PRECISION,
+    mean_smash_power   DOUBLE PRECISION,
+    mean_net_play      DOUBLE PRECISION,
+    ewma_footwork      DOUBLE PRECISION,
+    ewma_stamina       DOUBLE PRECISION,
+    ewma_smash_power   DOUBLE PRECISION,
+    ewma_net_play      DOUBLE PRECISION,
+    last_rated_at      TIMESTAMPTZ,
+    updated_at         TIMESTAMPTZ DEFAULT NOW()
+);
+
+ALTER TABLE rating_profiles ENABLE ROW LEVEL SECURITY;
+CREATE POLICY "allow_all_rating_profiles" ON rating_profiles FOR ALL USING (true) WITH CHECK (true);
+
+-- The newest rating carries 0.3 of the EWMA, so profiles follow recent form.
+CREATE OR REPLACE FUNCTION apply_rating(r ratings)
+RETURNS VOID
+LANGUAGE sql AS $$
+    INSERT INTO rating_profiles AS p (
+        player_id, n,
+        mean_footwork, mean_stamina, mean_smash_power, mean_net_play,
+        ewma_footwork, ewma_stamina, ewma_smash_power, ewma_net_play,
+        last_rated_at
+    )
+    VALUES (
+        r.player_id, 1,
+        r.footwork, r.stamina, r.smash_power, r.net_play,
+        r.footwork, r.stamina, r.smash_power, r.net_play,
+        r.rated_at
+    )
+    ON CONFLICT (player_id) DO UPDATE SET
+        n                = p.n + 1,
+        mean_footwork    = p.mean_footwork    + (r.footwork    - p.mean_footwork)    / (p.n + 1),
+        mean_stamina     = p.mean_stamina     + (r.stamina     - p.mean_stamina)     / (p.n + 1),
+        mean_smash_power = p.mean_smash_power + (r.smash_power - p.mean_smash_power) / (p.n + 1),
+        mean_net_play    = p.mean_net_play    + (r.net_play    - p.mean_net_play)    / (p.n + 1),
+        ewma_footwork    = 0.3 * r.footwork    + 0.7 * p.ewma_footwork,
+        ewma_stamina     = 0.3 * r.stamina     + 0.7 * p.ewma_stamina,
+        ewma_smash_power = 0.3 * r.smash_power + 0.7 * p.ewma_smash_power,
+        ewma_net_play    = 0.3 * r.net_play    + 0.7 * p.ewma_net_play,
+        last_rated_at    = GREATEST(p.last_rated_at, r.rated_at),
+        updated_at       = NOW();
+$$;
+
+CREATE OR REPLACE FUNCTION ratings_apply_profile()
+RETURNS TRIGGER
+LANGUAGE plpgsql AS $$
+BEGIN
+    PERFORM apply_rating(NEW);
+    RETURN NULL;
+END $$;
+
+DROP TRIGGER IF EXISTS ratings_profile ON ratings;
+CREATE TRIGGER ratings_profile
+    AFTER INSERT ON ratings
+    FOR EACH ROW EXECUTE FUNCTION ratings_apply_profile();
+
+-- 3. Backfill profiles from existing ratings, oldest first so the EWMA is right
+TRUNCATE rating_profiles;
+DO $$
+DECLARE
+    r ratings%ROWTYPE;
+BEGIN
+    FOR r IN SELECT * FROM ratings ORDER BY player_id, rated_at LOOP
+        PERFORM apply_rating(r);
+    END LOOP;
+END $$;
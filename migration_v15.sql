@@ -0,0 +1,179 @@
+-- ============================================================
+-- Migration v15 — Precomputed leaderboards
+-- Run this in Supabase SQL Editor
+-- ============================================================
+
+-- 1. One row per (period, metric, player), ranked within its (period, metric).
+--    period: 'month' (calendar month to date), 'season' (calendar quarter to
+--    date) or 'all'. starts_on records which month/quarter a row was computed
+--    for, so readers can tell a stale period from a current one.
+--    metric: 'games'   — confirmed games played
+--            'streak'  — longest run of consecutive weeks with a confirmed game
+--            'on_time' — share of charged games paid in full within 7 days
+CREATE TABLE IF NOT EXISTS leaderboard (
+    period     TEXT NOT NULL CHECK (period IN ('month', 'season', 'all')),
+    metric     TEXT NOT NULL CHECK (metric IN ('games', 'streak', 'on_time')),
+    player_id  UUID NOT NULL REFERENCES players(id) ON DELETE CASCADE,
+    starts_on  DATE NOT NULL,
+    value      DOUBLE PRECISION NOT NULL,
+    rank       INTEGER,
+    updated_at TIMESTAMPTZ NOT NULL DEFAULT NOW(),
+    PRIMARY KEY (period, metric, player_id)
+);
+
+-- Top-k is a range scan of this index; "my rank" uses the player index.
+CREATE INDEX IF NOT EXISTS leaderboard_rank_idx   ON leaderboard (period, metric, rank);
+CREATE INDEX IF NOT EXISTS leaderboard_player_idx ON leaderboard (player_id);
+
+-- A per-player refresh reads that player's attendance and payment entries.
+CREATE INDEX IF NOT EXISTS attendance_player_idx ON attendance (player_id);
+CREATE INDEX IF NOT EXISTS fee_audit_log_attendance_paid_idx
+    ON fee_audit_log (attendance_id, created_at) WHERE action = 'payment_recorded';
+
+ALTER TABLE leaderboard ENABLE ROW LEVEL SECURITY;
+CREATE POLICY "allow_all_leaderboard" ON leaderboard FOR ALL USING (true) WITH CHECK (true);
+
+CREATE OR REPLACE FUNCTION leaderboard_period_start(p TEXT)
+RETURNS DATE
+LANGUAGE sql STABLE AS $$
+    SELECT CASE p
+        WHEN 'month'  THEN date_trunc('month', CURRENT_DATE)::date
+        WHEN 'season' THEN date_trunc('quarter', CURRENT_DATE)::date
+        ELSE DATE '2000-01-01'
+    END;
+$$;
+
+-- 2. Recompute the values of *p_players* (NULL = everyone), then re-rank.
+--    Values are per player, so an attendance change only touches the players
+--    it involves; ranks are one window-function pass that rewrites just the
+--    rows whose rank moved. A new month or quarter turns the next call into a
+--    full refresh.
+CREATE OR REPLACE FUNCTION refresh_leaderboard(p_players UUID[] DEFAULT NULL)
+RETURNS VOID
+LANGUAGE plpgsql AS $$
+BEGIN
+    IF p_players IS NOT NULL AND EXISTS (
+        SELECT 1 FROM leaderboard WHERE starts_on <> leaderboard_period_start(period)
+    ) THEN
+        p_players := NULL;
+    END IF;
+
+    IF p_players IS NULL THEN
+        DELETE FROM leaderboard;
+    ELSIF cardinality(p_players) = 0 THEN
+        RETURN;
+    ELSE
+        DELETE FROM leaderboard WHERE player_id = ANY(p_players);
+    END IF;
+
+    WITH periods AS (
+        SELECT p AS period, leaderboard_period_start(p) AS starts_on
+        FROM unnest(ARRAY['month', 'season', 'all']) AS p
+    ),
+    played AS (
+        SELECT pr.period, pr.starts_on, a.id AS attendance_id, a.player_id, s.date,
+               a.fee_charged, a.amount_paid
+        FROM attendance a
+        JOIN sessions s ON s.id = a.session_id
+        JOIN periods pr ON s.date >= pr.starts_on AND s.date <= CURRENT_DATE
+        WHERE a.status = 'confirmed'
+          AND (p_players IS NULL OR a.player_id = ANY(p_players))
+    ),
+    weeks AS (
+        SELECT DISTINCT period, starts_on, player_id, date_trunc('week', date)::date AS wk
+        FROM played
+    ),
+    islands AS (
+        -- Consecutive weeks share wk - 7 * row_number (gaps and islands).
+        SELECT period, starts_on, player_id,
+               wk - 7 * (ROW_NUMBER() OVER (PARTITION BY period, player_id ORDER BY wk))::int AS grp
+        FROM weeks
+    ),
+    paid AS (
+        -- Games without a payment_recorded audit entry (legacy data) count
+        -- as paid on the day when settled.
+        SELECT pl.period, pl.starts_on, pl.player_id,
+               (COALESCE(pl.amount_paid, 0) >= pl.fee_charged
+                AND COALESCE(
+                    (SELECT MAX(f.created_at) FROM fee_audit_log f
+                     WHERE f.attendance_id = pl.attendance_id AND f.action = 'payment_recorded'),
+                    pl.date::timestamptz
+                ) < (pl.date + 8)::timestamptz) AS on_time
+        FROM played pl
+        WHERE pl.fee_charged > 0
+    ),
+    vals AS (
+        SELECT period, starts_on, player_id, 'games' AS metric, COUNT(*)::float AS value
+        FROM played GROUP BY period, starts_on, player_id
+        UNION ALL
+        SELECT period, starts_on, player_id, 'streak', MAX(n)::float
+        FROM (SELECT period, starts_on, player_id, COUNT(*) AS n
+              FROM islands GROUP BY period, starts_on, player_id, grp) runs
+        GROUP BY period, starts_on, player_id
+        UNION ALL
+        SELECT period, starts_on, player_id, 'on_time', AVG(on_time::int)::float
+        FROM paid GROUP BY period, starts_on, player_id
+    )
+    INSERT INTO leaderboard (period, metric, player_id, starts_on, value)
+    SELECT period, metric, player_id, starts_on, value FROM vals;
+
+    UPDATE leaderboard l
+    SET rank = r.rnk, updated_at = NOW()
+    FROM (
+        SELECT period, metric, player_id,
+               RANK() OVER (PARTITION BY period, metric ORDER BY value DESC)::int AS rnk
+        FROM leaderboard
+    ) r
+    WHERE l.period = r.period AND l.metric = r.metric AND l.player_id = r.player_id
+      AND l.rank IS DISTINCT FROM r.rnk;
+END $$;
+
+-- 3. Statement-level triggers: a bulk confirm or a batch of audit entries
+--    refreshes each affected player once.
+CREATE OR REPLACE FUNCTION leaderboard_on_attendance()
+RETURNS TRIGGER
+LANGUAGE plpgsql AS $$
+BEGIN
+    IF TG_OP = 'INSERT' THEN
+        PERFORM refresh_leaderboard(ARRAY(SELECT DISTINCT player_id FROM new_rows WHERE status = 'confirmed'));
+    ELSIF TG_OP = 'DELETE' THEN
+        PERFORM refresh_leaderboard(ARRAY(SELECT DISTINCT player_id FROM old_rows WHERE status = 'confirmed'));
+    ELSE
+        PERFORM refresh_leaderboard(ARRAY(
+            SELECT DISTINCT n.player_id
+            FROM new_rows n JOIN old_rows o ON o.id = n.id
+            WHERE n.status = 'confirmed' OR o.status = 'confirmed'
+        ));
+    END IF;
+    RETURN NULL;
+END $$;
+
+CREATE OR REPLACE FUNCTION leaderboard_on_payment()
+RETURNS TRIGGER
+LANGUAGE plpgsql AS $$
+BEGIN
+    PERFORM refresh_leaderboard(ARRAY(
+        SELECT DISTINCT player_id FROM new_rows WHERE action = 'payment_recorded'
+    ));
+    RETURN NULL;
+END $$;
+
+DROP TRIGGER IF EXISTS attendance_leaderboard_insert ON attendance;
+DROP TRIGGER IF EXISTS attendance_leaderboard_update ON attendance;
+DROP TRIGGER IF EXISTS attendance_leaderboard_delete ON attendance;
+DROP TRIGGER IF EXISTS fee_audit_log_leaderboard ON fee_audit_log;
+CREATE TRIGGER attendance_leaderboard_insert AFTER INSERT ON attendance
+    REFERENCING NEW TABLE AS new_rows
+    FOR EACH STATEMENT EXECUTE FUNCTION leaderboard_on_attendance();
+CREATE TRIGGER attendance_leaderboard_update AFTER UPDATE ON attendance
+    REFERENCING OLD TABLE AS old_rows NEW TABLE AS new_rows
+    FOR EACH STATEMENT EXECUTE FUNCTION leaderboard_on_attendance();
+CREATE TRIGGER attendance_leaderboard_delete AFTER DELETE ON attendance
+    REFERENCING OLD TABLE AS old_rows
+    FOR EACH STATEMENT EXECUTE FUNCTION leaderboard_on_attendance();
+CREATE TRIGGER fee_audit_log_leaderboard AFTER INSERT ON fee_audit_log
+    REFERENCING NEW TABLE AS new_rows
+    FOR EACH STATEMENT EXECUTE FUNCTION leaderboard_on_payment();
+
+-- 4. Initial fill
+SELECT refresh_leaderboard();
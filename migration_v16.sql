@@ -0,0 +1,52 @@
+-- ============================================================
+-- Migration v16 — Table version vector
+-- Run this in Supabase SQL Editor
+-- ============================================================
+
+-- 1. One counter per table, bumped once per writing statement. The data
+--    layer (utils/supabase_client.py) reads all of them in one query and
+--    reuses any cached result whose tables' counters have not moved.
+CREATE TABLE IF NOT EXISTS table_versions (
+    table_name TEXT PRIMARY KEY,
+    version    BIGINT NOT NULL DEFAULT 0,
+    updated_at TIMESTAMPTZ NOT NULL DEFAULT NOW()
+);
+
+INSERT INTO table_versions (table_name)
+VALUES ('players'), ('sessions'), ('attendance'), ('payments'), ('expenditures'), ('fee_audit_log')
+ON CONFLICT (table_name) DO NOTHING;
+
+ALTER TABLE table_versions ENABLE ROW LEVEL SECURITY;
+CREATE POLICY "allow_all_table_versions" ON table_versions FOR ALL USING (true) WITH CHECK (true);
+
+-- 2. Statement-level, so a bulk confirm or a batch of audit entries is one
+--    bump rather than one per row. Cascaded deletes (e.g. a session's
+--    attendance) fire the child table's trigger too.
+CREATE OR REPLACE FUNCTION bump_table_version()
+RETURNS TRIGGER
+LANGUAGE plpgsql AS $$
+BEGIN
+    UPDATE table_versions
+    SET version = version + 1, updated_at = NOW()
+    WHERE table_name = TG_TABLE_NAME;
+    RETURN NULL;
+END $$;
+
+DROP TRIGGER IF EXISTS players_version ON players;
+DROP TRIGGER IF EXISTS sessions_version ON sessions;
+DROP TRIGGER IF EXISTS attendance_version ON attendance;
+DROP TRIGGER IF EXISTS payments_version ON payments;
+DROP TRIGGER IF EXISTS expenditures_version ON expenditures;
+DROP TRIGGER IF EXISTS fee_audit_log_version ON fee_audit_log;
+CREATE TRIGGER players_version AFTER INSERT OR UPDATE OR DELETE OR TRUNCATE ON players
+    FOR EACH STATEMENT EXECUTE FUNCTION bump_table_version();
+CREATE TRIGGER sessions_version AFTER INSERT OR UPDATE OR DELETE OR TRUNCATE ON sessions
+    FOR EACH STATEMENT EXECUTE FUNCTION bump_table_version();
+CREATE TRIGGER attendance_version AFTER INSERT OR UPDATE OR DELETE OR TRUNCATE ON attendance
+    FOR EACH STATEMENT EXECUTE FUNCTION bump_table_version();
+CREATE TRIGGER payments_version AFTER INSERT OR UPDATE OR DELETE OR TRUNCATE ON payments
+    FOR EACH STATEMENT EXECUTE FUNCTION bump_table_version();
+CREATE TRIGGER expenditures_version AFTER INSERT OR UPDATE OR DELETE OR TRUNCATE ON expenditures
+    FOR EACH STATEMENT EXECUTE FUNCTION bump_table_version();
+CREATE TRIGGER fee_audit_log_version AFTER INSERT OR UPDATE OR DELETE OR TRUNCATE ON fee_audit_log
+    FOR EACH STATEMENT EXECUTE FUNCTION bump_table_version();
@@ -0,0 +1,14 @@
+-- ============================================================
+-- Migration v17 — Realtime change feed
+-- Run this in Supabase SQL Editor
+-- ============================================================
+
+-- 1. Publish row changes to Supabase Realtime (utils/changefeed.py).
+--    table_versions rides along so the app learns each bump as it happens
+--    instead of polling for it.
+ALTER PUBLICATION supabase_realtime ADD TABLE attendance, sessions, table_versions;
+
+-- 2. Full old rows on UPDATE/DELETE, so a cancelled or moved attendance row
+--    still says which session (and status) it left.
+ALTER TABLE attendance REPLICA IDENTITY FULL;
+ALTER TABLE sessions   REPLICA IDENTITY FULL;
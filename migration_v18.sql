@@ -0,0 +1,81 @@
+-- ============================================================
+-- Migration v18 — One ledger row per payment, unique references
+-- Run this in Supabase SQL Editor
+-- ============================================================
+
+-- 1. Payments spread over several sessions used to be written as one
+--    payments row per session, all sharing the UTR. Fold each such group
+--    back into its first row so a reference identifies one payment.
+WITH groups AS (
+    SELECT id, amount,
+           FIRST_VALUE(id) OVER w AS keep_id,
+           SUM(amount)     OVER (PARTITION BY player_id, reference, payment_date) AS total
+    FROM payments
+    WHERE reference IS NOT NULL
+    WINDOW w AS (PARTITION BY player_id, reference, payment_date ORDER BY created_at, id)
+),
+merged AS (
+    UPDATE payments p SET amount = g.total
+    FROM groups g
+    WHERE p.id = g.keep_id AND g.id = g.keep_id AND g.total <> g.amount
+)
+DELETE FROM payments p
+USING groups g
+WHERE p.id = g.id AND g.id <> g.keep_id;
+
+-- Anything still sharing a reference (a UTR reused by another player or on
+-- another day) keeps it on the earliest row only; the rest are flagged.
+WITH ranked AS (
+    SELECT id, ROW_NUMBER() OVER (PARTITION BY reference ORDER BY created_at, id) AS n
+    FROM payments
+    WHERE reference IS NOT NULL
+)
+UPDATE payments p
+SET notes = concat_ws(' ', p.notes, '(duplicate reference ' || p.reference || ')'),
+    reference = NULL
+FROM ranked r
+WHERE p.id = r.id AND r.n > 1;
+
+-- 2. A UTR can be recorded once. Replaces the plain lookup index.
+CREATE UNIQUE INDEX IF NOT EXISTS payments_reference_key
+    ON payments (reference) WHERE reference IS NOT NULL;
+DROP INDEX IF EXISTS payments_reference_idx;
+
+-- 3. Record one payment atomically: the ledger row plus what it pays off
+--    on each attendance row. Each allocation carries the amount_paid the
+--    payer was shown; if a row has moved since (a double submit, or someone
+--    else recorded it first) the whole payment is rolled back. Both that and
+--    a reused reference surface as unique_violation (23505).
+CREATE OR REPLACE FUNCTION record_payment(
+    p_player_id    UUID,
+    p_payment_date DATE,
+    p_notes        TEXT,
+    p_reference    TEXT,
+    p_allocations  JSONB     -- [{"attendance_id", "amount", "expected_paid"}]
+)
+RETURNS TABLE (paid_attendance_id UUID, paid_before NUMERIC, paid_after NUMERIC)
+LANGUAGE plpgsql AS $$
+DECLARE
+    a RECORD;
+BEGIN
+    INSERT INTO payments (player_id, amount, payment_date, notes, reference)
+    SELECT p_player_id, SUM(x.amount), p_payment_date, p_notes, p_reference
+    FROM jsonb_to_recordset(p_allocations) AS x(amount NUMERIC);
+
+    FOR a IN
+        SELECT * FROM jsonb_to_recordset(p_allocations)
+            AS x(attendance_id UUID, amount NUMERIC, expected_paid NUMERIC)
+    LOOP
+        UPDATE attendance t
+        SET amount_paid = t.amount_paid + a.amount
+        WHERE t.id = a.attendance_id AND t.amount_paid = a.expected_paid;
+        IF NOT FOUND THEN
+            RAISE EXCEPTION 'attendance % changed since the payment was entered', a.attendance_id
+                USING ERRCODE = 'unique_violation';
+        END IF;
+        paid_attendance_id := a.attendance_id;
+        paid_before := a.expected_paid;
+        paid_after := a.expected_paid + a.amount;
+        RETURN NEXT;
+    END LOOP;
+END $$;
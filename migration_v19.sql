@@ -0,0 +1,51 @@
+-- ============================================================
+-- Migration v19 — updated_at on the tables analytics snapshots
+-- Run this in Supabase SQL Editor
+-- ============================================================
+
+-- 1. utils/analytics.py tops up its snapshots from an updated_at watermark,
+--    so status flips and edits are re-read along with new rows. Existing
+--    rows start at their created_at.
+ALTER TABLE sessions     ADD COLUMN IF NOT EXISTS updated_at TIMESTAMPTZ;
+ALTER TABLE attendance   ADD COLUMN IF NOT EXISTS updated_at TIMESTAMPTZ;
+ALTER TABLE payments     ADD COLUMN IF NOT EXISTS updated_at TIMESTAMPTZ;
+ALTER TABLE expenditures ADD COLUMN IF NOT EXISTS updated_at TIMESTAMPTZ;
+
+UPDATE sessions     SET updated_at = COALESCE(created_at, NOW()) WHERE updated_at IS NULL;
+UPDATE attendance   SET updated_at = COALESCE(created_at, NOW()) WHERE updated_at IS NULL;
+UPDATE payments     SET updated_at = COALESCE(created_at, NOW()) WHERE updated_at IS NULL;
+UPDATE expenditures SET updated_at = COALESCE(created_at, NOW()) WHERE updated_at IS NULL;
+
+ALTER TABLE sessions     ALTER COLUMN updated_at SET DEFAULT NOW(), ALTER COLUMN updated_at SET NOT NULL;
+ALTER TABLE attendance   ALTER COLUMN updated_at SET DEFAULT NOW(), ALTER COLUMN updated_at SET NOT NULL;
+ALTER TABLE payments     ALTER COLUMN updated_at SET DEFAULT NOW(), ALTER COLUMN updated_at SET NOT NULL;
+ALTER TABLE expenditures ALTER COLUMN updated_at SET DEFAULT NOW(), ALTER COLUMN updated_at SET NOT NULL;
+
+CREATE INDEX IF NOT EXISTS sessions_updated_idx     ON sessions (updated_at);
+CREATE INDEX IF NOT EXISTS attendance_updated_idx   ON attendance (updated_at);
+CREATE INDEX IF NOT EXISTS payments_updated_idx     ON payments (updated_at);
+CREATE INDEX IF NOT EXISTS expenditures_updated_idx ON expenditures (updated_at);
+
+-- 2. Every update stamps the row. NOW() is the transaction start, so a slow
+--    transaction can commit a stamp older than rows already read; readers
+--    overlap their watermark to cover that.
+CREATE OR REPLACE FUNCTION touch_updated_at()
+RETURNS TRIGGER
+LANGUAGE plpgsql AS $$
+BEGIN
+    NEW.updated_at := NOW();
+    RETURN NEW;
+END $$;
+
+DROP TRIGGER IF EXISTS sessions_touch ON sessions;
+DROP TRIGGER IF EXISTS attendance_touch ON attendance;
+DROP TRIGGER IF EXISTS payments_touch ON payments;
+DROP TRIGGER IF EXISTS expenditures_touch ON expenditures;
+CREATE TRIGGER sessions_touch BEFORE UPDATE ON sessions
+    FOR EACH ROW EXECUTE FUNCTION touch_updated_at();
+CREATE TRIGGER attendance_touch BEFORE UPDATE ON attendance
+    FOR EACH ROW EXECUTE FUNCTION touch_updated_at();
+CREATE TRIGGER payments_touch BEFORE UPDATE ON payments
+    FOR EACH ROW EXECUTE FUNCTION touch_updated_at();
+CREATE TRIGGER expenditures_touch BEFORE UPDATE ON expenditures
+    FOR EACH ROW EXECUTE FUNCTION touch_updated_at();
@@ -0,0 +1,147 @@
+-- ============================================================
+-- Migration v20 — Leaderboard catch-up and locking
+-- Run this in Supabase SQL Editor
+-- ============================================================
+
+-- 1. The last day refresh_leaderboard() counted sessions up to. A game
+--    confirmed ahead of its date only counts once the date arrives, which
+--    is not a write — so the next refresh after midnight also picks up the
+--    players whose sessions fell due since.
+CREATE TABLE IF NOT EXISTS leaderboard_state (
+    id    BOOLEAN PRIMARY KEY DEFAULT TRUE CHECK (id),
+    as_of DATE NOT NULL
+);
+
+INSERT INTO leaderboard_state (id, as_of) VALUES (TRUE, CURRENT_DATE)
+ON CONFLICT (id) DO NOTHING;
+
+ALTER TABLE leaderboard_state ENABLE ROW LEVEL SECURITY;
+CREATE POLICY "allow_all_leaderboard_state" ON leaderboard_state FOR ALL USING (true) WITH CHECK (true);
+
+-- 2. Same values as v15, with two changes:
+--    • refreshes take one transaction-level advisory lock. A transaction can
+--      refresh several times (record_payment updates one attendance row per
+--      session it pays), so per-partition locks could not be taken in one
+--      global order across those calls; a single lock can, and concurrent
+--      confirms queue instead of deadlocking on each other's rank updates.
+--    • only the (period, metric) partitions whose rows were replaced are
+--      re-ranked.
+--    Calling it with an empty array is a cheap catch-up: it does nothing
+--    unless sessions have fallen due or a new month/quarter has begun.
+CREATE OR REPLACE FUNCTION refresh_leaderboard(p_players UUID[] DEFAULT NULL)
+RETURNS VOID
+LANGUAGE plpgsql AS $$
+DECLARE
+    v_as_of DATE;
+    v_parts TEXT[];
+    v_added TEXT[];
+BEGIN
+    IF p_players IS NOT NULL AND cardinality(p_players) = 0
+       AND (SELECT as_of FROM leaderboard_state) >= CURRENT_DATE
+       AND NOT EXISTS (SELECT 1 FROM leaderboard WHERE starts_on <> leaderboard_period_start(period))
+    THEN
+        RETURN;
+    END IF;
+
+    PERFORM pg_advisory_xact_lock(hashtext('refresh_leaderboard'));
+
+    SELECT as_of INTO v_as_of FROM leaderboard_state;
+    IF v_as_of < CURRENT_DATE THEN
+        IF p_players IS NOT NULL THEN
+            p_players := ARRAY(
+                SELECT unnest(p_players)
+                UNION
+                SELECT a.player_id
+                FROM attendance a
+                JOIN sessions s ON s.id = a.session_id
+                WHERE a.status = 'confirmed' AND s.date > v_as_of AND s.date <= CURRENT_DATE
+            );
+        END IF;
+        UPDATE leaderboard_state SET as_of = CURRENT_DATE;
+    END IF;
+
+    IF p_players IS NOT NULL AND EXISTS (
+        SELECT 1 FROM leaderboard WHERE starts_on <> leaderboard_period_start(period)
+    ) THEN
+        p_players := NULL;
+    END IF;
+
+    IF p_players IS NOT NULL AND cardinality(p_players) = 0 THEN
+        RETURN;
+    END IF;
+
+    WITH gone AS (
+        DELETE FROM leaderboard
+        WHERE p_players IS NULL OR player_id = ANY(p_players)
+        RETURNING period, metric
+    )
+    SELECT array_agg(DISTINCT period || ':' || metric) INTO v_parts FROM gone;
+
+    WITH periods AS (
+        SELECT p AS period, leaderboard_period_start(p) AS starts_on
+        FROM unnest(ARRAY['month', 'season', 'all']) AS p
+    ),
+    played AS (
+        SELECT pr.period, pr.starts_on, a.id AS attendance_id, a.player_id, s.date,
+               a.fee_charged, a.amount_paid
+        FROM attendance a
+        JOIN sessions s ON s.id = a.session_id
+        JOIN periods pr ON s.date >= pr.starts_on AND s.date <= CURRENT_DATE
+        WHERE a.status = 'confirmed'
+          AND (p_players IS NULL OR a.player_id = ANY(p_players))
+    ),
+    weeks AS (
+        SELECT DISTINCT period, starts_on, player_id, date_trunc('week', date)::date AS wk
+        FROM played
+    ),
+    islands AS (
+        -- Consecutive weeks share wk - 7 * row_number (gaps and islands).
+        SELECT period, starts_on, player_id,
+               wk - 7 * (ROW_NUMBER() OVER (PARTITION BY period, player_id ORDER BY wk))::int AS grp
+        FROM weeks
+    ),
+    paid AS (
+        -- Games without a payment_recorded audit entry (legacy data) count
+        -- as paid on the day when settled.
+        SELECT pl.period, pl.starts_on, pl.player_id,
+               (COALESCE(pl.amount_paid, 0) >= pl.fee_charged
+                AND COALESCE(
+                    (SELECT MAX(f.created_at) FROM fee_audit_log f
+                     WHERE f.attendance_id = pl.attendance_id AND f.action = 'payment_recorded'),
+                    pl.date::timestamptz
+                ) < (pl.date + 8)::timestamptz) AS on_time
+        FROM played pl
+        WHERE pl.fee_charged > 0
+    ),
+    vals AS (
+        SELECT period, starts_on, player_id, 'games' AS metric, COUNT(*)::float AS value
+        FROM played GROUP BY period, starts_on, player_id
+        UNION ALL
+        SELECT period, starts_on, player_id, 'streak', MAX(n)::float
+        FROM (SELECT period, starts_on, player_id, COUNT(*) AS n
+              FROM islands GROUP BY period, starts_on, player_id, grp) runs
+        GROUP BY period, starts_on, player_id
+        UNION ALL
+        SELECT period, starts_on, player_id, 'on_time', AVG(on_time::int)::float
+        FROM paid GROUP BY period, starts_on, player_id
+    ),
+    added AS (
+        INSERT INTO leaderboard (period, metric, player_id, starts_on, value)
+        SELECT period, metric, player_id, starts_on, value FROM vals
+        RETURNING period, metric
+    )
+    SELECT array_agg(DISTINCT period || ':' || metric) INTO v_added FROM added;
+
+    v_parts := v_parts || v_added;
+
+    UPDATE leaderboard l
+    SET rank = r.rnk, updated_at = NOW()
+    FROM (
+        SELECT period, metric, player_id,
+               RANK() OVER (PARTITION BY period, metric ORDER BY value DESC)::int AS rnk
+        FROM leaderboard
+        WHERE period || ':' || metric = ANY(v_parts)
+    ) r
+    WHERE l.period = r.period AND l.metric = r.metric AND l.player_id = r.player_id
+      AND l.rank IS DISTINCT FROM r.rnk;
+END $$;
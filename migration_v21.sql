@@ -0,0 +1,48 @@
+-- ============================================================
+-- Migration v21 — Keep rating profiles in step with deleted ratings
+-- Run this in Supabase SQL Editor
+-- ============================================================
+
+-- v14 blocks UPDATE on ratings but not DELETE, so removing a rating (by hand,
+-- or by deleting the player) left rating_profiles folded over history that
+-- no longer exists. Deletes stay allowed — the players FK cascades into
+-- ratings — and the affected profiles are rebuilt from what remains.
+
+-- 1. Re-fold one player's profile from their remaining ratings, oldest
+--    first so the EWMA matches the insert-time result; no ratings, no row.
+CREATE OR REPLACE FUNCTION rebuild_rating_profile(p_player_id UUID)
+RETURNS VOID
+LANGUAGE plpgsql AS $$
+DECLARE
+    r ratings%ROWTYPE;
+BEGIN
+    DELETE FROM rating_profiles WHERE player_id = p_player_id;
+    FOR r IN SELECT * FROM ratings WHERE player_id = p_player_id ORDER BY rated_at, id LOOP
+        PERFORM apply_rating(r);
+    END LOOP;
+END $$;
+
+-- 2. Statement-level, so a cascade from a player delete (or a bulk delete)
+--    rebuilds each affected player once, after all their rows are gone.
+CREATE OR REPLACE FUNCTION ratings_rebuild_profiles()
+RETURNS TRIGGER
+LANGUAGE plpgsql AS $$
+DECLARE
+    pid UUID;
+BEGIN
+    FOR pid IN SELECT DISTINCT player_id FROM old_rows WHERE player_id IS NOT NULL LOOP
+        PERFORM rebuild_rating_profile(pid);
+    END LOOP;
+    RETURN NULL;
+END $$;
+
+DROP TRIGGER IF EXISTS ratings_profile_delete ON ratings;
+CREATE TRIGGER ratings_profile_delete
+    AFTER DELETE ON ratings
+    REFERENCING OLD TABLE AS old_rows
+    FOR EACH STATEMENT EXECUTE FUNCTION ratings_rebuild_profiles();
+
+-- 3. Profiles of ratings already deleted before this migration.
+SELECT rebuild_rating_profile(p.player_id)
+FROM rating_profiles p
+WHERE p.n <> (SELECT COUNT(*) FROM ratings r WHERE r.player_id = p.player_id);
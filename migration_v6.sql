@@ -0,0 +1,38 @@
+-- ============================================================
+-- Migration v6 — Payment references & duplicate detection
+-- Run this in Supabase SQL Editor
+-- ============================================================
+
+CREATE EXTENSION IF NOT EXISTS pg_trgm;
+
+-- 1. Pull the UTR / transaction reference out of free-text notes
+ALTER TABLE payments      ADD COLUMN IF NOT EXISTS reference TEXT;
+ALTER TABLE fee_audit_log ADD COLUMN IF NOT EXISTS reference TEXT;
+
+-- Same rules as extract_payment_reference() in utils/supabase_client.py:
+-- an explicit "UTR/Ref/Txn/UPI <token>" wins, else a bare 12-digit UPI UTR.
+UPDATE payments
+SET reference = upper(COALESCE(
+        substring(notes from '(?i)(?:utr|ref(?:erence)?|txn|upi)\W*(?=[a-z0-9]{6})([a-z]*\d[a-z0-9]*)'),
+        substring(notes from '\m(\d{12})\M')
+    ))
+WHERE reference IS NULL AND notes IS NOT NULL;
+
+UPDATE fee_audit_log
+SET reference = upper(COALESCE(
+        substring(notes from '(?i)(?:utr|ref(?:erence)?|txn|upi)\W*(?=[a-z0-9]{6})([a-z]*\d[a-z0-9]*)'),
+        substring(notes from '\m(\d{12})\M')
+    ))
+WHERE reference IS NULL AND notes IS NOT NULL;
+
+-- 2. Exact lookups + submission fingerprint (checked before every insert)
+CREATE INDEX IF NOT EXISTS payments_reference_idx
+    ON payments (reference) WHERE reference IS NOT NULL;
+CREATE INDEX IF NOT EXISTS payments_fingerprint_idx
+    ON payments (player_id, amount, payment_date, reference);
+
+-- 3. Partial-match search for coaches ("which payment was UTR ...4521?")
+CREATE INDEX IF NOT EXISTS payments_reference_trgm_idx
+    ON payments USING gin (reference gin_trgm_ops);
+CREATE INDEX IF NOT EXISTS fee_audit_log_reference_trgm_idx
+    ON fee_audit_log USING gin (reference gin_trgm_ops);
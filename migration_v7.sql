@@ -0,0 +1,15 @@
+-- ============================================================
+-- Migration v7 — Fee audit log keyset pagination
+-- Run this in Supabase SQL Editor
+-- ============================================================
+
+-- Newest-first pages: ORDER BY created_at DESC, id DESC with a
+-- (created_at, id) cursor, optionally narrowed by player/session/action.
+CREATE INDEX IF NOT EXISTS fee_audit_log_created_idx
+    ON fee_audit_log (created_at DESC, id DESC);
+CREATE INDEX IF NOT EXISTS fee_audit_log_player_created_idx
+    ON fee_audit_log (player_id, created_at DESC, id DESC);
+CREATE INDEX IF NOT EXISTS fee_audit_log_session_created_idx
+    ON fee_audit_log (session_id, created_at DESC, id DESC);
+CREATE INDEX IF NOT EXISTS fee_audit_log_action_created_idx
+    ON fee_audit_log (action, created_at DESC, id DESC);
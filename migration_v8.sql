@@ -0,0 +1,82 @@
+-- ============================================================
+-- Migration v8 — Notification outbox
+-- Run this in Supabase SQL Editor
+-- ============================================================
+
+-- 1. Outbox drained by the background worker in utils/notifications.py
+CREATE TABLE IF NOT EXISTS notification_outbox (
+    id              UUID DEFAULT gen_random_uuid() PRIMARY KEY,
+    player_id       UUID REFERENCES players(id) ON DELETE CASCADE,
+    kind            TEXT NOT NULL
+                        CHECK (kind IN ('invite', 'confirmation', 'waitlist', 'dues')),
+    payload         JSONB NOT NULL DEFAULT '{}'::jsonb,
+    status          TEXT NOT NULL DEFAULT 'pending'
+                        CHECK (status IN ('pending', 'sending', 'sent', 'failed')),
+    attempts        INTEGER NOT NULL DEFAULT 0,
+    next_attempt_at TIMESTAMPTZ NOT NULL DEFAULT NOW(),
+    claimed_at      TIMESTAMPTZ,
+    last_error      TEXT,
+    dedupe_key      TEXT UNIQUE,        -- e.g. one dues reminder per player per month
+    created_at      TIMESTAMPTZ DEFAULT NOW(),
+    sent_at         TIMESTAMPTZ
+);
+
+CREATE INDEX IF NOT EXISTS notification_outbox_due_idx
+    ON notification_outbox (next_attempt_at) WHERE status IN ('pending', 'sending');
+
+ALTER TABLE notification_outbox ENABLE ROW LEVEL SECURITY;
+CREATE POLICY "allow_all_notification_outbox" ON notification_outbox FOR ALL USING (true) WITH CHECK (true);
+
+-- 2. Workers claim batches atomically; rows stuck in 'sending' for 10 minutes
+--    (worker crashed mid-delivery) are handed out again.
+CREATE OR REPLACE FUNCTION claim_notifications(batch_size INTEGER DEFAULT 50)
+RETURNS SETOF notification_outbox
+LANGUAGE sql AS $$
+    UPDATE notification_outbox o
+    SET status = 'sending', claimed_at = NOW(), attempts = o.attempts + 1
+    WHERE o.id IN (
+        SELECT id FROM notification_outbox
+        WHERE (status = 'pending' AND next_attempt_at <= NOW())
+           OR (status = 'sending' AND claimed_at < NOW() - INTERVAL '10 minutes')
+        ORDER BY next_attempt_at
+        LIMIT batch_size
+        FOR UPDATE SKIP LOCKED
+    )
+    RETURNING o.*;
+$$;
+
+-- 3. Invites, confirmations and waitlist moves are enqueued by the database,
+--    so every code path that writes attendance is covered.
+CREATE OR REPLACE FUNCTION enqueue_attendance_notifications()
+RETURNS TRIGGER
+LANGUAGE plpgsql AS $$
+DECLARE
+    sess JSONB;
+BEGIN
+    SELECT jsonb_build_object('session_id', s.id, 'date', s.date, 'slot', s.slot, 'venue', s.venue)
+    INTO sess FROM sessions s WHERE s.id = NEW.session_id;
+
+    IF TG_OP = 'INSERT' THEN
+        IF NEW.status = 'invited' THEN
+            INSERT INTO notification_outbox (player_id, kind, payload)
+            VALUES (NEW.player_id, 'invite', sess);
+        END IF;
+    ELSIF NEW.status IS DISTINCT FROM OLD.status THEN
+        IF NEW.status = 'confirmed' THEN
+            INSERT INTO notification_outbox (player_id, kind, payload)
+            VALUES (NEW.player_id, 'confirmation', sess);
+        ELSIF OLD.status = 'confirmed' THEN
+            -- A spot opened up: tell everyone still waiting on this session.
+            INSERT INTO notification_outbox (player_id, kind, payload)
+            SELECT a.player_id, 'waitlist', sess
+            FROM attendance a
+            WHERE a.session_id = NEW.session_id AND a.status = 'pending';
+        END IF;
+    END IF;
+    RETURN NEW;
+END $$;
+
+DROP TRIGGER IF EXISTS attendance_notify ON attendance;
+CREATE TRIGGER attendance_notify
+    AFTER INSERT OR UPDATE OF status ON attendance
+    FOR EACH ROW EXECUTE FUNCTION enqueue_attendance_notifications();
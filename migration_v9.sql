@@ -0,0 +1,33 @@
+-- ============================================================
+-- Migration v9 — Recurring session series
+-- Run this in Supabase SQL Editor
+-- ============================================================
+
+-- 1. A weekly schedule that sessions are materialized from (utils/series.py)
+CREATE TABLE IF NOT EXISTS session_series (
+    id             UUID DEFAULT gen_random_uuid() PRIMARY KEY,
+    name           TEXT NOT NULL,
+    weekdays       INTEGER[] NOT NULL,      -- ISO weekdays, 1 = Monday … 7 = Sunday
+    slot           TEXT NOT NULL,           -- e.g. '07:30 AM'
+    venue          TEXT NOT NULL,
+    court_numbers  TEXT NOT NULL DEFAULT '1',
+    max_players    INTEGER DEFAULT 8,
+    fee_per_player NUMERIC(10,2) DEFAULT 0,
+    starts_on      DATE NOT NULL DEFAULT CURRENT_DATE,
+    ends_on        DATE,
+    is_active      BOOLEAN DEFAULT TRUE,
+    created_by     UUID REFERENCES players(id),
+    created_at     TIMESTAMPTZ DEFAULT NOW(),
+    CHECK (weekdays <@ ARRAY[1, 2, 3, 4, 5, 6, 7])
+);
+
+ALTER TABLE session_series ENABLE ROW LEVEL SECURITY;
+CREATE POLICY "allow_all_session_series" ON session_series FOR ALL USING (true) WITH CHECK (true);
+
+-- 2. Each occurrence exists at most once, so regenerating only fills gaps
+ALTER TABLE sessions ADD COLUMN IF NOT EXISTS series_id UUID REFERENCES session_series(id) ON DELETE SET NULL;
+ALTER TABLE sessions DROP CONSTRAINT IF EXISTS sessions_series_date_key;
+ALTER TABLE sessions ADD CONSTRAINT sessions_series_date_key UNIQUE (series_id, date);
+
+-- 3. Conflict checks look up one venue over a date window
+CREATE INDEX IF NOT EXISTS sessions_venue_date_idx ON sessions (venue, date);
@@ -1,8 +1,11 @@
 import streamlit as st
 from utils.styles import inject_mobile_css
-from utils.helpers import bottom_nav, status_badge
+from utils.helpers import bottom_nav, session_emoji, status_badge
 from utils.auth import login_gate
-from utils.supabase_client import fetch_all, fetch_view, insert_row, update_row, record_payment_with_audit
+from utils.supabase_client import (
+    fetch_all, fetch_sessions, insert_row, record_payment_with_audit,
+    accept_invite, decline_invite, DuplicatePayment,
+)
 
 st.set_page_config(page_title="Join Games | StringerS", page_icon="🏸", layout="wide", initial_sidebar_state="collapsed")
 inject_mobile_css()
@@ -11,17 +14,8 @@ current = login_gate()
 
 st.title("🏸 Available Sessions")
 
-# ── Fetch sessions with slot info ──
-sessions = fetch_view("session_slots")
-
-if not sessions:
-    st.info("No sessions available right now. Check back later!")
-    st.stop()
-
-from datetime import date as dt_date, datetime
-
-upcoming = [s for s in sessions if s["date"] >= str(dt_date.today())]
-upcoming.sort(key=lambda s: (s["date"], s["slot"]))
+# ── Upcoming sessions, ordered by the database on (date, start_time) ──
+upcoming = fetch_sessions(upcoming=True)
 
 if not upcoming:
     st.info("No upcoming sessions. Ask your coach to create one!")
@@ -34,12 +28,7 @@ my_session_map = {a["session_id"]: a for a in my_attendance}
 for s in upcoming:
     slots_left = s.get("slots_left", "?")
     confirmed = s.get("confirmed_count", 0)
-    slot_txt = str(s.get("slot", ""))
-    try:
-        slot_hour = datetime.strptime(slot_txt, "%I:%M %p").hour
-        slot_emoji = "🌅" if slot_hour < 12 else "🌆"
-    except ValueError:
-        slot_emoji = "🌅" if "morning" in slot_txt.lower() else "🌆"
+    slot_emoji = session_emoji(s)
 
     venue = s.get('venue', 'Pro-Sports')
     courts = s.get('court_numbers', '1')
@@ -64,14 +53,11 @@ for s in upcoming:
         if existing["status"] == "invited":
             c1, c2 = st.columns(2)
             if c1.button("✅ Accept Invite", key=f"accept_{s['id']}"):
-                update_row("attendance", existing["id"], {
-                    "status": "confirmed",
-                    "fee_charged": float(s.get("fee_per_player", 0)),
-                })
+                accept_invite(existing["id"], float(s.get("fee_per_player", 0)))
                 st.success("You're in! See you on court! 🎉")
                 st.rerun()
             if c2.button("❌ Decline", key=f"decline_{s['id']}"):
-                update_row("attendance", existing["id"], {"status": "rejected"})
+                decline_invite(existing["id"])
                 st.info("Invite declined.")
                 st.rerun()
         # If confirmed, show "Mark as Paid" option
@@ -87,18 +73,27 @@ for s in upcoming:
                     )
                     pay_date = st.date_input("Payment Date", value=d_date.today(), key=f"paydt_{s['id']}")
                     pay_note = st.text_input("Note (optional)", key=f"paynote_{s['id']}")
-                    if st.button("✅ Confirm Payment", key=f"paybtn_{s['id']}"):
-                        record_payment_with_audit(
-                            attendance_id=existing["id"],
-                            session_id=s["id"],
-                            player_id=current["id"],
-                            amount=float(pay_amount),
-                            payment_date=str(pay_date),
-                            changed_by=current["name"],
-                            notes=pay_note or None,
-                        )
-                        st.success("Payment recorded! 🎉")
-                        st.rerun()
+                    # The key changes once a payment lands, so a second tap on
+                    # the old button is dropped instead of paying twice.
+                    if st.button("✅ Confirm Payment", key=f"paybtn_{s['id']}_{paid}"):
+                        try:
+                            record_payment_with_audit(
+                                player_id=current["id"],
+                                allocations=[{
+                                    "attendance_id": existing["id"],
+                                    "session_id": s["id"],
+                                    "amount": float(pay_amount),
+                                    "expected_paid": paid,
+                                }],
+                                payment_date=str(pay_date),
+                                changed_by=current["name"],
+                                notes=pay_note or None,
+                            )
+                        except DuplicatePayment:
+                            st.warning("This payment is already recorded. ✅")
+                        else:
+                            st.success("Payment recorded! 🎉")
+                            st.rerun()
             elif fee > 0:
                 st.markdown('<span class="badge-confirmed">✅ Fully Paid</span>', unsafe_allow_html=True)
     else:
@@ -1,12 +1,22 @@
+import html
 import streamlit as st
-from datetime import date, timedelta, datetime, time
+from datetime import date, timedelta, time
 from utils.styles import inject_mobile_css
 from utils.helpers import bottom_nav, status_badge, is_coach_view
 from utils.auth import login_gate, set_player_password
+from utils.cards import Safe, show_cards
+from utils.changefeed import follow
+from utils.coattendance import invite_likelihood
+from utils.matchmaking import build_sheet, save_sheet
+from utils.ratings import (
+    DIMENSIONS as RATING_DIMENSIONS, current_level, history as rating_history,
+    profile as rating_profile, record_rating, suggested_skill,
+)
+from utils.series import WEEKDAYS, generate as generate_series
 from utils.supabase_client import (
-    fetch_all, fetch_view, insert_row, update_row, delete_row, bulk_update,
-    confirm_request, reject_request, send_invite, bulk_confirm, upsert_row,
-    VENUES,
+    fetch_all, fetch_sessions, insert_row, update_row, delete_row, bulk_update,
+    confirm_request, reject_request, send_invites, bulk_confirm,
+    fetch_audit_log, get_venues, free_courts, insert_session, update_session, CourtConflict,
 )
 
 st.set_page_config(page_title="Coach Dashboard | StringerS", page_icon="👨‍🏫", layout="wide", initial_sidebar_state="collapsed")
@@ -21,22 +31,11 @@ if not is_coach_view():
 st.title("👨‍🏫 Coach Dashboard")
 
 
-def _slot_to_time(slot_val: str) -> time:
-    """Parse saved slot text like '07:30 AM' into a time object for time_input."""
-    if not slot_val:
-        return time(7, 30)
-    for fmt in ("%I:%M %p", "%H:%M"):
-        try:
-            return datetime.strptime(str(slot_val).strip(), fmt).time()
-        except ValueError:
-            continue
-    return time(7, 30)
-
-
 def _format_slot(t: time) -> str:
-    """Store slot in Playo-like format, e.g. '07:30 AM'."""
+    """Playo-like slot text, e.g. '07:30 AM' (sessions derive it from start_time)."""
     return t.strftime("%I:%M %p")
 
+
 tab1, tab2, tab3, tab4, tab5, tab6 = st.tabs([
     "📋 Requests", "📩 Invites", "➕ Session", "💰 Session Fees", "⭐ Rate Players", "🔐 Passwords",
 ])
@@ -46,6 +45,8 @@ tab1, tab2, tab3, tab4, tab5, tab6 = st.tabs([
 # ═══════════════════════════════════════════════════════════
 with tab1:
     st.subheader("Pending Requests")
+    # New or withdrawn requests rerun this page as they happen.
+    follow("attendance:pending")
 
     # Join attendance with player name and session info
     pending = (
@@ -75,12 +76,11 @@ with tab1:
             sdate = session.get("date", "")
             sslot = session.get("slot", "")
 
-            st.markdown(f"""
-            <div class="game-card">
-                <strong>{emoji} {pname}</strong><br>
-                {sdate} • {sslot} &nbsp; {status_badge('pending')}
-            </div>
-            """, unsafe_allow_html=True)
+            st.markdown(
+                f'<div class="game-card"><strong>{html.escape(f"{emoji} {pname}")}</strong><br>'
+                f"{html.escape(f'{sdate} • {sslot}')} &nbsp; {status_badge('pending')}</div>",
+                unsafe_allow_html=True,
+            )
 
             c1, c2 = st.columns(2)
             if c1.button("Accept", key=f"acc_{req['id']}"):
@@ -93,7 +93,7 @@ with tab1:
     st.divider()
     st.subheader("All Session Rosters")
 
-    sessions = fetch_view("session_slots")
+    sessions = fetch_sessions()
     if sessions:
         session_labels = {s["id"]: f"{s['date']} • {s['slot']}" for s in sessions}
         sel_sid = st.selectbox(
@@ -102,17 +102,20 @@ with tab1:
             format_func=lambda x: session_labels[x],
         )
         if sel_sid:
+            follow(f"session:{sel_sid}")
             roster = fetch_all("attendance", filters={"session_id": sel_sid})
             players_map = {p["id"]: p for p in fetch_all("players")}
             if roster:
                 for r in roster:
                     p = players_map.get(r["player_id"], {})
                     badge = status_badge(r["status"])
-                    st.markdown(
-                        f"**{p.get('avatar_emoji', '🏸')} {p.get('name', '?')}** — {badge}"
-                        + (f" &nbsp; 💬 _{r['coach_note']}_" if r.get("coach_note") else ""),
-                        unsafe_allow_html=True,
-                    )
+                    note = r.get("coach_note")
+                    show_cards("roster", [{
+                        "avatar": p.get("avatar_emoji", "🏸"),
+                        "name": p.get("name", "?"),
+                        "badge": Safe(badge),
+                        "note": Safe(f" &nbsp; 💬 <em>{html.escape(note)}</em>") if note else "",
+                    }])
 
                     # Coach note input
                     with st.expander(f"Add note for {p.get('name', '?')}", expanded=False):
@@ -124,94 +127,159 @@ with tab1:
             else:
                 st.info("No players in this session yet.")
 
+            # ── Court sheet ──
+            st.markdown("#### 🏟️ Court Sheet")
+            if st.button("Build balanced court sheet", key=f"sheet_{sel_sid}"):
+                st.session_state["court_sheet"] = (sel_sid, *build_sheet(sel_sid))
+            if st.session_state.get("court_sheet", (None,))[0] == sel_sid:
+                _, sheet, sheet_players = st.session_state["court_sheet"]
+
+                def _names(team):
+                    return " & ".join(
+                        f"{sheet_players[p].get('avatar_emoji', '🏸')} {sheet_players[p]['name']}" for p in team
+                    )
+
+                if not sheet["courts"]:
+                    st.info("Not enough confirmed players to fill a court.")
+                show_cards("court", [
+                    {"court": c["court"], "diff": c["diff"],
+                     "team_a": _names(c["teams"][0]), "team_b": _names(c["teams"][1])}
+                    for c in sheet["courts"]
+                ])
+                if sheet["bench"]:
+                    st.caption("Sitting out: " + ", ".join(sheet_players[p]["name"] for p in sheet["bench"]))
+                if sheet["courts"] and st.button("💾 Save court sheet", key=f"save_sheet_{sel_sid}"):
+                    save_sheet(sel_sid, sheet)
+                    st.success("Court sheet saved — future sheets will avoid these partnerships.")
+
 # ═══════════════════════════════════════════════════════════
 # TAB 2 — Send Invites
 # ═══════════════════════════════════════════════════════════
 with tab2:
-    st.subheader("Send Private Invite")
+    st.subheader("Send Private Invites")
 
     all_players = fetch_all("players", filters={"is_active": True}, order="name")
-    sessions = fetch_view("session_slots")
+    sessions = fetch_sessions()
 
     if not all_players or not sessions:
         st.info("Need at least one player and one session to send invites.")
     else:
         session_labels = {s["id"]: f"{s['date']} • {s['slot']} ({s.get('slots_left', '?')} left)" for s in sessions}
+        player_names = {p["id"]: f"{p.get('avatar_emoji', '🏸')} {p['name']}" for p in all_players}
 
-        selected_player = st.selectbox(
-            "Select Player",
-            options=all_players,
-            format_func=lambda p: f"{p.get('avatar_emoji', '🏸')} {p['name']}",
-            key="invite_player",
-        )
         selected_session = st.selectbox(
             "Select Session",
             options=list(session_labels.keys()),
             format_func=lambda x: session_labels[x],
             key="invite_session",
         )
+        sess_data = next(s for s in sessions if s["id"] == selected_session)
+
+        # Most likely players first: regulars of this weekday/time slot and
+        # people who often play with whoever is already confirmed.
+        on_session = fetch_all("attendance", filters={"session_id": selected_session})
+        roster = [a["player_id"] for a in on_session if a["status"] == "confirmed"]
+        taken = {a["player_id"] for a in on_session}
+        candidates = [pid for pid in player_names if pid not in taken]
+        likelihood = invite_likelihood(sess_data, roster, candidates)
+        candidates.sort(key=lambda pid: likelihood[pid], reverse=True)
+        if taken:
+            st.caption(f"{len(taken)} player(s) already on this session are not listed.")
+
+        open_slots = sess_data.get("slots_left") or 0
+        if open_slots > 0:
+            from utils import recommend
+
+            suggested = recommend.top_k(sess_data, roster, exclude=taken, k=min(open_slots, 10))
+            if suggested:
+                st.markdown(f"**💡 Suggested for the {open_slots} open slot(s)**")
+                st.caption(" · ".join(player_names[pid] for pid, _ in suggested if pid in player_names))
+                if st.button("Select suggested players", key=f"use_suggested_{selected_session}"):
+                    st.session_state[f"invite_players_{selected_session}"] = [
+                        pid for pid, _ in suggested if pid in player_names
+                    ]
+
+        # A form, so picking players doesn't rerun the dashboard on every click.
+        with st.form("invite_form"):
+            selected_players = st.multiselect(
+                "Select Players (most likely to join first)",
+                options=candidates,
+                format_func=lambda x: player_names[x] + (" ⭐" if likelihood[x] >= 3 else ""),
+                key=f"invite_players_{selected_session}",
+            )
+            submitted = st.form_submit_button("📩 Send Invites")
 
-        if st.button("📩 Send Invite"):
-            # Check if already exists
-            existing = fetch_all("attendance", filters={
-                "session_id": selected_session,
-                "player_id": selected_player["id"],
-            })
-            if existing:
-                st.warning(f"{selected_player['name']} already has a record for this session ({existing[0]['status']}).")
+        if submitted:
+            if not selected_players:
+                st.warning("Pick at least one player.")
             else:
-                sess_data = next((s for s in sessions if s["id"] == selected_session), {})
-                send_invite(selected_session, selected_player["id"], float(sess_data.get("fee_per_player", 0)))
-                st.success(f"Invite sent to {selected_player['name']}! 📩")
+                st.session_state["invite_result"] = send_invites(
+                    selected_session, selected_players, float(sess_data.get("fee_per_player", 0)),
+                )
+                # Rerun so the invitees drop out of the candidate list, with
+                # the selection cleared.
+                st.session_state.pop(f"invite_players_{selected_session}", None)
                 st.rerun()
 
+        if "invite_result" in st.session_state:
+            created, skipped = st.session_state.pop("invite_result")
+            if created:
+                st.success(f"Invited {len(created)} player(s): " + ", ".join(player_names[p] for p in created))
+            if skipped:
+                st.info(
+                    f"Skipped {len(skipped)} already on this session: "
+                    + ", ".join(player_names[p] for p in skipped)
+                )
+
 # ═══════════════════════════════════════════════════════════
 # TAB 3 — Create / Edit Session
 # ═══════════════════════════════════════════════════════════
 with tab3:
-    sub1, sub2 = st.tabs(["🆕 New Session", "✏️ Edit Session"])
+    sub1, sub2, sub3 = st.tabs(["🆕 New Session", "✏️ Edit Session", "🔁 Weekly Series"])
 
     # ── New Session ──
     with sub1:
         st.subheader("Create a New Session")
+        venues = get_venues()
+        # Outside the form so the free-court list follows the chosen time.
+        sess_date = st.date_input("Date", value=date.today() + timedelta(days=1))
+        sess_time = st.time_input("Start Time", value=time(7, 30), step=timedelta(minutes=15))
+        sess_minutes = st.number_input("Duration (minutes)", min_value=30, max_value=240, value=120, step=30)
+        venue = st.selectbox("Venue", list(venues.keys()))
+        free = free_courts(venue, sess_date, sess_time, sess_minutes)
+        st.caption(f"Free courts at {venue}: {', '.join(map(str, free)) or 'none'}")
+
         with st.form("create_session", clear_on_submit=True):
-            sess_date = st.date_input("Date", value=date.today() + timedelta(days=1))
-            sess_time = st.time_input("Start Time", value=time(7, 30), step=timedelta(minutes=15))
-            sess_slot = _format_slot(sess_time)
-            venue = st.selectbox("Venue", list(VENUES.keys()))
-            available_courts = VENUES[venue]["courts"]
-            num_courts = st.number_input(
-                "How many courts?", min_value=1,
-                max_value=len(available_courts), value=1,
-            )
-            court_numbers = st.multiselect(
-                "Which court number(s)?",
-                options=available_courts,
-                default=available_courts[:num_courts],
-            )
-            max_players = st.number_input("Max Players", min_value=2, max_value=30, value=num_courts * 4)
+            court_numbers = st.multiselect("Which court number(s)?", options=free, default=free[:1])
+            max_players = st.number_input("Max Players", min_value=2, max_value=30,
+                                          value=max(len(court_numbers), 1) * 4)
 
             if st.form_submit_button("🏟️ Create Session"):
-                court_str = ",".join(str(c) for c in sorted(court_numbers))
-                insert_row("sessions", {
-                    "date": str(sess_date),
-                    "slot": sess_slot,
-                    "venue": venue,
-                    "num_courts": len(court_numbers),
-                    "court_numbers": court_str,
-                    "max_players": max_players,
-                    "fee_per_player": 0,
-                })
-                st.success(f"Session created for {sess_date} ({sess_slot}) at {venue}! 🎉")
-                st.rerun()
+                sess_slot = _format_slot(sess_time)
+                try:
+                    insert_session({
+                        "date": str(sess_date),
+                        "start_time": sess_time.strftime("%H:%M"),
+                        "venue": venue,
+                        "courts": sorted(court_numbers),
+                        "duration_minutes": sess_minutes,
+                        "max_players": max_players,
+                        "fee_per_player": 0,
+                    })
+                except CourtConflict:
+                    st.error("Those courts were just booked for an overlapping time — pick others.")
+                else:
+                    st.success(f"Session created for {sess_date} ({sess_slot}) at {venue}! 🎉")
+                    st.rerun()
 
     # ── Edit Session ──
     with sub2:
         st.subheader("Edit Existing Session")
-        all_sessions = fetch_view("session_slots")
+        all_sessions = fetch_sessions()
         if not all_sessions:
             st.info("No sessions to edit.")
         else:
+            venues = get_venues()
             edit_labels = {
                 s["id"]: f"{s['date']} • {s['slot']} — {s.get('venue', '?')} (Courts: {s.get('court_numbers', '?')})"
                 for s in all_sessions
@@ -221,27 +289,91 @@ with tab3:
             sess = next(s for s in all_sessions if s["id"] == edit_sid)
 
             with st.form(f"edit_session_{edit_sid}"):
-                e_time = st.time_input("Start Time", value=_slot_to_time(sess.get("slot", "")), step=timedelta(minutes=15))
-                e_venue = st.selectbox("Venue", list(VENUES.keys()),
-                                       index=list(VENUES.keys()).index(sess.get("venue", "Pro-Sports")))
-                e_avail = VENUES[e_venue]["courts"]
-                current_courts = [int(c) for c in str(sess.get("court_numbers", "1")).split(",") if c.strip().isdigit()]
+                e_time = st.time_input("Start Time", value=time.fromisoformat(sess["start_time"]),
+                                       step=timedelta(minutes=15))
+                e_minutes = st.number_input("Duration (minutes)", min_value=30, max_value=240, step=30,
+                                            value=sess.get("duration_minutes") or 120)
+                e_venue = st.selectbox("Venue", list(venues.keys()),
+                                       index=list(venues.keys()).index(sess.get("venue", "Pro-Sports")))
+                e_avail = venues[e_venue]["courts"]
                 e_courts = st.multiselect("Court Number(s)", options=e_avail,
-                                          default=[c for c in current_courts if c in e_avail])
+                                          default=[c for c in sess.get("courts") or [] if c in e_avail])
                 e_max = st.number_input("Max Players", min_value=2, max_value=30,
                                         value=sess.get("max_players", 8))
 
                 if st.form_submit_button("💾 Save Changes"):
-                    court_str = ",".join(str(c) for c in sorted(e_courts))
-                    update_row("sessions", edit_sid, {
-                        "slot": _format_slot(e_time),
-                        "venue": e_venue,
-                        "num_courts": len(e_courts),
-                        "court_numbers": court_str,
-                        "max_players": e_max,
-                    })
-                    st.success("Session updated!")
-                    st.rerun()
+                    try:
+                        update_session(edit_sid, {
+                            "start_time": e_time.strftime("%H:%M"),
+                            "duration_minutes": e_minutes,
+                            "venue": e_venue,
+                            "courts": sorted(e_courts),
+                            "max_players": e_max,
+                        })
+                    except CourtConflict:
+                        free = free_courts(e_venue, date.fromisoformat(sess["date"]), e_time, e_minutes,
+                                           exclude_session=edit_sid)
+                        st.error(f"Another session already holds one of those courts then. "
+                                 f"Free at that time: {', '.join(map(str, free)) or 'none'}.")
+                    else:
+                        st.success("Session updated!")
+                        st.rerun()
+
+    # ── Weekly Series ──
+    with sub3:
+        st.subheader("Recurring Weekly Sessions")
+        with st.form("create_series", clear_on_submit=True):
+            series_name = st.text_input("Name", placeholder="e.g. Hermes early birds")
+            series_days = st.multiselect("Days", options=list(range(1, 8)), default=[1, 3, 5],
+                                         format_func=lambda d: WEEKDAYS[d - 1])
+            series_time = st.time_input("Start Time", value=time(7, 30), step=timedelta(minutes=15))
+            venues = get_venues()
+            series_venue = st.selectbox("Venue", list(venues.keys()), key="series_venue")
+            series_courts = st.multiselect("Court Number(s)", options=venues[series_venue]["courts"],
+                                           default=venues[series_venue]["courts"][:1])
+            series_minutes = st.number_input("Duration (minutes)", min_value=30, max_value=240, value=120, step=30)
+            series_max = st.number_input("Max Players", min_value=2, max_value=30, value=8)
+            series_weeks = st.number_input("Create sessions for the next N weeks", min_value=1, max_value=26, value=4)
+
+            if st.form_submit_button("🔁 Create Series"):
+                if not series_name or not series_days or not series_courts:
+                    st.warning("Give the series a name, at least one day and one court.")
+                else:
+                    new_series = insert_row("session_series", {
+                        "name": series_name,
+                        "weekdays": sorted(series_days),
+                        "slot": _format_slot(series_time),
+                        "venue": series_venue,
+                        "courts": sorted(series_courts),
+                        "court_numbers": ",".join(str(c) for c in sorted(series_courts)),
+                        "duration_minutes": series_minutes,
+                        "max_players": series_max,
+                        "created_by": current["id"],
+                    }).data[0]
+                    st.session_state["series_result"] = (new_series["name"], generate_series(new_series, series_weeks))
+
+        all_series = fetch_all("session_series", filters={"is_active": True}, order="name")
+        for ser in all_series:
+            days = "/".join(WEEKDAYS[d - 1] for d in ser["weekdays"])
+            col_a, col_b, col_c = st.columns([3, 1, 1])
+            col_a.markdown(f"**{ser['name']}** — {days} {ser['slot']} at {ser['venue']} (Courts: {ser['court_numbers']})")
+            weeks = col_b.number_input("Weeks", min_value=1, max_value=26, value=4,
+                                       key=f"series_weeks_{ser['id']}", label_visibility="collapsed")
+            if col_c.button("Generate", key=f"series_gen_{ser['id']}"):
+                st.session_state["series_result"] = (ser["name"], generate_series(ser, weeks))
+
+        if "series_result" in st.session_state:
+            name, res = st.session_state.pop("series_result")
+            if res["created"]:
+                st.success(f"{name}: created {len(res['created'])} session(s) — "
+                           + ", ".join(str(d) for d in res["created"]))
+            if res["existing"]:
+                st.info(f"{name}: {len(res['existing'])} occurrence(s) already exist.")
+            for d, clash in res["conflicts"]:
+                st.warning(f"{name}: skipped {d} — court(s) {', '.join(map(str, clash['courts']))} "
+                           f"already booked around {clash.get('slot', '?')}.")
+            if not any(res.values()):
+                st.info(f"{name}: no occurrences in that window.")
 
 # ═══════════════════════════════════════════════════════════
 # TAB 4 — Session-level Fees (assign one fee to all players)
@@ -249,7 +381,7 @@ with tab3:
 with tab4:
     st.subheader("Set Fee For All Players In A Session")
 
-    all_sessions = fetch_view("session_slots")
+    all_sessions = fetch_sessions()
     if not all_sessions:
         st.info("No sessions yet.")
     else:
@@ -275,36 +407,74 @@ with tab4:
 
     st.divider()
     st.subheader("📜 Fee Audit Log")
+    action_labels = {
+        "fee_set": "💲 Fee Set",
+        "fee_updated": "✏️ Fee Updated",
+        "payment_recorded": "💰 Payment",
+        "payment_reversed": "↩️ Reversed",
+    }
+    with st.expander("Filters", expanded=False):
+        f_player = st.selectbox(
+            "Player", [None] + (all_players or []),
+            format_func=lambda p: "All players" if p is None else f"{p.get('avatar_emoji', '🏸')} {p['name']}",
+            key="audit_player",
+        )
+        f_session = st.selectbox(
+            "Session", [None] + [s["id"] for s in all_sessions or []],
+            format_func=lambda x: "All sessions" if x is None else fee_labels[x],
+            key="audit_session",
+        )
+        f_action = st.selectbox(
+            "Action", [None] + list(action_labels),
+            format_func=lambda a: "All actions" if a is None else action_labels[a],
+            key="audit_action",
+        )
+        f_dates = st.date_input("Date range", value=(), key="audit_dates")
+    f_from, f_to = (tuple(f_dates) + (None, None))[:2] if f_dates else (None, None)
+    audit_filters = {
+        "player_id": f_player["id"] if f_player else None,
+        "session_id": f_session,
+        "action": f_action,
+        "date_from": f_from,
+        "date_to": f_to or f_from,
+    }
+
+    # Cursor stack for keyset paging; reset whenever the filters change.
+    if st.session_state.get("audit_filters") != audit_filters:
+        st.session_state["audit_filters"] = audit_filters
+        st.session_state["audit_cursors"] = [None]
+    cursors = st.session_state["audit_cursors"]
+
     try:
-        audit = fetch_all("fee_audit_log", order="created_at")
+        audit, next_cursor = fetch_audit_log(cursor=cursors[-1], **audit_filters)
     except Exception:
-        audit = []
+        audit, next_cursor = [], None
         st.info("Fee audit log table is not available yet. Run `migration_v5.sql` in Supabase SQL Editor.")
     if audit:
-        players_map_all = {p["id"]: p for p in fetch_all("players")}
-        for entry in reversed(audit[-50:]):
-            p = players_map_all.get(entry.get("player_id"), {})
-            action_label = {
-                "fee_set": "💲 Fee Set",
-                "fee_updated": "✏️ Fee Updated",
-                "payment_recorded": "💰 Payment",
-                "payment_reversed": "↩️ Reversed",
-            }.get(entry["action"], entry["action"])
-
-            st.markdown(f"""
-            <div class="player-card">
-                <div class="player-avatar">📝</div>
-                <div class="player-info">
-                    <div class="name">{action_label} — {p.get('name', '?')}</div>
-                    <div class="sub">₹{entry.get('old_value', 0):.0f} → ₹{entry.get('new_value', 0):.0f}
-                        &nbsp;•&nbsp; by {entry.get('changed_by', '?')}
-                        &nbsp;•&nbsp; {str(entry.get('created_at', ''))[:16]}</div>
-                </div>
-            </div>
-            """, unsafe_allow_html=True)
+        rows = []
+        for entry in audit:
+            p = entry.get("player") or {}
+            rows.append({
+                "avatar": "📝",
+                "name": f"{action_labels.get(entry['action'], entry['action'])} — {p.get('name', '?')}",
+                "sub": (
+                    f"₹{entry.get('old_value') or 0:.0f} → ₹{entry.get('new_value') or 0:.0f}"
+                    f" • by {entry.get('changed_by', '?')}"
+                    f" • {str(entry.get('created_at', ''))[:16]}"
+                ),
+            })
+        show_cards("player", rows)
     else:
         st.info("No audit entries yet.")
 
+    c_newer, c_older = st.columns(2)
+    if len(cursors) > 1 and c_newer.button("← Newer", key="audit_newer"):
+        cursors.pop()
+        st.rerun()
+    if next_cursor and c_older.button("Older →", key="audit_older"):
+        cursors.append(next_cursor)
+        st.rerun()
+
 # ═══════════════════════════════════════════════════════════
 # TAB 5 — Rate Players
 # ═══════════════════════════════════════════════════════════
@@ -317,22 +487,39 @@ with tab5:
         sel_p = st.selectbox("Player", rate_players,
                              format_func=lambda p: f"{p.get('avatar_emoji', '🏸')} {p['name']}",
                              key="rate_player")
-        with st.form("rate_form"):
-            footwork = st.slider("Footwork", 1, 10, 5)
-            stamina = st.slider("Stamina", 1, 10, 5)
-            smash = st.slider("Smash Power", 1, 10, 5)
-            net_play = st.slider("Net Play", 1, 10, 5)
+        prof = rating_profile(sel_p["id"])
+        with st.form(f"rate_form_{sel_p['id']}"):
+            # Start the sliders at the player's recent form (EWMA), not at 5.
+            scores = {
+                dim: st.slider(label, 1, 10, round(prof[f"ewma_{dim}"]) if prof else 5)
+                for dim, label in (("footwork", "Footwork"), ("stamina", "Stamina"),
+                                   ("smash_power", "Smash Power"), ("net_play", "Net Play"))
+            }
             if st.form_submit_button("Save Rating"):
-                upsert_row("ratings", {
-                    "player_id": sel_p["id"],
-                    "footwork": footwork,
-                    "stamina": stamina,
-                    "smash_power": smash,
-                    "net_play": net_play,
-                })
+                record_rating(sel_p["id"], current["id"], scores)
                 st.success(f"Rating saved for {sel_p['name']}!")
                 st.rerun()
 
+        if prof:
+            suggested = suggested_skill(prof)
+            current_skill = sel_p.get("skill_level") or 5
+            m1, m2, m3 = st.columns(3)
+            m1.metric("Ratings", prof["n"])
+            m2.metric("Recent form", f"{current_level(prof):.1f}")
+            m3.metric("Suggested skill", suggested, delta=suggested - current_skill)
+            if suggested != current_skill and st.button(f"Set skill level to {suggested}", key="apply_skill"):
+                update_row("players", sel_p["id"], {"skill_level": suggested})
+                st.success(f"{sel_p['name']} is now skill level {suggested}.")
+                st.rerun()
+
+            trend = rating_history(sel_p["id"])
+            if len(trend) > 1:
+                import pandas as pd
+
+                df = pd.DataFrame(trend)
+                df.index = pd.to_datetime(df["rated_at"], format="ISO8601")
+                st.line_chart(df[list(RATING_DIMENSIONS)])
+
 # ═══════════════════════════════════════════════════════════
 # TAB 6 — Passwords
 # ═══════════════════════════════════════════════════════════
@@ -1,3 +1,4 @@
+import html
 import streamlit as st
 from datetime import date as dt_date
 
@@ -5,6 +6,7 @@ from utils.styles import inject_mobile_css
 from utils.helpers import bottom_nav, status_badge
 from utils.auth import login_gate
 from utils.supabase_client import fetch_all, get_client
+from utils.cards import Safe, show_cards
 
 st.set_page_config(page_title="My Activities | StringerS", page_icon="🗓️", layout="wide", initial_sidebar_state="collapsed")
 inject_mobile_css()
@@ -78,66 +80,65 @@ c3.metric("Activities", len(attendance))
 
 st.divider()
 
+
+def _due_badge(a: dict) -> str:
+    due = float(a.get("fee_charged", 0)) - float(a.get("amount_paid", 0))
+    return f' &nbsp; <span class="badge-due">₹{due:.0f} due</span>' if due > 0 else ""
+
+
 f_tab, p_tab, pay_tab = st.tabs(["⏭️ Future Activities", "🕘 Past Activities", "💳 My Payments"])
 
 with f_tab:
     if not future_rows:
         st.info("No upcoming activities yet.")
     else:
+        rows = []
         for a in future_rows:
             sess = a.get("session", {}) or {}
-            due = float(a.get("fee_charged", 0)) - float(a.get("amount_paid", 0))
-            due_html = f' &nbsp; <span class="badge-due">₹{due:.0f} due</span>' if due > 0 else ""
-            st.markdown(
-                f"""
-                <div class="game-card">
-                    <strong>{sess.get('date', '?')} • {sess.get('slot', '?')}</strong>
-                    &nbsp; {status_badge(a.get('status', 'pending'))}{due_html}
-                    <br>📍 {sess.get('venue', '?')} Court {sess.get('court_numbers', '?')}
-                </div>
-                """,
-                unsafe_allow_html=True,
-            )
+            rows.append({
+                "date": sess.get("date", "?"),
+                "slot": sess.get("slot", "?"),
+                "badge": Safe(status_badge(a.get("status", "pending")) + _due_badge(a)),
+                "venue": sess.get("venue", "?"),
+                "courts": sess.get("court_numbers", "?"),
+            })
+        show_cards("activity", rows)
 
 with p_tab:
     if not past_rows:
         st.info("No past activities yet.")
     else:
+        rows = []
         for a in past_rows:
             sess = a.get("session", {}) or {}
             fee = float(a.get("fee_charged", 0))
             paid = float(a.get("amount_paid", 0))
             note = a.get("coach_note")
-            note_html = f"<br>💬 <em>{note}</em>" if note else ""
-            st.markdown(
-                f"""
-                <div class="game-card">
-                    <strong>{sess.get('date', '?')} • {sess.get('slot', '?')}</strong>
-                    &nbsp; {status_badge(a.get('status', 'pending'))}
-                    <br>📍 {sess.get('venue', '?')} Court {sess.get('court_numbers', '?')}
-                    <br>Fee: ₹{fee:.0f} &nbsp;|&nbsp; Paid: ₹{paid:.0f}{note_html}
-                </div>
-                """,
-                unsafe_allow_html=True,
-            )
+            details = f"<br>Fee: ₹{fee:.0f} &nbsp;|&nbsp; Paid: ₹{paid:.0f}"
+            if note:
+                details += f"<br>💬 <em>{html.escape(note)}</em>"
+            rows.append({
+                "date": sess.get("date", "?"),
+                "slot": sess.get("slot", "?"),
+                "badge": Safe(status_badge(a.get("status", "pending"))),
+                "venue": sess.get("venue", "?"),
+                "courts": sess.get("court_numbers", "?"),
+                "details": Safe(details),
+            })
+        show_cards("activity", rows)
 
 with pay_tab:
     my_payments = fetch_all("payments", filters={"player_id": player_id}, order="payment_date")
     if not my_payments:
         st.info("No payments recorded yet.")
     else:
-        for pay in reversed(my_payments):
-            st.markdown(
-                f"""
-                <div class="player-card">
-                    <div class="player-avatar">💵</div>
-                    <div class="player-info">
-                        <div class="name">₹{pay['amount']:.0f}</div>
-                        <div class="sub">{pay['payment_date']}{' — ' + pay['notes'] if pay.get('notes') else ''}</div>
-                    </div>
-                </div>
-                """,
-                unsafe_allow_html=True,
-            )
+        show_cards("player", [
+            {
+                "avatar": "💵",
+                "name": f"₹{pay['amount']:.0f}",
+                "sub": pay["payment_date"] + (" — " + pay["notes"] if pay.get("notes") else ""),
+            }
+            for pay in reversed(my_payments)
+        ])
 
 bottom_nav("3_My_Profile.py")
@@ -2,6 +2,7 @@ import streamlit as st
 from utils.styles import inject_mobile_css
 from utils.helpers import bottom_nav, skill_label, is_coach_view
 from utils.auth import login_gate, set_player_password
+from utils.cards import render
 from utils.supabase_client import fetch_all, insert_row, update_row
 
 st.set_page_config(page_title="Manage Players | StringerS", page_icon="👥", layout="wide", initial_sidebar_state="collapsed")
@@ -55,15 +56,11 @@ with tab2:
     else:
         for p in players:
             active_dot = "🟢" if p.get("is_active") else "🔴"
-            st.markdown(f"""
-            <div class="player-card">
-                <div class="player-avatar">{p.get('avatar_emoji', '🏸')}</div>
-                <div class="player-info">
-                    <div class="name">{active_dot} {p['name']}</div>
-                    <div class="sub">{p.get('phone', '')} &nbsp;•&nbsp; {p.get('role', 'player').title()} &nbsp;•&nbsp; {skill_label(p.get('skill_level', 5))}</div>
-                </div>
-            </div>
-            """, unsafe_allow_html=True)
+            st.markdown(render("player", {
+                "avatar": p.get("avatar_emoji", "🏸"),
+                "name": f"{active_dot} {p['name']}",
+                "sub": f"{p.get('phone', '')} • {p.get('role', 'player').title()} • {skill_label(p.get('skill_level', 5))}",
+            }), unsafe_allow_html=True)
 
             with st.expander(f"Edit {p['name']}", expanded=False):
                 new_name = st.text_input("Name", value=p["name"], key=f"n_{p['id']}")
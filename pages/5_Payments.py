@@ -3,7 +3,11 @@ import streamlit as st
 from utils.styles import inject_mobile_css
 from utils.helpers import bottom_nav, is_coach_view
 from utils.auth import login_gate
-from utils.supabase_client import fetch_all, get_client, record_payment_with_audit
+from utils.cards import show_cards
+from utils.supabase_client import (
+    fetch_all, get_client, record_payment_with_audit, DuplicatePayment,
+    extract_payment_reference, search_payment_references,
+)
 
 st.set_page_config(page_title="Payments | StringerS", page_icon="💳", layout="wide", initial_sidebar_state="collapsed")
 inject_mobile_css()
@@ -88,56 +92,95 @@ else:
 
 st.divider()
 
-with st.form("payment_form", clear_on_submit=True):
+# Keyed by what is still owed, so a repeated submit of a form that was
+# already applied no longer matches a widget and is ignored.
+_form_key = "payment_form_" + str(abs(hash(tuple((u["id"], u["amount_paid"]) for u in unpaid))))
+
+with st.form(_form_key, clear_on_submit=True):
     amount = st.number_input("Amount (₹)", min_value=0.0, step=10.0)
     pay_date = st.date_input("Payment Date")
     notes = st.text_input("Payment Proof / UTR / Note")
 
     if st.form_submit_button("💰 Submit Payment"):
+        reference = extract_payment_reference(notes)
         if amount <= 0:
             st.error("Amount must be greater than zero.")
         elif not unpaid:
             st.warning("No unpaid activities found.")
         else:
-            remaining = float(amount)
+            allocations, remaining = [], float(amount)
             for u in sorted(unpaid, key=lambda x: (x.get("session", {}) or {}).get("date", "")):
                 if remaining <= 0:
                     break
-                due = u["fee_charged"] - u["amount_paid"]
-                apply_amt = min(remaining, due)
+                apply_amt = min(remaining, u["fee_charged"] - u["amount_paid"])
+                allocations.append({
+                    "attendance_id": u["id"],
+                    "session_id": u["session_id"],
+                    "amount": apply_amt,
+                    "expected_paid": u["amount_paid"],
+                })
+                remaining -= apply_amt
+            try:
                 record_payment_with_audit(
-                    attendance_id=u["id"],
-                    session_id=u["session_id"],
                     player_id=selected_player_id,
-                    amount=apply_amt,
+                    allocations=allocations,
                     payment_date=str(pay_date),
                     changed_by=current.get("name", "player"),
                     notes=notes or None,
+                    reference=reference,
                 )
-                remaining -= apply_amt
-
-            st.success("Payment submitted successfully! ✅")
-            st.rerun()
+            except DuplicatePayment:
+                if reference:
+                    st.warning(f"Payment with reference {reference} is already recorded.")
+                else:
+                    st.warning("These dues changed since the form was shown — check and resubmit.")
+            else:
+                st.success("Payment submitted successfully! ✅")
+                st.rerun()
 
 if is_coach:
     st.divider()
     st.subheader("📜 Payment History")
+
+    ref_query = st.text_input("🔎 Find by UTR / reference", placeholder="e.g. last 4+ digits")
+    if ref_query and len(ref_query.strip()) >= 3:
+        found = search_payment_references(ref_query)
+        if not found["payments"] and not found["audit"]:
+            st.info("No payments match that reference.")
+        matches = []
+        for pay in found["payments"]:
+            p = pay.get("player") or {}
+            matches.append({
+                "avatar": p.get("avatar_emoji", "💵"),
+                "name": f"₹{pay['amount']:.0f} — {p.get('name', '?')}",
+                "sub": f"{pay['payment_date']} · {pay['reference']}",
+            })
+        for entry in found["audit"]:
+            p = entry.get("player") or {}
+            matches.append({
+                "avatar": "📝",
+                "name": f"₹{(entry.get('old_value') or 0):.0f} → ₹{(entry.get('new_value') or 0):.0f}"
+                        f" — {p.get('name', '?')}",
+                "sub": f"by {entry.get('changed_by') or '?'} ({str(entry.get('created_at') or '')[:10]})"
+                       f" · {entry['reference']}",
+            })
+        show_cards("player", matches)
+        st.divider()
+
     all_payments = fetch_all("payments", order="payment_date")
     players_map = {p["id"]: p for p in fetch_all("players")}
 
     if not all_payments:
         st.info("No payment records yet.")
     else:
+        rows = []
         for pay in reversed(all_payments):
             p = players_map.get(pay["player_id"], {})
-            st.markdown(f"""
-            <div class="player-card">
-                <div class="player-avatar">{p.get('avatar_emoji', '💵')}</div>
-                <div class="player-info">
-                    <div class="name">₹{pay['amount']:.0f} — {p.get('name', '?')}</div>
-                    <div class="sub">{pay['payment_date']}{' — ' + pay['notes'] if pay.get('notes') else ''}</div>
-                </div>
-            </div>
-            """, unsafe_allow_html=True)
+            rows.append({
+                "avatar": p.get("avatar_emoji", "💵"),
+                "name": f"₹{pay['amount']:.0f} — {p.get('name', '?')}",
+                "sub": pay["payment_date"] + (" — " + pay["notes"] if pay.get("notes") else ""),
+            })
+        show_cards("player", rows)
 
 bottom_nav("5_Payments.py")
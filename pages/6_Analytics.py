@@ -1,9 +1,10 @@
 import streamlit as st
-import pandas as pd
 from utils.styles import inject_mobile_css
 from utils.helpers import bottom_nav, is_coach_view
 from utils.auth import login_gate
-from utils.supabase_client import fetch_all, fetch_view
+from utils.cards import Safe, show_cards
+from utils import leaderboard
+from utils.supabase_client import fetch_view, read_stats
 
 st.set_page_config(page_title="Analytics | StringerS", page_icon="📊", layout="wide", initial_sidebar_state="collapsed")
 inject_mobile_css()
@@ -14,6 +15,9 @@ if not is_coach_view():
     st.warning("Coach access only.")
     st.stop()
 
+# pandas/numpy load only once a coach is through the gate.
+from utils import analytics, charts
+
 st.title("📊 Analytics")
 
 tab1, tab2, tab3 = st.tabs(["📈 Attendance", "💰 Revenue", "👥 Leaderboard"])
@@ -22,100 +26,88 @@ tab1, tab2, tab3 = st.tabs(["📈 Attendance", "💰 Revenue", "👥 Leaderboard
 # TAB 1 — Attendance Trends
 # ═══════════════════════════════════════════════════════════
 with tab1:
-    attendance = fetch_all("attendance", filters={"status": "confirmed"})
-    if not attendance:
+    daily = analytics.daily_attendance()
+    if daily.empty:
         st.info("No confirmed attendance data yet.")
     else:
-        # Join with session dates
-        from utils.supabase_client import get_client
-        data = (
-            get_client().table("attendance")
-            .select("id, session:sessions(date, slot)")
-            .eq("status", "confirmed")
-            .execute().data
-        )
-        if data:
-            rows = [{"date": d["session"]["date"], "slot": d["session"]["slot"]} for d in data if d.get("session")]
-            df = pd.DataFrame(rows)
-            df["date"] = pd.to_datetime(df["date"])
-
-            daily = df.groupby("date").size().reset_index(name="players")
-            st.subheader("Daily Attendance")
-            st.line_chart(daily.set_index("date")["players"])
-
-            st.subheader("Morning vs Evening Split")
-            slot_counts = df["slot"].value_counts()
-            st.bar_chart(slot_counts)
+        st.subheader("Daily Attendance")
+        att_start, att_end = charts.date_range_picker(daily, key="att_range")
+        charts.line_chart(daily, start=att_start, end=att_end, y_label="Players")
+
+        st.subheader("Morning vs Evening Split")
+        st.bar_chart(analytics.slot_split())
 
 # ═══════════════════════════════════════════════════════════
 # TAB 2 — Revenue
 # ═══════════════════════════════════════════════════════════
 with tab2:
-    payments = fetch_all("payments", order="payment_date")
-    if not payments:
+    collections = analytics.daily_collections()
+    if collections.empty:
         st.info("No payment data yet.")
     else:
-        df_pay = pd.DataFrame(payments)
-        df_pay["payment_date"] = pd.to_datetime(df_pay["payment_date"])
-        df_pay["month"] = df_pay["payment_date"].dt.to_period("M").astype(str)
-
-        total_collected = df_pay["amount"].sum()
+        total_collected = analytics.total_collected()
         st.metric("Total Collected", f"₹{total_collected:,.0f}")
 
-        monthly = df_pay.groupby("month")["amount"].sum().reset_index()
         st.subheader("Monthly Collections")
-        st.bar_chart(monthly.set_index("month")["amount"])
+        pay_start, pay_end = charts.date_range_picker(collections, key="pay_range")
+        charts.bar_chart(collections, start=pay_start, end=pay_end, y_label="₹",
+                         freqs=("MS", "QS", "YS"))
 
     # Expenditures
-    expenditures = fetch_all("expenditures", order="date")
-    if expenditures:
-        df_exp = pd.DataFrame(expenditures)
-        total_exp = df_exp["amount"].sum()
+    total_exp = analytics.total_expenditure()
+    if total_exp:
         st.metric("Total Expenditure", f"₹{total_exp:,.0f}")
 
-        if payments:
+        if not collections.empty:
             st.metric("Net Profit", f"₹{total_collected - total_exp:,.0f}")
 
 # ═══════════════════════════════════════════════════════════
 # TAB 3 — Leaderboard
 # ═══════════════════════════════════════════════════════════
 with tab3:
-    st.subheader("🏆 Most Active Players")
-    balances = fetch_view("player_balance")
-    if balances:
-        sorted_b = sorted(balances, key=lambda b: b.get("games_played", 0), reverse=True)
-        for i, b in enumerate(sorted_b[:10], 1):
-            medal = {1: "🥇", 2: "🥈", 3: "🥉"}.get(i, f"#{i}")
-            st.markdown(f"""
-            <div class="player-card">
-                <div class="player-avatar">{medal}</div>
-                <div class="player-info">
-                    <div class="name">{b['name']}</div>
-                    <div class="sub">{b.get('games_played', 0)} games &nbsp;•&nbsp; Skill {b.get('skill_level', '?')}</div>
-                </div>
-            </div>
-            """, unsafe_allow_html=True)
+    st.subheader("🏆 Leaderboards")
+    c1, c2 = st.columns(2)
+    period = c1.selectbox("Period", list(leaderboard.PERIODS), format_func=leaderboard.PERIODS.get)
+    metric = c2.selectbox("Ranking", list(leaderboard.METRICS), format_func=leaderboard.METRICS.get)
+    board = leaderboard.top(period, metric, k=10)
+    if board:
+        show_cards("player", [
+            {
+                "avatar": {1: "🥇", 2: "🥈", 3: "🥉"}.get(r["rank"], f"#{r['rank']}"),
+                "name": (r.get("player") or {}).get("name", "Unknown"),
+                "sub": f"{leaderboard.format_value(metric, r['value'])} • "
+                       f"Skill {(r.get('player') or {}).get('skill_level', '?')}",
+            }
+            for r in board
+        ])
     else:
         st.info("No data yet.")
 
     st.divider()
 
     st.subheader("📊 Outstanding Dues")
+    balances = fetch_view("player_balance")
     if balances:
         with_dues = [b for b in balances if b.get("balance_due", 0) > 0]
         with_dues.sort(key=lambda b: b["balance_due"], reverse=True)
         if with_dues:
-            for b in with_dues:
-                st.markdown(f"""
-                <div class="player-card">
-                    <div class="player-avatar">💳</div>
-                    <div class="player-info">
-                        <div class="name">{b['name']}</div>
-                        <div class="sub">Due: <span class="badge-due">₹{b['balance_due']:.0f}</span></div>
-                    </div>
-                </div>
-                """, unsafe_allow_html=True)
+            show_cards("player", [
+                {
+                    "avatar": "💳",
+                    "name": b["name"],
+                    "sub": Safe(f'Due: <span class="badge-due">₹{b["balance_due"]:.0f}</span>'),
+                }
+                for b in with_dues
+            ])
         else:
             st.success("All dues cleared! 🎉")
 
+with st.expander("⚙️ Data cache (this server process)"):
+    stats = read_stats()
+    c1, c2, c3, c4 = st.columns(4)
+    c1.metric("Cache hits", stats["hits"])
+    c2.metric("Queries sent", stats["fetches"])
+    c3.metric("Coalesced reads", stats["coalesced"], help="Reads that waited on an identical in-flight query")
+    c4.metric("In flight", stats["inflight"])
+
 bottom_nav("6_Analytics.py")
@@ -1,15 +1,18 @@
 import streamlit as st
-import pandas as pd
 from utils.styles import inject_mobile_css
 from utils.helpers import bottom_nav
 from utils.auth import login_gate
-from utils.supabase_client import fetch_all, insert_row, delete_row
+from utils.cards import render
+from utils.supabase_client import insert_row, delete_row
 
 st.set_page_config(page_title="Expenditure | StringerS", page_icon="📒", layout="wide", initial_sidebar_state="collapsed")
 inject_mobile_css()
 
 current = login_gate()
 
+# pandas loads only after the login gate.
+from utils import analytics
+
 st.title("📒 Expenditure Tracker")
 
 tab1, tab2 = st.tabs(["➕ Add Expense", "📋 History"])
@@ -37,6 +40,7 @@ with tab1:
                     "amount": float(amount),
                     "notes": notes or None,
                 })
+                analytics.invalidate("expenditures")
                 st.success("Expense recorded!")
                 st.rerun()
 
@@ -44,33 +48,28 @@ with tab1:
 # TAB 2 — History
 # ═══════════════════════════════════════════════════════════
 with tab2:
-    expenses = fetch_all("expenditures", order="date")
-    if not expenses:
+    expenses = analytics.snapshot("expenditures")
+    if expenses.empty:
         st.info("No expenses recorded yet.")
     else:
-        df = pd.DataFrame(expenses)
-        total = df["amount"].sum()
+        total = analytics.total_expenditure()
         st.metric("Total Expenditure", f"₹{total:,.0f}")
 
         # By category
         st.subheader("By Category")
-        cat_totals = df.groupby("category")["amount"].sum().sort_values(ascending=False)
-        st.bar_chart(cat_totals)
+        st.bar_chart(analytics.expenditure_by_category())
 
         st.subheader("All Records")
-        for exp in reversed(expenses):
-            st.markdown(f"""
-            <div class="player-card">
-                <div class="player-avatar">🧾</div>
-                <div class="player-info">
-                    <div class="name">₹{exp['amount']:.0f} — {exp['category']}</div>
-                    <div class="sub">{exp['date']}{' — ' + exp['notes'] if exp.get('notes') else ''}</div>
-                </div>
-            </div>
-            """, unsafe_allow_html=True)
+        for exp in expenses.sort_values("date", ascending=False).to_dict("records"):
+            st.markdown(render("player", {
+                "avatar": "🧾",
+                "name": f"₹{exp['amount']:.0f} — {exp['category']}",
+                "sub": f"{exp['date']:%Y-%m-%d}" + (" — " + exp["notes"] if exp.get("notes") else ""),
+            }), unsafe_allow_html=True)
 
             if st.button("🗑️ Delete", key=f"del_{exp['id']}"):
                 delete_row("expenditures", exp["id"])
+                analytics.invalidate("expenditures", rebuild=True)
                 st.rerun()
 
 bottom_nav("7_Expenditure.py")
@@ -0,0 +1,63 @@
+"""
+A remembered player's cold load must produce content on the first script
+run: the token comes from the request cookie, not a JS round trip.
+
+    python -m unittest tests.test_auth
+"""
+import os
+import sys
+import unittest
+from unittest import mock
+
+from streamlit.testing.v1 import AppTest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from utils import auth  # noqa: E402
+
+_PLAYER = {"id": "p-1", "name": "Asha", "role": "player", "avatar_emoji": "🏸"}
+
+
+def _page():
+    import streamlit as st
+
+    from utils.auth import login_gate
+
+    st.session_state["_runs"] = st.session_state.get("_runs", 0) + 1
+    current = login_gate()
+    st.markdown(f"Hey {current['name']}!")
+
+
+class ColdLoadTest(unittest.TestCase):
+    def setUp(self):
+        for name, value in {
+            "start_outbox_worker": lambda: None,
+            "start_change_feed": lambda: None,
+            "_find_auto_login_coach": lambda: None,
+            "_fetch_active_player": lambda player_id: dict(_PLAYER, is_active=True),
+        }.items():
+            patcher = mock.patch.object(auth, name, value)
+            patcher.start()
+            self.addCleanup(patcher.stop)
+
+    def _run(self, cookie):
+        with mock.patch.object(auth, "_read_cookie", lambda: cookie):
+            return AppTest.from_function(_page).run()
+
+    def test_remembered_player_renders_in_one_run(self):
+        at = self._run(auth._make_token(_PLAYER))
+        self.assertFalse(at.exception)
+        self.assertEqual(at.session_state["_runs"], 1)
+        self.assertEqual(at.session_state["authenticated_player"]["id"], _PLAYER["id"])
+        self.assertEqual([m.value for m in at.markdown], ["Hey Asha!"])
+
+    def test_tampered_token_shows_login_form(self):
+        at = self._run(auth._make_token(_PLAYER)[:-2] + "xx")
+        self.assertFalse(at.exception)
+        self.assertEqual(at.session_state["_runs"], 1)
+        self.assertNotIn("authenticated_player", at.session_state)
+        self.assertEqual(len(at.button), 1)     # the login form's Sign In
+
+
+if __name__ == "__main__":
+    unittest.main()
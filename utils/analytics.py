@@ -0,0 +1,177 @@
+"""
+In-process columnar snapshots for the Analytics and Expenditure pages.
+
+Each table is kept as a pandas DataFrame shared by every session in the
+process and topped up from an ``updated_at`` watermark (migration_v19), so
+new rows, status flips and edits all arrive with one incremental query and
+most reruns compute their charts with vectorized pandas ops and never touch
+Supabase.
+
+A snapshot is only topped up when its table_versions counter has moved
+(migration_v16); a table without a version row falls back to looking for
+changes every ``_REFRESH_SECONDS``. The watermark is read back by
+``_OVERLAP`` to catch rows whose transaction committed after a newer one was
+already seen. A top-up also compares row counts and rebuilds on a mismatch,
+which is how deletes show up, and every snapshot is rebuilt from scratch
+every ``_REBUILD_SECONDS`` as a safety net.
+"""
+import threading
+import time
+
+import pandas as pd
+
+from utils.supabase_client import get_client, table_versions
+
+# table -> columns kept in its snapshot (updated_at is the watermark)
+_COLUMNS = {
+    "sessions":     ["id", "date", "slot", "start_time", "venue", "updated_at"],
+    "attendance":   ["id", "session_id", "player_id", "status", "updated_at"],
+    "payments":     ["id", "player_id", "amount", "payment_date", "updated_at"],
+    "expenditures": ["id", "date", "category", "amount", "notes", "updated_at"],
+}
+_DATE_COLUMNS = ("date", "payment_date")
+_AMOUNT_COLUMNS = ("amount",)
+
+_REFRESH_SECONDS = 60          # look for changes at most once a minute
+_REBUILD_SECONDS = 15 * 60     # full reload as a safety net
+_OVERLAP = pd.Timedelta(minutes=2)   # re-read behind the watermark for late commits
+_PAGE_SIZE = 1000              # PostgREST's default max rows per request
+
+
+class _Snapshot:
+    def __init__(self, table: str):
+        self.table = table
+        self.frame = pd.DataFrame(columns=_COLUMNS[table])
+        self.watermark: str | None = None
+        self.version: int | None = None
+        self.built_at = 0.0
+        self.refreshed_at = 0.0
+
+
+_snapshots: dict[str, _Snapshot] = {}
+_lock = threading.Lock()
+
+
+def _fetch(table: str, since: str | None) -> pd.DataFrame:
+    """Page through *table* rows updated at/after *since* (all rows if None)."""
+    rows, start = [], 0
+    while True:
+        q = get_client().table(table).select(", ".join(_COLUMNS[table]))
+        if since:
+            q = q.gte("updated_at", since)
+        batch = (
+            q.order("updated_at").order("id")
+            .range(start, start + _PAGE_SIZE - 1).execute().data
+        )
+        rows.extend(batch)
+        if len(batch) < _PAGE_SIZE:
+            break
+        start += _PAGE_SIZE
+
+    df = pd.DataFrame(rows, columns=_COLUMNS[table])
+    for col in _DATE_COLUMNS:
+        if col in df:
+            df[col] = pd.to_datetime(df[col])
+    for col in _AMOUNT_COLUMNS:
+        if col in df:
+            df[col] = pd.to_numeric(df[col]).fillna(0.0)
+    df["updated_at"] = pd.to_datetime(df["updated_at"], utc=True, format="ISO8601")
+    return df
+
+
+def _count(table: str) -> int:
+    return get_client().table(table).select("id", count="exact", head=True).execute().count
+
+
+def snapshot(table: str) -> pd.DataFrame:
+    """Return the current columnar snapshot of *table*, refreshing if due."""
+    version = table_versions().get(table)
+    now = time.monotonic()
+    with _lock:
+        snap = _snapshots.get(table)
+        if snap is not None and now - snap.built_at > _REBUILD_SECONDS:
+            snap = None
+        if snap is not None:
+            due = (
+                snap.refreshed_at == 0.0
+                or (version is None and now - snap.refreshed_at > _REFRESH_SECONDS)
+                or (version is not None and version != snap.version)
+            )
+            if not due:
+                return snap.frame
+            changed = _fetch(table, snap.watermark)
+            if not changed.empty:
+                # Overlapping rows come back again; keep the newest copy.
+                snap.frame = (
+                    pd.concat([snap.frame, changed], ignore_index=True)
+                    .drop_duplicates("id", keep="last")
+                    .reset_index(drop=True)
+                )
+            if len(snap.frame) != _count(table):
+                snap = None     # rows were deleted
+
+        if snap is None:
+            snap = _Snapshot(table)
+            snap.frame = _fetch(table, None)
+            snap.built_at = now
+        snap.refreshed_at = now
+        snap.version = version
+        if not snap.frame.empty:
+            snap.watermark = (snap.frame["updated_at"].max() - _OVERLAP).isoformat()
+        _snapshots[table] = snap
+        return snap.frame
+
+
+def invalidate(table: str | None = None, *, rebuild: bool = False):
+    """Force the next read of *table* (or every table) to hit Supabase.
+
+    ``rebuild=True`` drops the snapshot entirely rather than topping it up.
+    """
+    with _lock:
+        tables = [table] if table else list(_snapshots)
+        for t in tables:
+            if rebuild:
+                _snapshots.pop(t, None)
+            elif t in _snapshots:
+                _snapshots[t].refreshed_at = 0.0
+
+
+# ── Metrics ────────────────────────────────────────────────
+
+
+def confirmed_attendance() -> pd.DataFrame:
+    """Confirmed attendance joined to its session's date and slot."""
+    att = snapshot("attendance")
+    sess = snapshot("sessions")
+    confirmed = att.loc[att["status"] == "confirmed", ["session_id"]]
+    return confirmed.merge(
+        sess[["id", "date", "slot"]], left_on="session_id", right_on="id", how="inner",
+    )[["date", "slot"]]
+
+
+def daily_attendance() -> pd.Series:
+    """Confirmed players per session date."""
+    return confirmed_attendance().groupby("date").size().rename("players")
+
+
+def slot_split() -> pd.Series:
+    return confirmed_attendance()["slot"].value_counts()
+
+
+def daily_collections() -> pd.Series:
+    """Amount collected per payment date."""
+    pay = snapshot("payments")
+    return pay.groupby("payment_date")["amount"].sum().rename("amount")
+
+
+def total_collected() -> float:
+    return float(snapshot("payments")["amount"].sum())
+
+
+def total_expenditure() -> float:
+    return float(snapshot("expenditures")["amount"].sum())
+
+
+def expenditure_by_category() -> pd.Series:
+    exp = snapshot("expenditures")
+    return exp.groupby("category")["amount"].sum().sort_values(ascending=False)
@@ -0,0 +1,201 @@
+"""
+Write-behind writer for fee_audit_log.
+
+log_audit() appends the entry to a local spool file (fsync'd) and returns;
+a background thread inserts spooled entries in batches. Anything still in the
+spool after a crash or a Supabase outage is replayed on the next start, and
+client-side ids make the replay idempotent. Only entries the database
+rejects as bad data (SQLSTATE class 22/23) are set aside in the dead-letter
+file; any other failure — 5xx, an expired JWT, a missing table — leaves the
+batch spooled for the next attempt.
+"""
+import atexit
+import json
+import os
+import threading
+import uuid
+from datetime import datetime, timezone
+
+from postgrest.exceptions import APIError
+
+from utils.supabase_client import get_client, invalidate_reads
+
+_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+_SPOOL_PATH = os.environ.get("AUDIT_SPOOL_PATH") or os.path.join(_ROOT, ".audit_spool.jsonl")
+
+_BATCH_SIZE = 100
+_FLUSH_INTERVAL = 2.0      # seconds between background flushes
+_MAX_BACKOFF = 60.0        # ceiling for retry delay while Supabase is down
+
+
+def _is_data_error(e: APIError) -> bool:
+    """Data exception (22xxx) or constraint violation (23xxx): the entry
+    itself is bad and will never insert, however often it is retried."""
+    return str(e.code or "")[:2] in ("22", "23")
+
+
+class AuditWriter:
+    def __init__(self, spool_path: str = _SPOOL_PATH, batch_size: int = _BATCH_SIZE,
+                 flush_interval: float = _FLUSH_INTERVAL):
+        self.spool_path = spool_path
+        self.dead_letter_path = spool_path + ".rejected"
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self._lock = threading.Lock()       # guards _pending and the spool file
+        self._wake = threading.Event()
+        self._thread: threading.Thread | None = None
+        self._pending: list[dict] = self._read_spool()
+
+    # ── Spool ──────────────────────────────────────────────
+
+    def _read_spool(self) -> list[dict]:
+        if not os.path.exists(self.spool_path):
+            return []
+        entries = []
+        with open(self.spool_path, encoding="utf-8") as f:
+            for line in f:
+                try:
+                    entries.append(json.loads(line))
+                except ValueError:
+                    # Torn final line from a crash mid-append.
+                    continue
+        return entries
+
+    def _rewrite_spool(self):
+        tmp = self.spool_path + ".tmp"
+        with open(tmp, "w", encoding="utf-8") as f:
+            for entry in self._pending:
+                f.write(json.dumps(entry, default=str) + "\n")
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp, self.spool_path)
+
+    # ── Public API ─────────────────────────────────────────
+
+    def log(self, entry: dict) -> str:
+        """Durably queue one audit entry and return its id."""
+        entry = dict(entry)
+        entry.setdefault("id", str(uuid.uuid4()))
+        entry.setdefault("created_at", datetime.now(timezone.utc).isoformat())
+        line = json.dumps(entry, default=str) + "\n"
+        with self._lock:
+            with open(self.spool_path, "a", encoding="utf-8") as f:
+                f.write(line)
+                f.flush()
+                os.fsync(f.fileno())
+            self._pending.append(entry)
+            full = len(self._pending) >= self.batch_size
+        self._ensure_thread()
+        if full:
+            self._wake.set()
+        return entry["id"]
+
+    def flush(self) -> int:
+        """Insert one batch of pending entries; return how many were handled.
+
+        Raises on anything but a data rejection, leaving the spool as it was.
+        """
+        with self._lock:
+            batch = list(self._pending[: self.batch_size])
+        if not batch:
+            return 0
+
+        rejected = []
+        try:
+            self._insert(batch)
+        except APIError as e:
+            if not _is_data_error(e):
+                raise
+            # Server refused the batch's data — find the offending rows one
+            # by one. Anything else propagates and the batch stays spooled.
+            for entry in batch:
+                try:
+                    self._insert([entry])
+                except APIError as row_error:
+                    if not _is_data_error(row_error):
+                        raise
+                    rejected.append(entry)
+        invalidate_reads()
+
+        done = {e["id"] for e in batch}
+        with self._lock:
+            self._pending = [e for e in self._pending if e["id"] not in done]
+            self._rewrite_spool()
+            if rejected:
+                with open(self.dead_letter_path, "a", encoding="utf-8") as f:
+                    for entry in rejected:
+                        f.write(json.dumps(entry, default=str) + "\n")
+        return len(batch)
+
+    def drain(self):
+        """Flush until the queue is empty (raises if Supabase is unreachable)."""
+        while self.flush():
+            pass
+
+    def pending_count(self) -> int:
+        with self._lock:
+            return len(self._pending)
+
+    # ── Internals ──────────────────────────────────────────
+
+    @staticmethod
+    def _insert(batch: list[dict]):
+        # Bulk inserts need identical keys on every row.
+        keys = set().union(*batch)
+        rows = [{k: e.get(k) for k in keys} for e in batch]
+        get_client().table("fee_audit_log").upsert(
+            rows, on_conflict="id", ignore_duplicates=True,
+        ).execute()
+
+    def _ensure_thread(self):
+        if self._thread and self._thread.is_alive():
+            return
+        with self._lock:
+            if self._thread and self._thread.is_alive():
+                return
+            self._thread = threading.Thread(
+                target=self._run, name="audit-writer", daemon=True,
+            )
+            self._thread.start()
+
+    def _run(self):
+        delay = self.flush_interval
+        while True:
+            self._wake.wait(timeout=delay)
+            self._wake.clear()
+            try:
+                self.drain()
+                delay = self.flush_interval
+            except Exception:
+                # Network / auth failure: entries stay spooled, back off.
+                delay = min(delay * 2, _MAX_BACKOFF)
+
+
+_writer: AuditWriter | None = None
+_writer_lock = threading.Lock()
+
+
+def get_writer() -> AuditWriter:
+    global _writer
+    if _writer is None:
+        with _writer_lock:
+            if _writer is None:
+                _writer = AuditWriter()
+                if _writer.pending_count():
+                    # Replay what a previous process left behind.
+                    _writer._ensure_thread()
+                atexit.register(_flush_at_exit)
+    return _writer
+
+
+def log_audit(entry: dict) -> str:
+    """Queue a fee_audit_log row; returns once it is safe in the local spool."""
+    return get_writer().log(entry)
+
+
+def _flush_at_exit():
+    try:
+        _writer.drain()
+    except Exception:
+        # Whatever is left stays in the spool for the next start.
+        pass
@@ -1,25 +1,39 @@
 """
 Authentication module for StringerS Badminton Academy.
-Phone (10-digit) + password login with persistent "Keep me logged in" via localStorage.
+Phone (10-digit) + password login with persistent "Keep me logged in" via a signed cookie.
 Coach/admin phones auto-login without a password prompt.
 """
+import base64
 import hashlib
 import hmac
+import json
 import os
 import secrets
+import threading
+import time
+from collections import defaultdict, deque
 
 import streamlit as st
-try:
-    from streamlit_js_eval import streamlit_js_eval
-except ModuleNotFoundError:
-    # Fallback keeps auth usable without localStorage persistence.
-    def streamlit_js_eval(*args, **kwargs):
-        return None
 
+from utils.changefeed import start_change_feed
+from utils.notifications import start_outbox_worker
+from utils.passwords import hash_password, needs_rehash, verify_password
 from utils.supabase_client import get_client, update_row
 
+
+def streamlit_js_eval(**kwargs):
+    """Run JS in the browser; the component is imported only when needed."""
+    try:
+        from streamlit_js_eval import streamlit_js_eval as _js_eval
+    except ModuleNotFoundError:
+        # Fallback keeps auth usable without cookie persistence.
+        return None
+    return _js_eval(**kwargs)
+
+
 # ── Constants ──────────────────────────────────────────────
-_LS_KEY = "stringers_auth"
+_COOKIE_NAME = "stringers_auth"
+_LS_KEY = "stringers_auth"  # pre-cookie localStorage slot, migrated on the login form
 
 
 def _sign_secret() -> str:
@@ -49,56 +63,248 @@ def _coach_phones() -> list[str]:
     return phones
 
 
-# ── Password hashing (PBKDF2-SHA256) ──────────────────────
+def _find_auto_login_coach() -> dict | None:
+    """Resolve every configured coach phone in one query; first match in list order wins."""
+    coach_phones = _coach_phones()
+    try:
+        rows = (
+            get_client()
+            .table("players")
+            .select("*")
+            .in_("phone", coach_phones)
+            .in_("role", ["coach", "admin"])
+            .eq("is_active", True)
+            .execute()
+        ).data or []
+    except Exception:
+        return None
+    by_phone = {r["phone"]: r for r in rows}
+    return next((by_phone[p] for p in coach_phones if p in by_phone), None)
+
+
+# ── Login throttling (per phone, in-process) ──────────────
+_MAX_FAILED_LOGINS = 5
+_FAILED_LOGIN_WINDOW = 300  # seconds
+
+_failed_logins: dict[str, deque] = defaultdict(deque)
+_failed_logins_lock = threading.Lock()
+
+
+def _login_retry_after(phone: str) -> float:
+    """Seconds until *phone* may try again (0 when not throttled)."""
+    now = time.monotonic()
+    with _failed_logins_lock:
+        attempts = _failed_logins.get(phone)
+        if not attempts:
+            return 0.0
+        while attempts and now - attempts[0] > _FAILED_LOGIN_WINDOW:
+            attempts.popleft()
+        if len(attempts) < _MAX_FAILED_LOGINS:
+            return 0.0
+        return _FAILED_LOGIN_WINDOW - (now - attempts[0])
+
 
-def hash_password(password: str) -> str:
-    salt = secrets.token_hex(16)
-    h = hashlib.pbkdf2_hmac("sha256", password.encode(), salt.encode(), 100_000)
-    return f"{salt}:{h.hex()}"
+def _record_failed_login(phone: str):
+    with _failed_logins_lock:
+        _failed_logins[phone].append(time.monotonic())
 
 
-def verify_password(password: str, stored_hash: str) -> bool:
-    if not stored_hash or ":" not in stored_hash:
-        return False
-    salt, h = stored_hash.split(":", 1)
-    check = hashlib.pbkdf2_hmac("sha256", password.encode(), salt.encode(), 100_000)
-    return hmac.compare_digest(check.hex(), h)
+def _clear_failed_logins(phone: str):
+    with _failed_logins_lock:
+        _failed_logins.pop(phone, None)
 
 
-# ── Token helpers (HMAC-SHA256 signed player id) ──────────
+# ── Session tokens (signed, self-contained principal) ─────
+# v1.<kid>.<base64url payload>.<base64url HMAC-SHA256>
+# The payload carries id, name, role, avatar and expiry, so a remembered
+# browser is signed in without a players lookup.
+_TOKEN_VERSION = "v1"
+_TOKEN_TTL = 30 * 24 * 3600  # seconds
 
-def _make_token(player_id: str) -> str:
-    return hmac.new(
+
+def _signing_keys() -> list[tuple[str, bytes]]:
+    """Return [(kid, key), ...]; the first signs, all verify.
+
+    AUTH_TOKEN_KEYS="2025b:secret,2025a:older-secret" rotates keys — put the
+    new key first and drop the old one once its tokens have expired.
+    """
+    try:
+        val = st.secrets.get("AUTH_TOKEN_KEYS", "") or os.environ.get("AUTH_TOKEN_KEYS", "")
+    except Exception:
+        val = os.environ.get("AUTH_TOKEN_KEYS", "")
+    keys = []
+    for item in str(val).split(","):
+        kid, _, secret = item.strip().partition(":")
+        if kid and secret:
+            keys.append((kid, secret.encode()))
+    return keys or [("0", _sign_secret().encode())]
+
+
+def _b64(raw: bytes) -> str:
+    return base64.urlsafe_b64encode(raw).rstrip(b"=").decode()
+
+
+def _unb64(text: str) -> bytes:
+    return base64.urlsafe_b64decode(text + "=" * (-len(text) % 4))
+
+
+def _make_token(player: dict) -> str:
+    kid, key = _signing_keys()[0]
+    payload = _b64(json.dumps({
+        "id": str(player["id"]),
+        "n": player.get("name", ""),
+        "r": player.get("role", "player"),
+        "a": player.get("avatar_emoji", "🏸"),
+        "exp": int(time.time()) + _TOKEN_TTL,
+    }, separators=(",", ":"), ensure_ascii=False).encode())
+    signed = f"{_TOKEN_VERSION}.{kid}.{payload}"
+    sig = _b64(hmac.new(key, signed.encode(), hashlib.sha256).digest())
+    return f"{signed}.{sig}"
+
+
+def _read_token(token: str) -> dict | None:
+    """Return the principal carried by a valid, unexpired token, else None."""
+    try:
+        version, kid, payload, sig = token.split(".")
+    except ValueError:
+        return None
+    key = dict(_signing_keys()).get(kid)
+    if version != _TOKEN_VERSION or key is None:
+        return None
+    expected = hmac.new(key, f"{version}.{kid}.{payload}".encode(), hashlib.sha256).digest()
+    try:
+        if not hmac.compare_digest(expected, _unb64(sig)):
+            return None
+        data = json.loads(_unb64(payload))
+    except ValueError:
+        return None
+    if data.get("exp", 0) < time.time():
+        return None
+    return {"id": data["id"], "name": data["n"], "role": data["r"], "avatar_emoji": data["a"]}
+
+
+def _verify_legacy_token(player_id: str, token: str) -> bool:
+    """Pre-v1 tokens were a bare HMAC(player_id); kept so nobody is logged out."""
+    expected = hmac.new(
         _sign_secret().encode(), str(player_id).encode(), hashlib.sha256
     ).hexdigest()
+    return hmac.compare_digest(expected, token)
+
 
+# _fetch_active_player() result when the lookup itself failed (network, 5xx):
+# unlike None it says nothing about the player, so nobody is logged out on it.
+_LOOKUP_FAILED = object()
 
-def _verify_token(player_id: str, token: str) -> bool:
-    return hmac.compare_digest(_make_token(player_id), token)
 
+def _fetch_active_player(player_id: str):
+    """The active players row, None if missing or inactive, or _LOOKUP_FAILED."""
+    try:
+        rows = (
+            get_client()
+            .table("players")
+            .select("*")
+            .eq("id", player_id)
+            .eq("is_active", True)
+            .execute()
+        ).data or []
+    except Exception:
+        return _LOOKUP_FAILED
+    return rows[0] if rows else None
+
+
+# Token principals are re-checked against players off the script thread;
+# results wait here (keyed per refresh) until that session's next rerun.
+# A session that never reruns never collects its result, so entries older
+# than _REFRESH_TTL are dropped whenever a new one is added.
+_REFRESH_TTL = 600  # seconds
+_refreshed_principals: dict[str, tuple[float, object]] = {}
+_refreshed_lock = threading.Lock()
+
+
+def _refresh_principal_async(player_id: str) -> str:
+    ticket = secrets.token_hex(8)
+
+    def _run():
+        result = _fetch_active_player(player_id)
+        now = time.monotonic()
+        with _refreshed_lock:
+            for stale in [t for t, (at, _) in _refreshed_principals.items() if now - at > _REFRESH_TTL]:
+                del _refreshed_principals[stale]
+            _refreshed_principals[ticket] = (now, result)
+
+    threading.Thread(target=_run, name="auth-refresh", daemon=True).start()
+    return ticket
+
+
+def _apply_principal_refresh():
+    """Swap a token principal for the fresh players row once it has arrived."""
+    ticket = st.session_state.get("_auth_refresh_ticket")
+    if not ticket:
+        return
+    with _refreshed_lock:
+        if ticket not in _refreshed_principals:
+            return
+        _, player = _refreshed_principals.pop(ticket)
+    del st.session_state["_auth_refresh_ticket"]
+    if player is _LOOKUP_FAILED:
+        # Couldn't check; the signed token is still valid, so keep it.
+        return
+    if player is None:
+        # Deactivated or deleted since the token was issued.
+        logout()
+    st.session_state["authenticated_player"] = player
+    st.session_state["current_player"] = player
+
+
+# ── Cookie persistence ────────────────────────────────────
+# The browser sends the cookie with the page request, so st.context.cookies
+# has it on the very first script run — no JS round trip before content.
+# Writes still go through JS and are queued so they survive st.rerun().
+
+def _read_cookie() -> str | None:
+    try:
+        return st.context.cookies.get(_COOKIE_NAME)
+    except Exception:
+        return None
 
-# ── localStorage persistence ──────────────────────────────
 
-def _read_ls():
-    return streamlit_js_eval(
-        js_expressions=f"localStorage.getItem('{_LS_KEY}')",
-        key="auth_read",
+def _cookie_js(value_expr: str, max_age: int) -> str:
+    """JS statement setting the auth cookie to the JS expression *value_expr*."""
+    return (
+        f"document.cookie = '{_COOKIE_NAME}=' + {value_expr}"
+        f" + '; Max-Age={max_age}; Path=/; SameSite=Lax'"
+        " + (location.protocol === 'https:' ? '; Secure' : '')"
     )
 
 
-def _write_ls(player_id: str):
-    token = _make_token(player_id)
-    val = f"{player_id}:{token}"
-    streamlit_js_eval(
-        js_expressions=f"localStorage.setItem('{_LS_KEY}', '{val}')",
-        key="auth_write",
-    )
+def _queue_cookie_js(js: str):
+    st.session_state["_auth_cookie_js"] = js
+
+
+def _flush_cookie_js():
+    """Run a cookie write/clear queued by the previous run."""
+    js = st.session_state.pop("_auth_cookie_js", None)
+    if js:
+        streamlit_js_eval(js_expressions=js, key=f"auth_cookie_{secrets.token_hex(4)}")
+
 
+def _write_cookie(player: dict):
+    _queue_cookie_js(_cookie_js(f"'{_make_token(player)}'", _TOKEN_TTL))
 
-def _clear_ls():
+
+def _clear_cookie():
+    _queue_cookie_js(_cookie_js("''", 0) + f"; localStorage.removeItem('{_LS_KEY}')")
+
+
+def _migrate_legacy_ls():
+    """Move a token left in localStorage by older versions into the cookie."""
     streamlit_js_eval(
-        js_expressions=f"localStorage.removeItem('{_LS_KEY}')",
-        key="auth_clear",
+        js_expressions=(
+            f"(() => {{ const v = localStorage.getItem('{_LS_KEY}'); if (!v) return false; "
+            f"{_cookie_js('v', _TOKEN_TTL)}; "
+            f"localStorage.removeItem('{_LS_KEY}'); window.parent.location.reload(); return true; }})()"
+        ),
+        key="auth_migrate",
     )
 
 
@@ -117,57 +323,48 @@ def login_gate():
     • Players see a phone + password login form.
     Returns the authenticated player dict or calls st.stop().
     """
+    _flush_cookie_js()
+    # Every page passes through here, so this is where the process-wide
+    # notification worker and change feed get started (no-op once running or
+    # if unconfigured).
+    start_outbox_worker()
+    start_change_feed()
+
     # 1. Fast path: already authenticated this Streamlit session
     if st.session_state.get("authenticated_player"):
+        _apply_principal_refresh()
         return st.session_state["authenticated_player"]
 
-    # 2. Auto-login for configured coach/admin phones (runs before JS/localStorage)
-    coach_phones = _coach_phones()
-    for cp in coach_phones:
-        try:
-            result = (
-                get_client()
-                .table("players")
-                .select("*")
-                .eq("phone", cp)
-                .eq("is_active", True)
-                .execute()
-            )
-            rows = result.data or []
-            player = rows[0] if rows else None
-        except Exception:
-            player = None
-        if player and player.get("role") in ("coach", "admin"):
-            st.session_state["authenticated_player"] = player
-            st.session_state["current_player"] = player
-            return player
-
-    # 3. Try localStorage (persistent across browser restarts)
-    if not st.session_state.get("_auth_ls_checked"):
-        stored = _read_ls()
-        if stored == 0:
-            st.stop()
-        st.session_state["_auth_ls_checked"] = True
-        if stored and isinstance(stored, str) and ":" in stored:
+    # 2. Auto-login for configured coach/admin phones
+    player = _find_auto_login_coach()
+    if player:
+        st.session_state["authenticated_player"] = player
+        st.session_state["current_player"] = player
+        return player
+
+    # 3. Signed token cookie (persistent across browser restarts)
+    if not st.session_state.get("_auth_cookie_checked"):
+        st.session_state["_auth_cookie_checked"] = True
+        stored = _read_cookie()
+        principal = _read_token(stored) if stored else None
+        if principal:
+            st.session_state["authenticated_player"] = principal
+            st.session_state["current_player"] = principal
+            st.session_state["_auth_refresh_ticket"] = _refresh_principal_async(principal["id"])
+            return principal
+        if stored and ":" in stored:
             pid, token = stored.rsplit(":", 1)
-            if _verify_token(pid, token):
-                try:
-                    result = (
-                        get_client()
-                        .table("players")
-                        .select("*")
-                        .eq("id", pid)
-                        .eq("is_active", True)
-                        .execute()
-                    )
-                    rows = result.data or []
-                    player = rows[0] if rows else None
-                except Exception:
-                    player = None
-                if player:
-                    st.session_state["authenticated_player"] = player
-                    st.session_state["current_player"] = player
-                    return player
+            player = _fetch_active_player(pid) if _verify_legacy_token(pid, token) else None
+            if player is _LOOKUP_FAILED:
+                # Try the cookie again on the next run rather than dropping it.
+                st.session_state["_auth_cookie_checked"] = False
+                player = None
+            if player:
+                _write_cookie(player)  # upgrade to an expiring v1 token
+                _flush_cookie_js()
+                st.session_state["authenticated_player"] = player
+                st.session_state["current_player"] = player
+                return player
 
     # 4. No valid session — show login form
     _show_login_form()
@@ -175,8 +372,8 @@ def login_gate():
 
 
 def _show_login_form():
-    from utils.styles import inject_mobile_css
-    inject_mobile_css()
+    # Pages inject the stylesheet before calling login_gate().
+    _migrate_legacy_ls()
 
     st.markdown(
         "<div style='text-align:center;font-size:3.5rem;margin-top:3rem;'>🏸</div>",
@@ -208,6 +405,11 @@ def _show_login_form():
                 st.error("Phone must be exactly 10 digits.")
                 return
 
+            retry_after = _login_retry_after(phone)
+            if retry_after:
+                st.error(f"Too many attempts. Try again in {retry_after / 60:.0f} min.")
+                return
+
             try:
                 result = (
                     get_client()
@@ -231,21 +433,32 @@ def _show_login_form():
                 return
 
             if not verify_password(password, player["password_hash"]):
+                _record_failed_login(phone)
                 st.error("Incorrect password.")
                 return
 
+            _clear_failed_logins(phone)
+            if needs_rehash(player["password_hash"]):
+                try:
+                    set_player_password(player["id"], password)
+                except Exception:
+                    # Old hash still works; upgrade again on the next login.
+                    pass
+
             st.session_state["authenticated_player"] = player
             st.session_state["current_player"] = player
             if remember:
-                _write_ls(player["id"])
+                _write_cookie(player)
             st.rerun()
 
 
 def logout():
-    """Clear auth from session + localStorage and rerun."""
-    _clear_ls()
-    for k in ["authenticated_player", "current_player", "_auth_ls_checked"]:
+    """Clear auth from session + cookie and rerun."""
+    _clear_cookie()
+    for k in ["authenticated_player", "current_player", "_auth_refresh_ticket"]:
         st.session_state.pop(k, None)
     for k in ["force_player_view"]:
         st.session_state.pop(k, None)
+    # This session's request headers still carry the old cookie; don't re-read it.
+    st.session_state["_auth_cookie_checked"] = True
     st.rerun()
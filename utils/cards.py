@@ -0,0 +1,107 @@
+"""
+Card templates for list views.
+
+Templates are compiled once, HTML-escape every value unless it is wrapped in
+Safe(), and memoize rendered fragments by row content — so a list is sent to
+the browser as one st.markdown delta and unchanged rows cost a dict lookup.
+
+    show_cards("player", [{"avatar": "💵", "name": "₹500 — Asha", "sub": "2024-05-01"}])
+"""
+import html
+import textwrap
+from functools import lru_cache
+from string import Formatter
+
+import streamlit as st
+
+
+class Safe(str):
+    """Trusted HTML (badges, icons) that must be inserted without escaping."""
+
+
+class CardTemplate:
+    def __init__(self, source: str):
+        # One line, so Markdown never reads indented HTML as a code block.
+        source = " ".join(line.strip() for line in textwrap.dedent(source).strip().splitlines())
+        self._parts = [
+            (literal, field, spec)
+            for literal, field, spec, _ in Formatter().parse(source)
+        ]
+
+    def render(self, values: dict) -> str:
+        out = []
+        for literal, field, spec in self._parts:
+            out.append(literal)
+            if field is None:
+                continue
+            value = values.get(field)
+            text = format(value, spec) if spec else ("" if value is None else str(value))
+            out.append(text if isinstance(value, Safe) else html.escape(text))
+        return "".join(out)
+
+
+TEMPLATES = {
+    "session": CardTemplate("""
+        <div class="game-card">
+            <h3>{emoji} {date} &bull; {slot}</h3>
+            <p>
+                <span class="material-symbols-rounded" style="font-size:16px;vertical-align:middle;">location_on</span>
+                {venue} — Court {courts} &nbsp;|&nbsp; 💰 ₹{fee} per player
+            </p>
+            <p>🟢 {confirmed} confirmed &nbsp;|&nbsp; ⏳ {pending} pending &nbsp;|&nbsp;
+               <strong>{slots_left} slots left</strong></p>
+        </div>
+    """),
+    "activity": CardTemplate("""
+        <div class="game-card">
+            <strong>{date} • {slot}</strong> &nbsp; {badge}
+            <br>📍 {venue} Court {courts}{details}
+        </div>
+    """),
+    "court": CardTemplate("""
+        <div class="game-card">
+            <strong>Court {court}</strong> &nbsp; <span style="opacity:0.7;">balance Δ {diff}</span>
+            <br>{team_a} &nbsp;<em>vs</em>&nbsp; {team_b}
+        </div>
+    """),
+    "roster": CardTemplate("""
+        <p><strong>{avatar} {name}</strong> — {badge}{note}</p>
+    """),
+    "player": CardTemplate("""
+        <div class="player-card">
+            <div class="player-avatar">{avatar}</div>
+            <div class="player-info">
+                <div class="name">{name}</div>
+                <div class="sub">{sub}</div>
+            </div>
+        </div>
+    """),
+}
+
+
+@lru_cache(maxsize=4096)
+def _render_cached(name: str, items: tuple) -> str:
+    return TEMPLATES[name].render({k: v for k, _, v in items})
+
+
+def render(name: str, values: dict) -> str:
+    """Render one card; identical rows come from the fragment cache."""
+    # Equal values of different types (Safe/str, 1/1.0/True) render
+    # differently, so the key records the type too.
+    items = tuple(sorted(((k, type(v), v) for k, v in values.items()), key=lambda t: t[0]))
+    try:
+        return _render_cached(name, items)
+    except TypeError:
+        # An unhashable value (dict, list): render it without caching.
+        return TEMPLATES[name].render(values)
+
+
+def render_list(name: str, rows) -> str:
+    return "".join(render(name, row) for row in rows)
+
+
+def show_cards(name: str, rows):
+    """Render a whole list of cards as a single st.markdown delta."""
+    body = render_list(name, rows)
+    if body:
+        st.markdown(body, unsafe_allow_html=True)
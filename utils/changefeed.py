@@ -0,0 +1,219 @@
+"""
+Live change feed for attendance and sessions.
+
+A background thread holds one Supabase Realtime subscription (tables are
+added to the supabase_realtime publication by migration_v17.sql) and, for
+every change:
+
+• patches the cached fetch_all() results in utils/supabase_client.py and
+  takes the pushed table_versions bump, so reads stay valid without polling
+  the version vector on every rerun;
+• bumps in-memory topic counters — "attendance", "attendance:pending",
+  "sessions" and "session:<id>" — that follow() watches, so only pages
+  showing the affected data rerun.
+
+While the subscription is down everything falls back to the version vector;
+set CHANGE_FEED=off to never start it. Against a local stack
+(``supabase start``, which runs Postgres and Realtime) print changes as they
+arrive with:
+
+    python -m utils.changefeed
+
+tests/test_changefeed_delivery.py checks, against that stack's database,
+that the triggers and publication deliver these changes with full old rows.
+"""
+import asyncio
+import logging
+import os
+import threading
+import time
+from collections import defaultdict
+
+TABLES = ("attendance", "sessions")
+_CHANNEL = "stringers-changes"
+_CHECK_SECONDS = 5.0       # how often the listener checks the socket is still up
+_FOLLOW_SECONDS = 2.0      # how often a following page compares its counters
+_MAX_BACKOFF = 300
+
+log = logging.getLogger(__name__)
+
+
+def topics_for(table: str, record: dict | None, old_record: dict | None) -> set[str]:
+    """Topic counters a row change bumps."""
+    topics = {table}
+    for row in (record, old_record):
+        if not row:
+            continue
+        session_id = row.get("session_id") if table == "attendance" else row.get("id")
+        if session_id:
+            topics.add(f"session:{session_id}")
+        if table == "attendance" and row.get("status") == "pending":
+            topics.add("attendance:pending")
+    return topics
+
+
+class ChangeFeed:
+    def __init__(self, url: str, key: str):
+        self.url = url.rstrip("/")
+        self.key = key
+        self.live = False
+        self.on_change = None      # optional callback(table, kind, record, old_record)
+        self._counters: dict[str, int] = defaultdict(int)
+        self._lock = threading.Lock()
+        self._thread: threading.Thread | None = None
+        self._subscribed = False
+
+    # ── Public API ─────────────────────────────────────────
+
+    def start(self):
+        with self._lock:
+            if self._thread and self._thread.is_alive():
+                return
+            self._thread = threading.Thread(target=self._run, name="change-feed", daemon=True)
+            self._thread.start()
+
+    def generation(self, topics) -> tuple[int, ...]:
+        with self._lock:
+            return tuple(self._counters.get(t, 0) for t in topics)
+
+    # ── Internals ──────────────────────────────────────────
+
+    def _set_live(self, live: bool):
+        from utils.supabase_client import follow_versions
+
+        if live != self.live:
+            self.live = live
+            follow_versions(live)
+
+    def _on_row(self, payload: dict):
+        from utils.supabase_client import apply_row_change
+
+        data = payload["data"]
+        table = data["table"]
+        kind = getattr(data["type"], "value", data["type"])
+        record = None if kind == "DELETE" else data.get("record")
+        old_record = data.get("old_record") or None
+        apply_row_change(table, record, old_record)
+        with self._lock:
+            for topic in topics_for(table, record, old_record):
+                self._counters[topic] += 1
+        if self.on_change:
+            self.on_change(table, kind, record, old_record)
+
+    def _on_version(self, payload: dict):
+        from utils.supabase_client import apply_version
+
+        row = payload["data"].get("record") or {}
+        if row.get("table_name"):
+            apply_version(row["table_name"], int(row["version"]),
+                          rows_patched=row["table_name"] in TABLES)
+
+    async def _listen(self):
+        from realtime import AsyncRealtimeClient, RealtimeSubscribeStates
+
+        client = AsyncRealtimeClient(f"{self.url}/realtime/v1", self.key, auto_reconnect=False)
+        await client.connect()
+        try:
+            channel = client.channel(_CHANNEL)
+            for table in TABLES:
+                channel.on_postgres_changes("*", schema="public", table=table, callback=self._on_row)
+            channel.on_postgres_changes("UPDATE", schema="public", table="table_versions",
+                                        callback=self._on_version)
+
+            ended = asyncio.Event()
+
+            def on_state(state, _error):
+                if state == RealtimeSubscribeStates.SUBSCRIBED:
+                    self._subscribed = True
+                    self._set_live(True)
+                else:
+                    ended.set()
+
+            await channel.subscribe(on_state)
+            # A dropped socket may not surface as a channel state; check it too.
+            while client.is_connected and not ended.is_set():
+                try:
+                    await asyncio.wait_for(ended.wait(), timeout=_CHECK_SECONDS)
+                except asyncio.TimeoutError:
+                    pass
+        finally:
+            self._set_live(False)
+            await client.close()
+
+    def _run(self):
+        delay = _CHECK_SECONDS
+        while True:
+            self._subscribed = False
+            try:
+                asyncio.run(self._listen())
+            except Exception:
+                # Log the first failure, then every retry once backed off to
+                # the ceiling — a feed that can never start (e.g. an older
+                # realtime package) stays visible without flooding the log.
+                if self._subscribed or delay in (_CHECK_SECONDS, _MAX_BACKOFF):
+                    log.exception("Change feed disconnected; retrying")
+            # Reconnect promptly after a working subscription; back off while failing.
+            delay = _CHECK_SECONDS if self._subscribed else min(delay * 2, _MAX_BACKOFF)
+            time.sleep(delay)
+
+
+_feed: ChangeFeed | None = None
+_feed_lock = threading.Lock()
+
+
+def start_change_feed() -> ChangeFeed | None:
+    """Start the process-wide change feed unless CHANGE_FEED=off."""
+    global _feed
+    if os.environ.get("CHANGE_FEED", "on").lower() in ("off", "0", "false"):
+        return None
+    if _feed is None:
+        with _feed_lock:
+            if _feed is None:
+                from utils.supabase_client import credentials
+
+                _feed = ChangeFeed(*credentials())
+    _feed.start()
+    return _feed
+
+
+def follow(*topics: str, every: float = _FOLLOW_SECONDS):
+    """Rerun the current page when a change touches any of *topics*.
+
+    Call it before reading the data the topics cover. The check is a tiny
+    fragment comparing in-memory counters — no query — and it is skipped
+    entirely while the feed is down.
+    """
+    import streamlit as st
+
+    feed = _feed
+    if feed is None or not feed.live:
+        return
+    state_key = "_follow:" + ",".join(topics)
+    st.session_state[state_key] = feed.generation(topics)
+
+    @st.fragment(run_every=every)
+    def _watch():
+        if feed.generation(topics) != st.session_state.get(state_key):
+            st.rerun(scope="app")
+
+    _watch()
+
+
+if __name__ == "__main__":
+    from utils.supabase_client import credentials
+
+    feed = ChangeFeed(*credentials())
+    feed.on_change = lambda table, kind, record, old: print(
+        f"{kind:<6} {table:<10} {sorted(topics_for(table, record, old))}", flush=True,
+    )
+    feed.start()
+    print(f"Listening for {', '.join(TABLES)} changes on {feed.url} (Ctrl-C to stop)")
+    live = None
+    try:
+        while True:
+            if feed.live != live:
+                live = feed.live
+                print("subscribed" if live else "not subscribed (retrying)", flush=True)
+            time.sleep(1)
+    except KeyboardInterrupt:
+        pass
@@ -0,0 +1,124 @@
+"""
+Chart data pipeline for long time series.
+
+Series are clipped to the visible date range, re-aggregated or downsampled to
+a point budget on the server, and only then handed to plotly — so a phone
+never receives years of daily points.
+"""
+import numpy as np
+import pandas as pd
+
+# Points per chart a phone renders smoothly.
+DEFAULT_BUDGET = 300
+
+# Bucket sizes tried in order when a summed series has too many points.
+_BUCKET_FREQS = ("D", "W-MON", "MS", "QS", "YS")
+
+
+def lttb(x: np.ndarray, y: np.ndarray, threshold: int) -> np.ndarray:
+    """Indices of the points kept by Largest-Triangle-Three-Buckets.
+
+    Keeps the first and last point and, per bucket, the point forming the
+    largest triangle with the previously kept point and the next bucket's
+    average — peaks and dips survive, flat stretches collapse.
+    """
+    n = len(x)
+    if threshold >= n or threshold < 3:
+        return np.arange(n)
+
+    x = np.asarray(x, dtype=float)
+    y = np.asarray(y, dtype=float)
+    every = (n - 2) / (threshold - 2)
+    edges = (np.arange(threshold - 1) * every).astype(np.int64) + 1
+    edges[-1] = n - 1
+
+    keep = np.empty(threshold, dtype=np.int64)
+    keep[0], keep[-1] = 0, n - 1
+    a = 0
+    for i in range(threshold - 2):
+        lo, hi = edges[i], edges[i + 1]
+        nlo = hi
+        nhi = edges[i + 2] if i + 2 < len(edges) else n
+        cx, cy = x[nlo:nhi].mean(), y[nlo:nhi].mean()
+        ax, ay = x[a], y[a]
+        area = np.abs((ax - cx) * (y[lo:hi] - ay) - (ax - x[lo:hi]) * (cy - ay))
+        a = lo + int(area.argmax())
+        keep[i + 1] = a
+    return keep
+
+
+def clip(series: pd.Series, start=None, end=None) -> pd.Series:
+    """Restrict a date-indexed series to [start, end]."""
+    series = series.sort_index()
+    if start is not None:
+        series = series[series.index >= pd.Timestamp(start)]
+    if end is not None:
+        series = series[series.index <= pd.Timestamp(end)]
+    return series
+
+
+def downsample(series: pd.Series, budget: int = DEFAULT_BUDGET) -> pd.Series:
+    """Shape-preserving LTTB downsample of a date-indexed series."""
+    if len(series) <= budget:
+        return series
+    x = series.index.asi8 / 1e9
+    return series.iloc[lttb(x, series.to_numpy(), budget)]
+
+
+def rebucket(series: pd.Series, budget: int = DEFAULT_BUDGET,
+             freqs: tuple[str, ...] = _BUCKET_FREQS) -> pd.Series:
+    """Sum a date-indexed series into the finest bucket that fits *budget*."""
+    out = series
+    for freq in freqs:
+        out = series.resample(freq).sum()
+        if len(out) <= budget:
+            break
+    return out
+
+
+def line_chart(series: pd.Series, *, start=None, end=None,
+               budget: int = DEFAULT_BUDGET, y_label: str = ""):
+    """Render a downsampled line chart of a date-indexed series."""
+    import plotly.express as px
+
+    data = downsample(clip(series, start, end), budget)
+    fig = px.line(x=data.index, y=data.to_numpy(), labels={"x": "", "y": y_label})
+    _show(fig)
+
+
+def bar_chart(series: pd.Series, *, start=None, end=None,
+              budget: int = DEFAULT_BUDGET, y_label: str = "",
+              freqs: tuple[str, ...] = _BUCKET_FREQS):
+    """Render a bar chart of a date-indexed series summed into buckets."""
+    import plotly.express as px
+
+    data = rebucket(clip(series, start, end), budget, freqs)
+    fig = px.bar(x=data.index, y=data.to_numpy(), labels={"x": "", "y": y_label})
+    _show(fig)
+
+
+def _show(fig):
+    import streamlit as st
+
+    fig.update_layout(
+        height=280,
+        margin=dict(l=8, r=8, t=8, b=8),
+        paper_bgcolor="rgba(0,0,0,0)",
+        plot_bgcolor="rgba(0,0,0,0)",
+    )
+    fig.update_traces(marker_color="#34a853", selector=dict(type="bar"))
+    fig.update_traces(line_color="#34a853", selector=dict(type="scatter"))
+    st.plotly_chart(fig, width="stretch", config={"displayModeBar": False})
+
+
+def date_range_picker(series: pd.Series, key: str):
+    """Date range input spanning *series*; returns (start, end) or (None, None)."""
+    import streamlit as st
+
+    if series.empty:
+        return None, None
+    lo, hi = series.index.min().date(), series.index.max().date()
+    picked = st.date_input("Range", value=(lo, hi), min_value=lo, max_value=hi, key=key)
+    if isinstance(picked, (tuple, list)) and len(picked) == 2:
+        return picked
+    return lo, hi
@@ -0,0 +1,135 @@
+"""
+Who plays with whom, and who plays when.
+
+co_attendance and slot_attendance (migration_v13.sql) are maintained by
+triggers as attendance rows are confirmed or un-confirmed. This module keeps a
+process-wide sparse copy of both — dicts keyed by player and by weekly slot —
+topped up from an ``updated_at`` watermark, so "frequent partners of X" and
+"regulars of this slot" are dictionary lookups rather than a self-join of
+attendance over the full history.
+
+The watermark is read back by ``_OVERLAP`` so rows from a transaction that
+committed after a newer one was seen are still picked up, and the copy is
+reloaded from scratch every ``_REBUILD_SECONDS`` as a safety net.
+Confirming or rejecting through utils/supabase_client.py calls invalidate().
+"""
+import threading
+import time
+from collections import defaultdict
+from datetime import date, datetime, timedelta
+
+from utils.supabase_client import get_client
+
+_REFRESH_SECONDS = 60
+_REBUILD_SECONDS = 15 * 60
+_OVERLAP = timedelta(minutes=2)
+_PAGE_SIZE = 1000
+_PARTNER_WEIGHT = 0.5      # one shared game with a confirmed player vs one game in the slot
+
+
+class _Graph:
+    def __init__(self):
+        self.partners: dict[str, dict[str, int]] = defaultdict(dict)
+        self.slots: dict[tuple[int, str], dict[str, int]] = defaultdict(dict)
+        self.watermarks: dict[str, str | None] = {"co_attendance": None, "slot_attendance": None}
+        self.refreshed_at = 0.0
+        self.built_at = time.monotonic()
+
+
+_graph = _Graph()
+_lock = threading.Lock()
+
+# Primary keys, as tiebreakers: triggers and the v13 backfill stamp many rows
+# with the same updated_at, and offset paging over tied keys can skip rows.
+_KEYS = {
+    "co_attendance": ("player_id", "partner_id"),
+    "slot_attendance": ("player_id", "weekday", "start_time"),
+}
+
+
+def _fetch(table: str, columns: str, since: str | None) -> list[dict]:
+    rows, start = [], 0
+    while True:
+        q = get_client().table(table).select(columns + ", updated_at")
+        if since:
+            q = q.gte("updated_at", since)
+        q = q.order("updated_at")
+        for key in _KEYS[table]:
+            q = q.order(key)
+        batch = q.range(start, start + _PAGE_SIZE - 1).execute().data
+        rows.extend(batch)
+        if len(batch) < _PAGE_SIZE:
+            return rows
+        start += _PAGE_SIZE
+
+
+def _watermark(rows: list[dict]) -> str:
+    return (datetime.fromisoformat(rows[-1]["updated_at"]) - _OVERLAP).isoformat()
+
+
+def _slot_key(weekday: int, start_time: str) -> tuple[int, str]:
+    return int(weekday), str(start_time)[:5]     # '07:30:00' → '07:30'
+
+
+def _refresh() -> _Graph:
+    global _graph
+    with _lock:
+        if time.monotonic() - _graph.built_at > _REBUILD_SECONDS:
+            _graph = _Graph()
+        elif time.monotonic() - _graph.refreshed_at < _REFRESH_SECONDS:
+            return _graph
+
+        rows = _fetch("co_attendance", "player_id, partner_id, games", _graph.watermarks["co_attendance"])
+        for r in rows:
+            _graph.partners[r["player_id"]][r["partner_id"]] = r["games"]
+        if rows:
+            _graph.watermarks["co_attendance"] = _watermark(rows)
+
+        rows = _fetch("slot_attendance", "player_id, weekday, start_time, games",
+                      _graph.watermarks["slot_attendance"])
+        for r in rows:
+            _graph.slots[_slot_key(r["weekday"], r["start_time"])][r["player_id"]] = r["games"]
+        if rows:
+            _graph.watermarks["slot_attendance"] = _watermark(rows)
+
+        _graph.refreshed_at = time.monotonic()
+        return _graph
+
+
+def invalidate():
+    """Look for trigger updates on the next read (e.g. right after confirming)."""
+    with _lock:
+        _graph.refreshed_at = 0.0
+
+
+def co_games(player_id: str, partner_id: str) -> int:
+    return _refresh().partners.get(player_id, {}).get(partner_id, 0)
+
+
+def frequent_partners(player_id: str, k: int = 10) -> list[tuple[str, int]]:
+    """[(partner_id, games together)] most frequent first."""
+    row = _refresh().partners.get(player_id, {})
+    return sorted(((p, g) for p, g in row.items() if g > 0), key=lambda t: t[1], reverse=True)[:k]
+
+
+def slot_regulars(weekday: int, start_time: str, k: int | None = None) -> list[tuple[str, int]]:
+    """[(player_id, games in this weekly slot)] most frequent first."""
+    row = _refresh().slots.get(_slot_key(weekday, start_time), {})
+    ranked = sorted(((p, g) for p, g in row.items() if g > 0), key=lambda t: t[1], reverse=True)
+    return ranked if k is None else ranked[:k]
+
+
+def invite_likelihood(session: dict, roster: list[str], player_ids: list[str]) -> dict[str, float]:
+    """Score how likely each player is to join *session*, given who is already on it.
+
+    Games played in the same weekday/start-time slot, plus (half-weighted)
+    games shared with players already on the roster.
+    """
+    graph = _refresh()
+    weekday = date.fromisoformat(str(session["date"])).isoweekday()
+    slot = graph.slots.get(_slot_key(weekday, session["start_time"]), {})
+    scores = {}
+    for pid in player_ids:
+        together = graph.partners.get(pid, {})
+        scores[pid] = slot.get(pid, 0) + _PARTNER_WEIGHT * sum(together.get(r, 0) for r in roster)
+    return scores
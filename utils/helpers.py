@@ -63,6 +63,11 @@ def skill_label(v: int) -> str:
     return              f"{v} — Pro 🏆"
 
 
+def session_emoji(session: dict) -> str:
+    """🌅 for sessions starting before noon, 🌆 after (start_time is 'HH:MM:SS')."""
+    return "🌅" if int(str(session.get("start_time") or "07")[:2]) < 12 else "🌆"
+
+
 STATUS_BADGE = {
     "pending":   '<span class="badge-pending">⏳ Pending</span>',
     "confirmed": '<span class="badge-confirmed">✅ Confirmed</span>',
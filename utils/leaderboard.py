@@ -0,0 +1,84 @@
+"""
+Club leaderboards.
+
+The leaderboard table (migration_v15.sql) holds every player's value and rank
+for each period — this month, this season (calendar quarter) and all time —
+and metric — games played, longest weekly attendance streak, on-time payment
+rate. Triggers on attendance and fee_audit_log keep it current, so top-k is a
+range scan of (period, metric, rank) and "my rank" is a lookup by player.
+
+Games confirmed ahead of their date start counting when the date arrives,
+which no trigger sees; readers ask refresh_leaderboard (migration_v20.sql)
+to catch up at most every ``_CATCH_UP_SECONDS``, a no-op unless sessions
+have fallen due or a new month/quarter has begun.
+"""
+import threading
+import time
+from datetime import date
+
+from utils.supabase_client import get_client
+
+PERIODS = {"month": "This Month", "season": "This Season", "all": "All Time"}
+METRICS = {"games": "Games Played", "streak": "Weekly Streak", "on_time": "On-time Payments"}
+
+_CATCH_UP_SECONDS = 60 * 60
+
+_caught_up_at: float | None = None
+_catch_up_lock = threading.Lock()
+
+
+def period_start(period: str, today: date | None = None) -> date:
+    """First day of *period*, matching leaderboard_period_start() in SQL."""
+    today = today or date.today()
+    if period == "month":
+        return today.replace(day=1)
+    if period == "season":
+        return today.replace(month=(today.month - 1) // 3 * 3 + 1, day=1)
+    return date(2000, 1, 1)
+
+
+def _catch_up():
+    global _caught_up_at
+    with _catch_up_lock:
+        if _caught_up_at is not None and time.monotonic() - _caught_up_at < _CATCH_UP_SECONDS:
+            return
+        _caught_up_at = time.monotonic()
+    get_client().rpc("refresh_leaderboard", {"p_players": []}).execute()
+
+
+def top(period: str = "month", metric: str = "games", k: int = 10) -> list[dict]:
+    """Best *k* rows of one board, with the player embedded, best first."""
+    # A month or season board is empty until its first game; rollover into
+    # a new period is handled by the catch-up, not by rebuilding here.
+    _catch_up()
+    return (
+        get_client().table("leaderboard")
+        .select("player_id, value, rank, player:players(name, avatar_emoji, skill_level)")
+        .eq("period", period).eq("metric", metric)
+        .eq("starts_on", str(period_start(period)))
+        .order("rank").limit(k)
+        .execute().data
+    )
+
+
+def my_ranks(player_id: str) -> dict[tuple[str, str], dict]:
+    """All of a player's current rows keyed by (period, metric)."""
+    _catch_up()
+    rows = (
+        get_client().table("leaderboard")
+        .select("period, metric, starts_on, value, rank")
+        .eq("player_id", player_id)
+        .execute().data
+    )
+    return {
+        (r["period"], r["metric"]): r for r in rows
+        if r["starts_on"] == str(period_start(r["period"]))
+    }
+
+
+def format_value(metric: str, value: float) -> str:
+    if metric == "on_time":
+        return f"{value:.0%} on time"
+    if metric == "streak":
+        return f"{value:.0f} week{'s' if value != 1 else ''} in a row"
+    return f"{value:.0f} game{'s' if value != 1 else ''}"
@@ -0,0 +1,189 @@
+"""
+Court and team assignment for a session's confirmed players.
+
+assign() puts four players on each of the session's courts and splits every
+court into two doubles pairs. Greedy seeding groups players of similar
+strength on the same court; local search then swaps players between courts
+for as long as that lowers the total cost:
+
+• parity  — strength difference between the two pairs on a court
+• spread  — gap between the strongest and weakest player on a court
+• repeats — pairs who already partnered in recent saved sheets
+
+Strength blends the coach-set skill_level with the player's recent-form
+rating (EWMA of the four ratings dimensions, from rating_profiles). Players
+beyond four per court (latest confirmations first) sit out; two or three
+left over with a spare court play singles.
+
+Benchmark a 30-player, 7-court Hermes session with:  python -m utils.matchmaking
+"""
+from collections import defaultdict
+from itertools import combinations
+
+from utils.ratings import current_level, profiles
+
+W_PARITY = 1.0
+W_SPREAD = 0.35
+W_REPEAT = 2.0
+_MAX_PASSES = 20
+_RECENT_SHEETS = 8         # saved sheets per player consulted for repeat partners
+
+# The three ways to split four players into two pairs (by position).
+_PAIRINGS = (((0, 1), (2, 3)), ((0, 2), (1, 3)), ((0, 3), (1, 2)))
+
+
+def strength(player: dict, rating_profile: dict | None = None) -> float:
+    skill = float(player.get("skill_level") or 5)
+    level = current_level(rating_profile)
+    return skill if level is None else 0.5 * skill + 0.5 * level
+
+
+def _best_pairing(group: list[str], s: dict, partners: dict) -> tuple[float, tuple]:
+    """Cheapest way to play one court: (cost, (team_a, team_b))."""
+    if len(group) == 2:
+        a, b = group
+        return W_PARITY * abs(s[a] - s[b]), ((a,), (b,))
+
+    spread = W_SPREAD * (max(s[p] for p in group) - min(s[p] for p in group))
+    best = None
+    for (i, j), (k, l) in _PAIRINGS:
+        a, b, c, d = group[i], group[j], group[k], group[l]
+        cost = (
+            W_PARITY * abs(s[a] + s[b] - s[c] - s[d])
+            + W_REPEAT * (partners.get(frozenset((a, b)), 0) + partners.get(frozenset((c, d)), 0))
+        )
+        if best is None or cost < best[0]:
+            best = (cost, ((a, b), (c, d)))
+    return best[0] + spread, best[1]
+
+
+def assign(player_ids: list[str], strengths: dict[str, float], courts: list[int],
+           partners: dict[frozenset, int] | None = None) -> dict:
+    """Assign players (in confirmation order) to *courts* and balanced teams.
+
+    Returns {"courts": [{"court", "teams", "diff"}], "bench": [ids], "cost": float}.
+    """
+    partners = partners or {}
+    courts = sorted(courts)
+    doubles = min(len(courts), len(player_ids) // 4)
+    playing = player_ids[: doubles * 4]
+    rest = player_ids[doubles * 4:]
+    singles = rest[:2] if len(rest) >= 2 and len(courts) > doubles else []
+    bench = rest[len(singles):]
+
+    # Greedy seeding: similar strengths share a court.
+    ranked = sorted(playing, key=lambda p: strengths[p], reverse=True)
+    groups = [ranked[i * 4:(i + 1) * 4] for i in range(doubles)]
+    costs = [_best_pairing(g, strengths, partners)[0] for g in groups]
+
+    # Local search: swap players between courts while the total cost drops.
+    for _ in range(_MAX_PASSES):
+        improved = False
+        for i, j in combinations(range(len(groups)), 2):
+            for a in range(4):
+                for b in range(4):
+                    gi, gj = groups[i][:], groups[j][:]
+                    gi[a], gj[b] = gj[b], gi[a]
+                    ci = _best_pairing(gi, strengths, partners)[0]
+                    cj = _best_pairing(gj, strengths, partners)[0]
+                    if ci + cj < costs[i] + costs[j] - 1e-9:
+                        groups[i], groups[j], costs[i], costs[j] = gi, gj, ci, cj
+                        improved = True
+        if not improved:
+            break
+
+    if singles:
+        groups.append(singles)
+    sheet = []
+    for court, group in zip(courts, groups):
+        _, (team_a, team_b) = _best_pairing(group, strengths, partners)
+        diff = abs(sum(strengths[p] for p in team_a) - sum(strengths[p] for p in team_b))
+        sheet.append({"court": court, "teams": (list(team_a), list(team_b)), "diff": round(diff, 1)})
+    return {"courts": sheet, "bench": bench, "cost": round(sum(costs), 2)}
+
+
+# ── Supabase glue ──────────────────────────────────────────
+
+
+def build_sheet(session_id: str) -> tuple[dict, dict]:
+    """Court sheet for a session's confirmed roster → (sheet, players by id)."""
+    from utils.supabase_client import get_client
+
+    client = get_client()
+    session = client.table("sessions").select("courts").eq("id", session_id).execute().data[0]
+    roster = (
+        client.table("attendance")
+        .select("player:players(id, name, avatar_emoji, skill_level)")
+        .eq("session_id", session_id).eq("status", "confirmed")
+        .order("created_at").execute().data
+    )
+    players = {r["player"]["id"]: r["player"] for r in roster if r.get("player")}
+    ids = list(players)
+    if not ids:
+        return {"courts": [], "bench": [], "cost": 0.0}, players
+
+    rating_profiles = profiles(ids)
+    strengths = {pid: strength(p, rating_profiles.get(pid)) for pid, p in players.items()}
+
+    # Who partnered whom in recent saved sheets (other sessions only).
+    history = (
+        client.table("court_assignments")
+        .select("session_id, player_id, court, team")
+        .in_("player_id", ids).neq("session_id", session_id)
+        .order("created_at", desc=True).limit(len(ids) * _RECENT_SHEETS)
+        .execute().data
+    )
+    teams = defaultdict(list)
+    for h in history:
+        teams[(h["session_id"], h["court"], h["team"])].append(h["player_id"])
+    partners: dict[frozenset, int] = defaultdict(int)
+    for members in teams.values():
+        for pair in combinations(members, 2):
+            partners[frozenset(pair)] += 1
+
+    return assign(ids, strengths, session["courts"], partners), players
+
+
+def save_sheet(session_id: str, sheet: dict):
+    """Replace the session's saved court sheet with *sheet*."""
+    from utils.supabase_client import get_client
+
+    rows = [
+        {"session_id": session_id, "player_id": pid, "court": c["court"], "team": t + 1}
+        for c in sheet["courts"]
+        for t, team in enumerate(c["teams"])
+        for pid in team
+    ]
+    client = get_client()
+    client.table("court_assignments").delete().eq("session_id", session_id).execute()
+    if rows:
+        client.table("court_assignments").insert(rows).execute()
+
+
+if __name__ == "__main__":
+    import random
+    import statistics
+    import sys
+    import time
+
+    runs = int(sys.argv[1]) if len(sys.argv) > 1 else 200
+    rng = random.Random(7)
+    ids = [f"p{i}" for i in range(30)]
+    strengths = {p: rng.uniform(2, 10) for p in ids}
+    # A club where everyone has partnered a few people before.
+    partners = {frozenset(rng.sample(ids, 2)): rng.randint(1, 3) for _ in range(60)}
+    courts = list(range(1, 8))
+
+    timings = []
+    for _ in range(runs):
+        rng.shuffle(ids)
+        t0 = time.perf_counter()
+        sheet = assign(ids, strengths, courts, partners)
+        timings.append((time.perf_counter() - t0) * 1000)
+
+    timings.sort()
+    print(f"30 players, 7 courts, {runs} runs")
+    print(f"  p50   {statistics.median(timings):7.2f} ms")
+    print(f"  p95   {timings[int(len(timings) * 0.95) - 1]:7.2f} ms")
+    print(f"  max   {timings[-1]:7.2f} ms   (budget 50 ms)")
+    print(f"  worst court Δ {max(c['diff'] for c in sheet['courts']):.1f}, bench {len(sheet['bench'])}")
@@ -1,4 +1,36 @@
-# Notifications placeholder — admin shares updates via WhatsApp screenshots.
+"""
+Player notifications for StringerS Badminton Academy.
+
+Invites, confirmations and waitlist moves are written to notification_outbox
+by a trigger on attendance (migration_v8.sql); dues reminders are enqueued by
+the worker's periodic balance scan. A background worker claims pending rows
+in batches, folds everything queued for one player into a single message and
+hands it to the configured transport — no network call ever runs on a
+Streamlit script thread.
+
+Configure with environment variables (or .env):
+
+    NOTIFY_TRANSPORT       webhook | smtp | log   (unset: worker stays off)
+    NOTIFY_WEBHOOK_URL     POST target for the webhook transport
+    NOTIFY_SMTP_HOST/PORT/USER/PASSWORD/FROM
+    NOTIFY_SMTP_TO         recipient template, e.g. "{phone}@sms-gateway.example"
+    NOTIFY_RATE_PER_MINUTE messages per minute across all players (default 30)
+    NOTIFY_DUES_THRESHOLD  ₹ balance that triggers a monthly reminder (default 500)
+
+A local stand-in for the webhook prints whatever it receives:
+
+    python -m utils.notifications --stub 8765
+    NOTIFY_TRANSPORT=webhook NOTIFY_WEBHOOK_URL=http://localhost:8765 streamlit run app.py
+"""
+import json
+import logging
+import os
+import threading
+import time
+from collections import defaultdict
+from datetime import date, datetime, timedelta, timezone
+
+log = logging.getLogger(__name__)
 
 
 def format_invite_message(player_name: str, session_date: str, slot: str) -> str:
@@ -17,3 +49,299 @@ def format_confirmation_message(player_name: str, session_date: str, slot: str)
         f"See you on court! 💪\n"
         f"— Badminton Pro Hub"
     )
+
+
+# One line per outbox row; several rows for a player become one digest.
+_LINES = {
+    "invite":       "📩 You've been invited to play on {date} ({slot}) — open the app to accept!",
+    "confirmation": "✅ Your spot is confirmed for {date} ({slot}). See you on court! 💪",
+    "waitlist":     "🔔 A spot just opened up on {date} ({slot}) — you're on the waitlist.",
+    "dues":         "💰 Your balance due is ₹{balance:,.0f}. Please clear it on the Payments page.",
+}
+
+
+def format_digest(player_name: str, rows: list[dict]) -> str:
+    """Fold every queued notification for one player into a single message."""
+    if len(rows) == 1 and rows[0]["kind"] == "invite":
+        p = rows[0]["payload"]
+        return format_invite_message(player_name, p.get("date", ""), p.get("slot", ""))
+    if len(rows) == 1 and rows[0]["kind"] == "confirmation":
+        p = rows[0]["payload"]
+        return format_confirmation_message(player_name, p.get("date", ""), p.get("slot", ""))
+
+    lines = []
+    for row in sorted(rows, key=lambda r: r["created_at"]):
+        line = _LINES[row["kind"]].format_map(defaultdict(str, row["payload"]))
+        if line not in lines:
+            lines.append(line)
+    return f"Hi {player_name}! 🏸\n" + "\n".join(lines) + "\n— Badminton Pro Hub"
+
+
+# ── Transports ─────────────────────────────────────────────
+# A transport sends one message to one player and raises on failure.
+
+
+class LogTransport:
+    """Prints messages instead of sending them — for development."""
+
+    def send(self, player: dict, message: str):
+        print(f"[notify → {player.get('name')} {player.get('phone')}]\n{message}\n", flush=True)
+
+
+class WebhookTransport:
+    """POSTs {"phone", "name", "message"} as JSON, e.g. to a WhatsApp/SMS bridge."""
+
+    def __init__(self, url: str, timeout: float = 10.0):
+        self.url = url
+        self.timeout = timeout
+
+    def send(self, player: dict, message: str):
+        import requests
+
+        resp = requests.post(self.url, timeout=self.timeout, json={
+            "phone": player.get("phone"), "name": player.get("name"), "message": message,
+        })
+        resp.raise_for_status()
+
+
+class SmtpTransport:
+    """Sends plain-text mail to an address derived from the player's phone."""
+
+    def __init__(self, host: str, port: int, sender: str, to_template: str,
+                 user: str | None = None, password: str | None = None):
+        self.host, self.port = host, port
+        self.sender, self.to_template = sender, to_template
+        self.user, self.password = user, password
+
+    def send(self, player: dict, message: str):
+        import smtplib
+        from email.message import EmailMessage
+
+        msg = EmailMessage()
+        msg["From"] = self.sender
+        msg["To"] = self.to_template.format(phone=player.get("phone", ""), id=player.get("id", ""))
+        msg["Subject"] = "StringerS Badminton"
+        msg.set_content(message)
+        with smtplib.SMTP(self.host, self.port, timeout=15) as smtp:
+            smtp.starttls()
+            if self.user:
+                smtp.login(self.user, self.password or "")
+            smtp.send_message(msg)
+
+
+def transport_from_env():
+    """Build the transport named by NOTIFY_TRANSPORT, or None if unset."""
+    kind = os.environ.get("NOTIFY_TRANSPORT", "").strip().lower()
+    if kind == "log":
+        return LogTransport()
+    if kind == "webhook":
+        return WebhookTransport(os.environ["NOTIFY_WEBHOOK_URL"])
+    if kind == "smtp":
+        return SmtpTransport(
+            host=os.environ["NOTIFY_SMTP_HOST"],
+            port=int(os.environ.get("NOTIFY_SMTP_PORT", 587)),
+            sender=os.environ["NOTIFY_SMTP_FROM"],
+            to_template=os.environ["NOTIFY_SMTP_TO"],
+            user=os.environ.get("NOTIFY_SMTP_USER"),
+            password=os.environ.get("NOTIFY_SMTP_PASSWORD"),
+        )
+    if kind:
+        raise ValueError(f"Unknown NOTIFY_TRANSPORT {kind!r} (expected webhook, smtp or log).")
+    return None
+
+
+# ── Outbox worker ──────────────────────────────────────────
+
+_BATCH_SIZE = 50
+_POLL_INTERVAL = 15.0          # seconds between outbox polls when idle
+_MAX_BACKOFF = 300.0           # ceiling for poll delay while Supabase is down
+_MAX_ATTEMPTS = 5              # then the row is parked as 'failed'
+_DUES_SCAN_SECONDS = 60 * 60   # how often balances are checked against the threshold
+
+
+class OutboxWorker:
+    def __init__(self, transport, batch_size: int = _BATCH_SIZE,
+                 rate_per_minute: float | None = None, dues_threshold: float | None = None):
+        self.transport = transport
+        self.batch_size = batch_size
+        self.rate_per_minute = rate_per_minute or float(os.environ.get("NOTIFY_RATE_PER_MINUTE", 30))
+        self.dues_threshold = dues_threshold or float(os.environ.get("NOTIFY_DUES_THRESHOLD", 500))
+        self._wake = threading.Event()
+        self._thread: threading.Thread | None = None
+        self._lock = threading.Lock()
+        self._next_send = 0.0
+        self._dues_scanned_at = 0.0
+
+    # ── Public API ─────────────────────────────────────────
+
+    def start(self):
+        with self._lock:
+            if self._thread and self._thread.is_alive():
+                return
+            self._thread = threading.Thread(target=self._run, name="notify-outbox", daemon=True)
+            self._thread.start()
+
+    def wake(self):
+        """Poll the outbox now instead of at the next interval."""
+        self._wake.set()
+
+    def deliver_batch(self) -> int:
+        """Claim one batch, send one message per player; return rows handled."""
+        from utils.supabase_client import get_client
+
+        rows = get_client().rpc("claim_notifications", {"batch_size": self.batch_size}).execute().data
+        if not rows:
+            return 0
+
+        by_player: dict[str, list[dict]] = defaultdict(list)
+        for row in rows:
+            by_player[row["player_id"]].append(row)
+        players = {
+            p["id"]: p for p in get_client().table("players")
+            .select("id, name, phone").in_("id", list(by_player)).execute().data
+        }
+
+        for player_id, group in by_player.items():
+            player = players.get(player_id)
+            if player is None:
+                self._finish(group, "failed", error="player not found")
+                continue
+            self._throttle()
+            try:
+                self.transport.send(player, format_digest(player["name"], group))
+            except Exception as e:
+                self._retry(group, repr(e)[:500])
+            else:
+                self._finish(group, "sent")
+        return len(rows)
+
+    def scan_dues(self):
+        """Queue a reminder for players over the threshold, at most once a month."""
+        from utils.supabase_client import get_client
+
+        overdue = (
+            get_client().table("player_balance").select("id, balance_due")
+            .gte("balance_due", self.dues_threshold).execute().data
+        )
+        if not overdue:
+            return
+        month = date.today().strftime("%Y-%m")
+        get_client().table("notification_outbox").upsert([
+            {
+                "player_id": p["id"],
+                "kind": "dues",
+                "payload": {"balance": float(p["balance_due"])},
+                "dedupe_key": f"dues:{p['id']}:{month}",
+            }
+            for p in overdue
+        ], on_conflict="dedupe_key", ignore_duplicates=True).execute()
+
+    # ── Internals ──────────────────────────────────────────
+
+    def _throttle(self):
+        """Space sends evenly so a burst of invites stays under the rate limit."""
+        now = time.monotonic()
+        if now < self._next_send:
+            time.sleep(self._next_send - now)
+        self._next_send = max(now, self._next_send) + 60.0 / self.rate_per_minute
+
+    @staticmethod
+    def _finish(group: list[dict], status: str, error: str | None = None):
+        from utils.supabase_client import get_client
+
+        data = {"status": status, "last_error": error}
+        if status == "sent":
+            data["sent_at"] = datetime.now(timezone.utc).isoformat()
+        get_client().table("notification_outbox").update(data).in_(
+            "id", [r["id"] for r in group]
+        ).execute()
+
+    @staticmethod
+    def _retry(group: list[dict], error: str):
+        from utils.supabase_client import get_client
+
+        attempts = max(r["attempts"] for r in group)
+        if attempts >= _MAX_ATTEMPTS:
+            OutboxWorker._finish(group, "failed", error=error)
+            return
+        # 1, 2, 4, 8 … minutes between attempts.
+        retry_at = datetime.now(timezone.utc) + timedelta(minutes=2 ** (attempts - 1))
+        get_client().table("notification_outbox").update({
+            "status": "pending", "last_error": error, "next_attempt_at": retry_at.isoformat(),
+        }).in_("id", [r["id"] for r in group]).execute()
+
+    def _run(self):
+        delay = _POLL_INTERVAL
+        while True:
+            try:
+                if time.monotonic() - self._dues_scanned_at > _DUES_SCAN_SECONDS:
+                    self.scan_dues()
+                    self._dues_scanned_at = time.monotonic()
+                while self.deliver_batch():
+                    pass
+                delay = _POLL_INTERVAL
+            except Exception:
+                # Supabase unreachable: rows stay in the outbox, back off.
+                delay = min(delay * 2, _MAX_BACKOFF)
+            self._wake.wait(timeout=delay)
+            self._wake.clear()
+
+
+_worker: OutboxWorker | None = None
+_worker_lock = threading.Lock()
+_misconfigured = False         # a bad NOTIFY_* setting was logged; delivery stays off
+
+
+def start_outbox_worker() -> OutboxWorker | None:
+    """Start the process-wide delivery worker if a transport is configured.
+
+    A missing or malformed NOTIFY_* setting is logged once and leaves
+    delivery off — every page calls this, so it must never raise.
+    """
+    global _worker, _misconfigured
+    if _worker is None:
+        if _misconfigured:
+            return None
+        with _worker_lock:
+            if _worker is None:
+                try:
+                    transport = transport_from_env()
+                except (KeyError, ValueError) as e:
+                    if not _misconfigured:
+                        _misconfigured = True
+                        log.error("Notifications disabled, check the NOTIFY_* settings: %s: %s",
+                                  type(e).__name__, e)
+                    return None
+                if transport is None:
+                    return None
+                _worker = OutboxWorker(transport)
+    _worker.start()
+    return _worker
+
+
+def notify_outbox():
+    """Tell the worker new rows were queued, so delivery doesn't wait for the next poll."""
+    if _worker is not None:
+        _worker.wake()
+
+
+if __name__ == "__main__":
+    import sys
+    from http.server import BaseHTTPRequestHandler, HTTPServer
+
+    if len(sys.argv) < 2 or sys.argv[1] != "--stub":
+        sys.exit("usage: python -m utils.notifications --stub [port]")
+    port = int(sys.argv[2]) if len(sys.argv) > 2 else 8765
+
+    class _Stub(BaseHTTPRequestHandler):
+        def do_POST(self):
+            body = json.loads(self.rfile.read(int(self.headers["Content-Length"])))
+            print(f"→ {body.get('name')} ({body.get('phone')})\n{body.get('message')}\n", flush=True)
+            self.send_response(204)
+            self.end_headers()
+
+        def log_message(self, *args):
+            pass
+
+    print(f"Notification stub listening on http://localhost:{port}")
+    HTTPServer(("", port), _Stub).serve_forever()
@@ -0,0 +1,114 @@
+"""
+PBKDF2-SHA256 password hashing for StringerS Badminton Academy.
+
+Hashes are stored as ``pbkdf2_sha256$<iterations>$<salt>$<hex>`` so the cost
+can be raised (PASSWORD_ITERATIONS) without invalidating existing passwords;
+legacy ``salt:hex`` hashes (100,000 iterations) still verify and
+needs_rehash() tells the login form to upgrade them.
+
+The hashing runs on a small bounded worker pool rather than the calling
+Streamlit script thread, capping how much CPU a login rush can take.
+
+Benchmark concurrent login latency with:  python -m utils.passwords
+"""
+import hashlib
+import hmac
+import os
+import secrets
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+_ALGO = "pbkdf2_sha256"
+_LEGACY_ITERATIONS = 100_000
+ITERATIONS = int(os.environ.get("PASSWORD_ITERATIONS", _LEGACY_ITERATIONS))
+
+# hashlib's PBKDF2 releases the GIL, so threads hash in parallel; the bound
+# keeps a login rush from taking every core away from page reruns.
+_MAX_WORKERS = int(os.environ.get("PASSWORD_WORKERS", min(4, os.cpu_count() or 1)))
+
+_pool: ThreadPoolExecutor | None = None
+_pool_lock = threading.Lock()
+
+
+def _get_pool() -> ThreadPoolExecutor:
+    global _pool
+    if _pool is None:
+        with _pool_lock:
+            if _pool is None:
+                _pool = ThreadPoolExecutor(max_workers=_MAX_WORKERS, thread_name_prefix="pbkdf2")
+    return _pool
+
+
+def _pbkdf2(password: str, salt: str, iterations: int) -> str:
+    return hashlib.pbkdf2_hmac("sha256", password.encode(), salt.encode(), iterations).hex()
+
+
+def _parse(stored_hash: str) -> tuple[int, str, str] | None:
+    """Return (iterations, salt, hex) for either hash format, or None."""
+    if not stored_hash:
+        return None
+    if stored_hash.startswith(_ALGO + "$"):
+        try:
+            _, iterations, salt, h = stored_hash.split("$", 3)
+            return int(iterations), salt, h
+        except ValueError:
+            return None
+    if ":" in stored_hash:
+        salt, h = stored_hash.split(":", 1)
+        return _LEGACY_ITERATIONS, salt, h
+    return None
+
+
+def hash_password(password: str, iterations: int | None = None) -> str:
+    iterations = iterations or ITERATIONS
+    salt = secrets.token_hex(16)
+    h = _get_pool().submit(_pbkdf2, password, salt, iterations).result()
+    return f"{_ALGO}${iterations}${salt}${h}"
+
+
+def verify_password(password: str, stored_hash: str) -> bool:
+    parsed = _parse(stored_hash)
+    if not parsed:
+        return False
+    iterations, salt, h = parsed
+    check = _get_pool().submit(_pbkdf2, password, salt, iterations).result()
+    return hmac.compare_digest(check, h)
+
+
+def needs_rehash(stored_hash: str) -> bool:
+    """True for legacy-format hashes or ones below the configured cost."""
+    parsed = _parse(stored_hash)
+    return bool(parsed) and (
+        not stored_hash.startswith(_ALGO + "$") or parsed[0] < ITERATIONS
+    )
+
+
+if __name__ == "__main__":
+    import statistics
+    import sys
+    import time
+
+    logins = int(sys.argv[1]) if len(sys.argv) > 1 else 32
+    stored = hash_password("shuttle123")
+    latencies: list[float] = []
+
+    def _login():
+        t0 = time.perf_counter()
+        verify_password("shuttle123", stored)
+        latencies.append(time.perf_counter() - t0)
+
+    # One thread per simulated browser session, all signing in at once.
+    threads = [threading.Thread(target=_login) for _ in range(logins)]
+    t0 = time.perf_counter()
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    wall = time.perf_counter() - t0
+
+    latencies.sort()
+    print(f"{logins} concurrent logins, {ITERATIONS:,} iterations, {_MAX_WORKERS} workers")
+    print(f"  wall  {wall * 1000:8.1f} ms   ({logins / wall:.1f} logins/s)")
+    print(f"  p50   {statistics.median(latencies) * 1000:8.1f} ms")
+    print(f"  p95   {latencies[int(len(latencies) * 0.95) - 1] * 1000:8.1f} ms")
+    print(f"  max   {latencies[-1] * 1000:8.1f} ms")
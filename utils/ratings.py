@@ -0,0 +1,54 @@
+"""
+Player ratings: append-only history plus running skill profiles.
+
+Every save inserts a new ratings row; a trigger (migration_v14.sql) folds it
+into the player's rating_profiles row — count, mean and EWMA per dimension —
+so current profiles are a primary-key read and trends are one indexed scan of
+a single player's history. Deleting ratings rebuilds the affected profiles
+from what remains (migration_v21.sql).
+"""
+from utils.supabase_client import get_client, insert_row
+
+DIMENSIONS = ("footwork", "stamina", "smash_power", "net_play")
+
+
+def record_rating(player_id: str, rated_by: str, scores: dict) -> dict:
+    """Append one rating (scores keyed by DIMENSIONS) and return the new row."""
+    row = {"player_id": player_id, "rated_by": rated_by}
+    row.update({d: int(scores[d]) for d in DIMENSIONS})
+    return insert_row("ratings", row).data[0]
+
+
+def profiles(player_ids: list[str]) -> dict[str, dict]:
+    """rating_profiles rows keyed by player id (players never rated are absent)."""
+    if not player_ids:
+        return {}
+    rows = get_client().table("rating_profiles").select("*").in_("player_id", player_ids).execute().data
+    return {r["player_id"]: r for r in rows}
+
+
+def profile(player_id: str) -> dict | None:
+    return profiles([player_id]).get(player_id)
+
+
+def history(player_id: str) -> list[dict]:
+    """All of a player's ratings, oldest first, for trend charts."""
+    return (
+        get_client().table("ratings")
+        .select("rated_at, rated_by, " + ", ".join(DIMENSIONS))
+        .eq("player_id", player_id).order("rated_at")
+        .execute().data
+    )
+
+
+def current_level(prof: dict | None) -> float | None:
+    """Recent-form rating on the 1–10 scale: mean of the EWMA dimensions."""
+    if not prof or not prof.get("n"):
+        return None
+    return sum(float(prof[f"ewma_{d}"]) for d in DIMENSIONS) / len(DIMENSIONS)
+
+
+def suggested_skill(prof: dict | None) -> int | None:
+    """skill_level the ratings point to, or None without ratings."""
+    level = current_level(prof)
+    return None if level is None else max(1, min(10, round(level)))
@@ -0,0 +1,172 @@
+"""
+Invite recommendations for sessions with open slots.
+
+Per-player features are built once per process as NumPy arrays aligned to
+one player index, and rebuilt when the table_versions counter of a table
+they read moves (or every ``_REBUILD_SECONDS`` without one):
+
+• weekday[n, 7] / hour[n, 24]  — confirmed games by weekday and start hour
+• recent[n]                     — confirmed games in the last ``_RECENT_DAYS``
+• skill[n], due[n]              — skill_level and player_balance.balance_due
+
+top_k() scores every active player against one session with array
+arithmetic only, so a club of thousands ranks in a few milliseconds.
+
+Benchmark with:  python -m utils.recommend [players]
+"""
+import threading
+import time
+from datetime import date, timedelta
+
+import numpy as np
+
+_REBUILD_SECONDS = 5 * 60
+_TABLES = ("players", "sessions", "attendance", "payments")   # what _build() reads
+_RECENT_DAYS = 60
+_DUES_SCALE = 1000.0       # ₹ of balance_due that costs the full dues weight
+
+WEIGHTS = {"weekday": 0.30, "time": 0.25, "recent": 0.25, "skill": 0.20, "dues": 0.30}
+
+
+class Features:
+    def __init__(self, ids, skill, weekday, hour, recent, due):
+        self.ids = np.asarray(ids)
+        self.index = {pid: i for i, pid in enumerate(ids)}
+        self.skill = np.asarray(skill, dtype=float)
+        self.weekday = np.asarray(weekday, dtype=float)
+        self.hour = np.asarray(hour, dtype=float)
+        self.recent = np.asarray(recent, dtype=float)
+        self.due = np.asarray(due, dtype=float)
+        # Derived once so scoring is a handful of vector ops.
+        self.games = np.maximum(self.weekday.sum(axis=1), 1.0)
+        self.recent_norm = self.recent / max(self.recent.max(initial=0.0), 1.0)
+        self.dues_norm = np.clip(self.due / _DUES_SCALE, 0.0, 1.0)
+        self.built_at = time.monotonic()
+        self.versions: tuple = ()
+
+
+_features: Features | None = None
+_lock = threading.Lock()
+
+
+def _build() -> Features:
+    from utils import analytics
+    from utils.supabase_client import fetch_all, fetch_view
+
+    players = fetch_all("players", filters={"is_active": True})
+    ids = [p["id"] for p in players]
+    n = len(ids)
+    weekday, hour, recent = np.zeros((n, 7)), np.zeros((n, 24)), np.zeros(n)
+
+    att = analytics.snapshot("attendance")
+    sess = analytics.snapshot("sessions")
+    conf = att.loc[att["status"] == "confirmed", ["player_id", "session_id"]].merge(
+        sess[["id", "date", "start_time"]], left_on="session_id", right_on="id", how="inner",
+    )
+    rows = conf["player_id"].map({pid: i for i, pid in enumerate(ids)}).to_numpy()
+    keep = ~np.isnan(rows.astype(float))
+    if keep.any():
+        rows = rows[keep].astype(int)
+        conf = conf[keep]
+        days = conf["date"].dt.dayofweek.to_numpy()
+        hours = conf["start_time"].astype(str).str[:2].astype(int).to_numpy()
+        np.add.at(weekday, (rows, days), 1)
+        np.add.at(hour, (rows, hours), 1)
+        cutoff = np.datetime64(date.today() - timedelta(days=_RECENT_DAYS))
+        recent = np.bincount(rows[conf["date"].to_numpy() >= cutoff], minlength=n).astype(float)
+
+    balances = {b["id"]: float(b.get("balance_due") or 0) for b in fetch_view("player_balance")}
+    return Features(
+        ids,
+        skill=[float(p.get("skill_level") or 5) for p in players],
+        weekday=weekday, hour=hour, recent=recent,
+        due=[balances.get(pid, 0.0) for pid in ids],
+    )
+
+
+def features() -> Features:
+    from utils.supabase_client import table_versions
+
+    global _features
+    versions = table_versions()
+    stamp = tuple(versions.get(t) for t in _TABLES)
+    with _lock:
+        if (
+            _features is None
+            or _features.versions != stamp
+            or time.monotonic() - _features.built_at > _REBUILD_SECONDS
+        ):
+            _features = _build()
+            _features.versions = stamp
+        return _features
+
+
+def score(f: Features, weekday: int, hour: int, roster: list[str]) -> np.ndarray:
+    """Score every player in *f* for a session on ISO *weekday* at *hour*."""
+    wd = f.weekday[:, weekday - 1] / f.games
+    # Count neighbouring start hours too — 07:00 regulars suit a 07:30 game.
+    lo, hi = max(hour - 1, 0), min(hour + 2, 24)
+    tm = f.hour[:, lo:hi].sum(axis=1) / f.games
+
+    on_roster = [f.index[p] for p in roster if p in f.index]
+    if on_roster:
+        fit = 1.0 - np.abs(f.skill - f.skill[on_roster].mean()) / 9.0
+    else:
+        fit = np.full(len(f.ids), 0.5)
+
+    return (
+        WEIGHTS["weekday"] * wd
+        + WEIGHTS["time"] * tm
+        + WEIGHTS["recent"] * f.recent_norm
+        + WEIGHTS["skill"] * fit
+        - WEIGHTS["dues"] * f.dues_norm
+    )
+
+
+def top_k(session: dict, roster: list[str], exclude=(), k: int = 10,
+          f: Features | None = None) -> list[tuple[str, float]]:
+    """Best *k* players to invite to *session* → [(player_id, score)], best first."""
+    f = f or features()
+    if not len(f.ids):
+        return []
+    start = str(session["start_time"])
+    s = score(f, date.fromisoformat(str(session["date"])).isoweekday(), int(start[:2]), roster)
+    skip = [f.index[p] for p in (*roster, *exclude) if p in f.index]
+    s[skip] = -np.inf
+
+    k = min(k, len(s) - len(set(skip)))
+    if k <= 0:
+        return []
+    best = np.argpartition(-s, k - 1)[:k]
+    best = best[np.argsort(-s[best])]
+    return [(str(f.ids[i]), float(s[i])) for i in best]
+
+
+if __name__ == "__main__":
+    import statistics
+    import sys
+
+    n = int(sys.argv[1]) if len(sys.argv) > 1 else 5000
+    rng = np.random.default_rng(7)
+    ids = [f"p{i}" for i in range(n)]
+    f = Features(
+        ids,
+        skill=rng.integers(1, 11, n),
+        weekday=rng.poisson(2, (n, 7)),
+        hour=rng.poisson(0.5, (n, 24)),
+        recent=rng.poisson(3, n),
+        due=rng.choice([0, 0, 0, 300, 1200], n),
+    )
+    roster = list(rng.choice(ids, 12, replace=False))
+    session = {"date": "2024-05-06", "start_time": "07:30:00"}
+
+    timings = []
+    for _ in range(200):
+        t0 = time.perf_counter()
+        top = top_k(session, roster, k=10, f=f)
+        timings.append((time.perf_counter() - t0) * 1000)
+    timings.sort()
+    print(f"{n:,} players, top 10, 200 runs")
+    print(f"  p50   {statistics.median(timings):6.2f} ms")
+    print(f"  p95   {timings[int(len(timings) * 0.95) - 1]:6.2f} ms")
+    print(f"  best  {top[0][0]} ({top[0][1]:.3f})")
@@ -0,0 +1,128 @@
+"""
+Recurring session series.
+
+A series row (session_series, migration_v9.sql) describes a fixed weekly
+schedule — e.g. Mon/Wed/Fri 07:30 AM at Hermes, courts 1–4. generate()
+materializes the next N weeks of it in one batched insert. UNIQUE(series_id,
+date) makes regeneration incremental: occurrences that already exist are
+skipped by the database, and only the gaps are created.
+
+Occurrences that would share a court with another session at the same venue
+during an overlapping period are reported as conflicts and left out — the
+sessions_no_court_overlap constraint (migration_v10.sql) would reject them.
+"""
+from datetime import date, datetime, timedelta
+
+from utils.supabase_client import CourtConflict, get_client, insert_session
+
+WEEKDAYS = ["Mon", "Tue", "Wed", "Thu", "Fri", "Sat", "Sun"]
+
+
+def _period(value: str) -> tuple[datetime, datetime]:
+    """Parse a Postgres tsrange like '["2024-05-01 07:30:00","2024-05-01 09:30:00")'."""
+    lo, hi = value[1:-1].split(",")
+    return datetime.fromisoformat(lo.strip('"')), datetime.fromisoformat(hi.strip('"'))
+
+
+def _booked(venue: str, first: date, last: date) -> list[dict]:
+    """Sessions at *venue* dated *first*..*last*."""
+    return (
+        get_client().table("sessions")
+        .select("id, date, slot, courts, period, series_id")
+        .eq("venue", venue)
+        .gte("date", str(first)).lte("date", str(last))
+        .execute().data
+    )
+
+
+def occurrences(series: dict, weeks: int, start: date | None = None) -> list[date]:
+    """Dates the series falls on from *start* (default today) for *weeks* weeks."""
+    start = max(start or date.today(), date.fromisoformat(str(series["starts_on"])))
+    end = start + timedelta(weeks=weeks)
+    if series.get("ends_on"):
+        end = min(end, date.fromisoformat(str(series["ends_on"])) + timedelta(days=1))
+    weekdays = set(series["weekdays"])
+    return [
+        start + timedelta(days=i)
+        for i in range((end - start).days)
+        if (start + timedelta(days=i)).isoweekday() in weekdays
+    ]
+
+
+def generate(series: dict, weeks: int = 4, start: date | None = None) -> dict:
+    """Create the missing sessions of *series* for the next *weeks* weeks.
+
+    Returns {"created": [dates], "existing": [dates], "conflicts": [(date, session)]}.
+    """
+    dates = occurrences(series, weeks, start)
+    result = {"created": [], "existing": [], "conflicts": []}
+    if not dates:
+        return result
+
+    # One query for everything already booked at this venue in the window.
+    booked = _booked(series["venue"], dates[0], dates[-1])
+    courts = set(series["courts"])
+    start_time = datetime.strptime(series["slot"], "%I:%M %p").time()
+    length = timedelta(minutes=series.get("duration_minutes") or 120)
+    mine = {s["date"] for s in booked if s.get("series_id") == series["id"]}
+
+    def clash_on(d: date, sessions: list[dict]) -> dict | None:
+        """Another session sharing a court with the occurrence on *d*."""
+        begins = datetime.combine(d, start_time)
+        ends = begins + length
+        for s in sessions:
+            if s.get("series_id") == series["id"] or not courts & set(s["courts"]):
+                continue
+            lo, hi = _period(s["period"])
+            if lo < ends and begins < hi:
+                return s
+        return None
+
+    rows = []
+    for d in dates:
+        key = str(d)
+        clash = clash_on(d, booked)
+        if key in mine:
+            result["existing"].append(d)
+        elif clash:
+            result["conflicts"].append((d, clash))
+        else:
+            rows.append({
+                "series_id": series["id"],
+                "date": key,
+                "start_time": start_time.strftime("%H:%M"),
+                "duration_minutes": length.seconds // 60,
+                "venue": series["venue"],
+                "courts": sorted(courts),
+                "max_players": series.get("max_players") or 8,
+                "fee_per_player": series.get("fee_per_player") or 0,
+                "created_by": series.get("created_by"),
+            })
+
+    if not rows:
+        return result
+    try:
+        # ON CONFLICT (series_id, date) DO NOTHING covers a concurrent regenerate.
+        batches = [insert_session(rows, skip_duplicates_on="series_id,date").data]
+    except CourtConflict:
+        # Someone booked one of these courts since we looked; find it row by row.
+        batches = []
+        for row in rows:
+            try:
+                batches.append(insert_session(row, skip_duplicates_on="series_id,date").data)
+            except CourtConflict:
+                # Report the session that took the courts, as the check above does.
+                d = date.fromisoformat(row["date"])
+                clash = clash_on(d, _booked(series["venue"], d, d)) or {
+                    "courts": row["courts"], "slot": series["slot"],
+                }
+                result["conflicts"].append((d, clash))
+    created = {r["date"] for batch in batches for r in batch}
+    conflicted = {d for d, _ in result["conflicts"]}
+    for row in rows:
+        d = date.fromisoformat(row["date"])
+        if row["date"] in created:
+            result["created"].append(d)
+        elif d not in conflicted:
+            result["existing"].append(d)
+    return result
@@ -0,0 +1,155 @@
+"""
+Cold-start profiler for every entry point (app.py and pages/*.py).
+
+Each script runs once under Streamlit's AppTest in a fresh interpreter started
+with ``-X importtime``. For each one we record:
+
+• import_ms       — time spent importing modules the script itself pulled in
+• first_delta_ms  — script start until its first element left the script thread
+• run_ms          — the whole first run
+
+Results are appended to .startup_profile.jsonl and compared with the previous
+run of the same script, so regressions are visible over time.
+
+    python -m utils.startup_profile            # profile every entry point
+    python -m utils.startup_profile app.py     # just one
+"""
+import json
+import os
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import datetime, timezone
+
+_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+_HISTORY = os.path.join(_ROOT, ".startup_profile.jsonl")
+_MARKER = "-- startup-profile: script imports begin --"
+
+
+def _entry_points() -> list[str]:
+    pages = sorted(
+        os.path.join("pages", f)
+        for f in os.listdir(os.path.join(_ROOT, "pages"))
+        if f.endswith(".py")
+    )
+    return ["app.py"] + pages
+
+
+def _child(script: str):
+    """Run *script* once under AppTest and print timings as JSON on stdout."""
+    from streamlit.runtime.forward_msg_queue import ForwardMsgQueue
+    from streamlit.testing.v1 import AppTest
+
+    # Warm Streamlit's own lazy imports so they are not billed to the page.
+    with tempfile.NamedTemporaryFile("w", suffix=".py", delete=False) as f:
+        f.write("import streamlit as st\nst.write('')\n")
+    AppTest.from_file(f.name).run()
+    os.unlink(f.name)
+
+    first_delta: list[float] = []
+    enqueue = ForwardMsgQueue.enqueue
+
+    def _timed_enqueue(self, msg):
+        if not first_delta and msg.WhichOneof("type") == "delta":
+            first_delta.append(time.perf_counter())
+        return enqueue(self, msg)
+
+    ForwardMsgQueue.enqueue = _timed_enqueue
+    print(_MARKER, file=sys.stderr, flush=True)
+
+    t0 = time.perf_counter()
+    AppTest.from_file(os.path.join(_ROOT, script), default_timeout=60).run()
+    t1 = time.perf_counter()
+    print(json.dumps({
+        "first_delta_ms": round((first_delta[0] - t0) * 1000, 1) if first_delta else None,
+        "run_ms": round((t1 - t0) * 1000, 1),
+    }))
+
+
+def _parse_importtime(stderr: str) -> tuple[float, list[tuple[str, float]]]:
+    """Sum self-time of imports after the marker; return (ms, top-level heavy hitters)."""
+    total_us, top = 0, []
+    seen_marker = False
+    for line in stderr.splitlines():
+        if line == _MARKER:
+            seen_marker = True
+            continue
+        if not seen_marker or not line.startswith("import time:"):
+            continue
+        try:
+            self_us, cumulative_us, name = line[len("import time:"):].split("|")
+            total_us += int(self_us)
+        except ValueError:
+            continue  # the header line
+        if not name.startswith("  "):  # depth 0: imported directly by the run
+            top.append((name.strip(), int(cumulative_us) / 1000))
+    top.sort(key=lambda t: t[1], reverse=True)
+    return total_us / 1000, top[:3]
+
+
+def profile(script: str) -> dict:
+    proc = subprocess.run(
+        [sys.executable, "-X", "importtime", "-m", "utils.startup_profile", "--child", script],
+        cwd=_ROOT, capture_output=True, text=True,
+    )
+    if proc.returncode != 0 or not proc.stdout.strip():
+        raise RuntimeError(f"{script} failed:\n{proc.stderr[-2000:]}")
+    timings = json.loads(proc.stdout.strip().splitlines()[-1])
+    import_ms, heaviest = _parse_importtime(proc.stderr)
+    return {
+        "script": script,
+        "import_ms": round(import_ms, 1),
+        **timings,
+        "heaviest": heaviest,
+    }
+
+
+def _git_commit() -> str | None:
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"], cwd=_ROOT,
+            capture_output=True, text=True, check=True,
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def _previous_runs() -> dict[str, dict]:
+    last = {}
+    if os.path.exists(_HISTORY):
+        with open(_HISTORY, encoding="utf-8") as f:
+            for line in f:
+                row = json.loads(line)
+                last[row["script"]] = row
+    return last
+
+
+def main(scripts: list[str]):
+    previous = _previous_runs()
+    stamp = {"ts": datetime.now(timezone.utc).isoformat(timespec="seconds"), "commit": _git_commit()}
+
+    print(f"{'entry point':32} {'imports':>10} {'1st delta':>10} {'run':>10}")
+    with open(_HISTORY, "a", encoding="utf-8") as history:
+        for script in scripts:
+            row = {**stamp, **profile(script)}
+            history.write(json.dumps(row) + "\n")
+
+            prev = previous.get(script)
+            cols = []
+            for key in ("import_ms", "first_delta_ms", "run_ms"):
+                cur = row[key]
+                cell = "—" if cur is None else f"{cur:.0f}ms"
+                if prev and prev.get(key) is not None and cur is not None:
+                    cell += f" ({cur - prev[key]:+.0f})"
+                cols.append(cell)
+            print(f"{script:32} {cols[0]:>10} {cols[1]:>10} {cols[2]:>10}")
+            if row["heaviest"]:
+                print("    heaviest: " + ", ".join(f"{n} {ms:.0f}ms" for n, ms in row["heaviest"]))
+
+
+if __name__ == "__main__":
+    if len(sys.argv) > 2 and sys.argv[1] == "--child":
+        _child(sys.argv[2])
+    else:
+        main(sys.argv[1:] or _entry_points())
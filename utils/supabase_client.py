@@ -1,71 +1,307 @@
 import os
-from supabase import create_client, Client
+import re
+import threading
+import time
+from datetime import date, time as dt_time, timedelta
+from typing import TYPE_CHECKING
+
 from dotenv import load_dotenv
 
+if TYPE_CHECKING:
+    from supabase import Client
+
 load_dotenv()
 
-_client: Client | None = None
+_client: "Client | None" = None
+
+
+def credentials() -> tuple[str, str]:
+    """(SUPABASE_URL, SUPABASE_KEY) from Streamlit secrets or the environment."""
+    try:
+        import streamlit as st
+        url = st.secrets.get("SUPABASE_URL", "") or os.environ.get("SUPABASE_URL", "")
+        key = st.secrets.get("SUPABASE_KEY", "") or os.environ.get("SUPABASE_KEY", "")
+    except Exception:
+        url = os.environ.get("SUPABASE_URL", "")
+        key = os.environ.get("SUPABASE_KEY", "")
+
+    if not url or not key:
+        raise ValueError(
+            "Missing SUPABASE_URL or SUPABASE_KEY. "
+            "Add them to .streamlit/secrets.toml or your .env file."
+        )
+    return url, key
 
 
-def get_client() -> Client:
+def get_client() -> "Client":
     global _client
     if _client is None:
-        try:
-            import streamlit as st
-            url = st.secrets.get("SUPABASE_URL", "") or os.environ.get("SUPABASE_URL", "")
-            key = st.secrets.get("SUPABASE_KEY", "") or os.environ.get("SUPABASE_KEY", "")
-        except Exception:
-            url = os.environ.get("SUPABASE_URL", "")
-            key = os.environ.get("SUPABASE_KEY", "")
-
-        if not url or not key:
-            raise ValueError(
-                "Missing SUPABASE_URL or SUPABASE_KEY. "
-                "Add them to .streamlit/secrets.toml or your .env file."
-            )
-        _client = create_client(url, key)
+        # supabase drags in httpx, gotrue, realtime and storage; import it on
+        # first use so pages that never reach the database don't pay for it.
+        from supabase import create_client
+
+        _client = create_client(*credentials())
     return _client
 
 
+# ── Version-checked read cache (migration_v16) ─────────────
+# Statement triggers bump a counter in table_versions on every write to the
+# tables below. Reads through fetch_all / fetch_view / fetch_sessions are
+# cached with the versions of the tables they depend on; one small query for
+# the version vector tells which cached results are still good. Writes made
+# through this module drop the vector so the next read sees them at once.
+
+_VERSIONED = ("players", "sessions", "attendance", "payments", "expenditures", "fee_audit_log")
+_DEPENDS = {
+    "session_slots":  ("sessions", "attendance"),
+    "player_balance": ("players", "attendance", "sessions", "payments"),
+}
+_VERSIONS_MAX_AGE = 1.0    # one vector query serves every read of a rerun
+_PUSHED_MAX_AGE = 30.0     # re-poll now and then even while a change feed pushes them
+_MAX_CACHED_READS = 512
+
+_versions: dict[str, int] = {}
+_versions_at = 0.0
+_versions_pushed = False
+_reads: dict[tuple, tuple[tuple, list[dict]]] = {}   # key → (versions, rows)
+_reads_lock = threading.Lock()
+_events: dict[str, int] = {}   # change-feed events seen per table
+_writes = 0                    # bumped by every write made through this module
+
+# Single-flight: concurrent identical reads share one request. Flights are
+# keyed by the versions the caller saw and the write count, so a reader that
+# has just written never joins a fetch that started before its write.
+_inflight: dict[tuple, "_Flight"] = {}
+_stats = {"hits": 0, "fetches": 0, "coalesced": 0}
+
+
+class _Flight:
+    def __init__(self):
+        self.done = threading.Event()
+        self.result = None
+        self.error: BaseException | None = None
+
+
+def _single_flight(key: tuple, fetch):
+    with _reads_lock:
+        flight = _inflight.get(key)
+        leader = flight is None
+        if leader:
+            flight = _inflight[key] = _Flight()
+            _stats["fetches"] += 1
+        else:
+            _stats["coalesced"] += 1
+    if not leader:
+        flight.done.wait()
+        if flight.error is not None:
+            raise flight.error
+        return flight.result
+    try:
+        flight.result = fetch()
+        return flight.result
+    except BaseException as e:
+        flight.error = e
+        raise
+    finally:
+        with _reads_lock:
+            _inflight.pop(key, None)
+        flight.done.set()
+
+
+def read_stats() -> dict[str, int]:
+    """Read-path counters: cache hits, fetches sent, and reads coalesced onto
+    another caller's in-flight fetch (the contention count)."""
+    with _reads_lock:
+        return dict(_stats, inflight=len(_inflight), cached=len(_reads))
+
+
+def table_versions() -> dict[str, int]:
+    """Current {table: version}, re-read at most every ``_VERSIONS_MAX_AGE`` s
+    (``_PUSHED_MAX_AGE`` while utils/changefeed.py keeps it current)."""
+    global _versions, _versions_at
+    max_age = _PUSHED_MAX_AGE if _versions_pushed else _VERSIONS_MAX_AGE
+    if _versions_at == 0.0 or time.monotonic() - _versions_at > max_age:
+        rows = _single_flight(
+            ("table_versions", _writes),
+            lambda: get_client().table("table_versions").select("table_name, version").execute().data,
+        )
+        _versions = {r["table_name"]: r["version"] for r in rows}
+        _versions_at = time.monotonic()
+    return _versions
+
+
+def invalidate_reads():
+    """Re-check table versions on the next read (called after every write)."""
+    global _versions_at, _writes
+    with _reads_lock:
+        _writes += 1
+        _versions_at = 0.0
+
+
+def _cached_read(key: tuple, tables: tuple, fetch) -> list[dict]:
+    if not all(t in _VERSIONED for t in tables):
+        rows = _single_flight((key, None, _writes), fetch)
+        return [dict(r) for r in rows]
+    # Versions are read before the rows, so a write racing the fetch can only
+    # cost an extra refetch, never a stale hit.
+    versions = table_versions()
+    seen = tuple(versions.get(t) for t in tables)
+    with _reads_lock:
+        hit = _reads.get(key)
+        marks = tuple(_events.get(t, 0) for t in tables)
+        fresh = hit is not None and hit[0] == seen and None not in seen
+        if fresh:
+            _stats["hits"] += 1
+    if fresh:
+        rows = hit[1]
+    else:
+        rows = _single_flight((key, seen, _writes), fetch)
+        with _reads_lock:
+            # A change event during the fetch may or may not be in *rows*;
+            # don't cache a result the feed could wrongly carry forward.
+            if marks == tuple(_events.get(t, 0) for t in tables):
+                _reads.pop(key, None)
+                _reads[key] = (seen, rows)
+                if len(_reads) > _MAX_CACHED_READS:
+                    _reads.pop(next(iter(_reads)))
+    # Callers may edit what they get back; hand out copies of the rows.
+    return [dict(r) for r in rows]
+
+
+def _sort_key(column: str):
+    # PostgREST's default: ascending, nulls last.
+    return lambda r: (r.get(column) is None, r.get(column) if r.get(column) is not None else 0)
+
+
+def follow_versions(pushed: bool):
+    """Switch between pushed versions (change feed subscribed) and polling.
+
+    Either way events may have been missed, so cached reads start over.
+    """
+    global _versions_pushed, _versions_at
+    with _reads_lock:
+        _versions_pushed = pushed
+        _versions_at = 0.0
+        _reads.clear()
+
+
+def apply_row_change(table: str, record: dict | None, old_record: dict | None):
+    """Patch cached fetch_all(*table*) results with one inserted/updated/deleted row."""
+    row_id = (record or old_record or {}).get("id")
+    with _reads_lock:
+        _events[table] = _events.get(table, 0) + 1
+        for key, (seen, rows) in list(_reads.items()):
+            if key[:2] != ("table", table):
+                continue
+            _, _, order, filters = key
+            patched = [r for r in rows if r.get("id") != row_id]
+            if record is not None and all(record.get(col) == val for col, val in filters):
+                patched.append(record)
+                if order:
+                    patched.sort(key=_sort_key(order))
+            # Copy-on-write: readers may be iterating the old list.
+            _reads[key] = (seen, patched)
+
+
+def apply_version(table: str, version: int, *, rows_patched: bool = False):
+    """Take a pushed table_versions bump.
+
+    With *rows_patched* (every row change of *table* was already applied by
+    apply_row_change) results cached at the previous version stay valid.
+    """
+    with _reads_lock:
+        _events[table] = _events.get(table, 0) + 1
+        if version <= _versions.get(table, -1):
+            return
+        if rows_patched:
+            for key, (seen, rows) in list(_reads.items()):
+                if key[:2] == ("table", table) and seen == (version - 1,):
+                    _reads[key] = ((version,), rows)
+        _versions[table] = version
+
+
 # ── Convenience query helpers ──────────────────────────────
 
 
 def fetch_all(table: str, *, order: str | None = None, filters: dict | None = None):
     """Return rows from *table*."""
-    q = get_client().table(table).select("*")
-    if filters:
-        for col, val in filters.items():
-            q = q.eq(col, val)
-    if order:
-        q = q.order(order)
-    return q.execute().data
+    def fetch():
+        q = get_client().table(table).select("*")
+        if filters:
+            for col, val in filters.items():
+                q = q.eq(col, val)
+        if order:
+            q = q.order(order)
+        return q.execute().data
+
+    key = ("table", table, order, tuple(sorted((filters or {}).items())))
+    return _cached_read(key, _DEPENDS.get(table, (table,)), fetch)
 
 
 def fetch_view(view: str):
-    return get_client().table(view).select("*").execute().data
+    return _cached_read(
+        ("view", view), _DEPENDS.get(view, (view,)),
+        lambda: get_client().table(view).select("*").execute().data,
+    )
+
+
+def fetch_sessions(*, upcoming: bool = False):
+    """session_slots rows in (date, start_time) order; upcoming=True drops past dates."""
+    today = date.today().isoformat()
+
+    def fetch():
+        q = get_client().table("session_slots").select("*")
+        if upcoming:
+            q = q.gte("date", today)
+        return q.order("date").order("start_time").execute().data
+
+    return _cached_read(("sessions", today if upcoming else None), _DEPENDS["session_slots"], fetch)
+
+
+def _written(result):
+    invalidate_reads()
+    return result
 
 
 def insert_row(table: str, data: dict):
-    return get_client().table(table).insert(data).execute()
+    return _written(get_client().table(table).insert(data).execute())
 
 
 def update_row(table: str, row_id: str, data: dict):
-    return get_client().table(table).update(data).eq("id", row_id).execute()
+    return _written(get_client().table(table).update(data).eq("id", row_id).execute())
 
 
 def delete_row(table: str, row_id: str):
-    return get_client().table(table).delete().eq("id", row_id).execute()
+    return _written(get_client().table(table).delete().eq("id", row_id).execute())
 
 
 def upsert_row(table: str, data: dict):
-    return get_client().table(table).upsert(data).execute()
+    return _written(get_client().table(table).upsert(data).execute())
 
 
 def bulk_update(table: str, ids: list[str], data: dict):
-    return get_client().table(table).update(data).in_("id", ids).execute()
+    return _written(get_client().table(table).update(data).in_("id", ids).execute())
 
 
 # ── Status transition helpers (the "app" feel) ─────────────
+# Each attendance status change queues a notification row (migration_v8
+# trigger); waking the outbox worker delivers it without waiting for a poll.
+
+
+def _wake_notifier(result):
+    from utils.notifications import notify_outbox
+
+    notify_outbox()
+    return result
+
+
+def _confirmation_changed(result):
+    """Confirming or un-confirming also moves co_attendance/slot_attendance
+    (migration_v13 triggers); have the next co-attendance read look for it."""
+    from utils import coattendance
+
+    coattendance.invalidate()
+    return _wake_notifier(result)
 
 
 def request_to_join(session_id: str, player_id: str, fee: float):
@@ -80,27 +316,51 @@ def request_to_join(session_id: str, player_id: str, fee: float):
 
 def confirm_request(attendance_id: str):
     """Coach confirms a pending request → status='confirmed'."""
-    return update_row("attendance", attendance_id, {"status": "confirmed"})
+    return _confirmation_changed(update_row("attendance", attendance_id, {"status": "confirmed"}))
 
 
 def reject_request(attendance_id: str):
     """Coach rejects a pending request → status='rejected'."""
-    return update_row("attendance", attendance_id, {"status": "rejected"})
+    return _confirmation_changed(update_row("attendance", attendance_id, {"status": "rejected"}))
 
 
 def send_invite(session_id: str, player_id: str, fee: float):
     """Coach invites a player → status='invited'."""
-    return insert_row("attendance", {
+    return _wake_notifier(insert_row("attendance", {
         "session_id": session_id,
         "player_id": player_id,
         "status": "invited",
         "fee_charged": fee,
-    })
+    }))
+
+
+def send_invites(session_id: str, player_ids: list[str], fee: float) -> tuple[list[str], list[str]]:
+    """Invite many players in one statement → (created, skipped) player IDs.
+
+    Players who already have an attendance row for the session (any status)
+    are left untouched by ON CONFLICT DO NOTHING on UNIQUE(session_id, player_id).
+    """
+    if not player_ids:
+        return [], []
+    rows = [
+        {"session_id": session_id, "player_id": pid, "status": "invited", "fee_charged": fee}
+        for pid in player_ids
+    ]
+    # ignore_duplicates returns only the rows that were actually inserted.
+    inserted = _written(get_client().table("attendance").upsert(
+        rows, on_conflict="session_id,player_id", ignore_duplicates=True,
+    ).execute()).data
+    created = {r["player_id"] for r in inserted}
+    _wake_notifier(None)
+    return (
+        [pid for pid in player_ids if pid in created],
+        [pid for pid in player_ids if pid not in created],
+    )
 
 
 def bulk_confirm(ids: list[str]):
     """Coach bulk-confirms a list of pending attendance IDs."""
-    return bulk_update("attendance", ids, {"status": "confirmed"})
+    return _confirmation_changed(bulk_update("attendance", ids, {"status": "confirmed"}))
 
 
 # ── Fee & Payment helpers with audit trail ──────────────────
@@ -110,84 +370,240 @@ def set_player_fee(attendance_id: str, session_id: str, player_id: str,
                    old_fee: float, new_fee: float, changed_by: str = "coach"):
     """Set or update a player's fee for a session and log it."""
     action = "fee_set" if old_fee == 0 else "fee_updated"
+    from utils.audit import log_audit
+
     update_row("attendance", attendance_id, {"fee_charged": new_fee})
-    try:
-        insert_row("fee_audit_log", {
-            "attendance_id": attendance_id,
-            "player_id": player_id,
-            "session_id": session_id,
-            "action": action,
-            "old_value": float(old_fee),
-            "new_value": float(new_fee),
-            "changed_by": changed_by,
-        })
-    except Exception:
-        # Keep core workflow running even if audit table is not deployed yet.
-        pass
+    log_audit({
+        "attendance_id": attendance_id,
+        "player_id": player_id,
+        "session_id": session_id,
+        "action": action,
+        "old_value": float(old_fee),
+        "new_value": float(new_fee),
+        "changed_by": changed_by,
+    })
 
 
-def record_payment_with_audit(attendance_id: str, session_id: str,
-                              player_id: str, amount: float,
+# Explicit "UTR: 4521..." / "ref ABC123" labels first, then a bare 12-digit UPI UTR.
+# Keep in sync with the backfill in migration_v6.sql.
+_REF_LABEL_RE = re.compile(r"(?:utr|ref(?:erence)?|txn|upi)\W*(?=[a-z0-9]{6})([a-z]*\d[a-z0-9]*)", re.IGNORECASE)
+_UTR_RE = re.compile(r"\b(\d{12})\b")
+
+
+def extract_payment_reference(notes: str | None) -> str | None:
+    """Pull the UTR / transaction reference out of a free-text payment note."""
+    if not notes:
+        return None
+    m = _REF_LABEL_RE.search(notes) or _UTR_RE.search(notes)
+    return m.group(1).upper() if m else None
+
+
+def search_payment_references(fragment: str, limit: int = 20) -> dict:
+    """Find payments and audit entries whose reference contains *fragment*.
+
+    Uses the trigram indexes from migration_v6.sql, so partial UTRs work.
+    """
+    pattern = f"%{fragment.strip()}%"
+    payments = (
+        get_client().table("payments")
+        .select("id, amount, payment_date, reference, notes, player:players(name, avatar_emoji)")
+        .ilike("reference", pattern)
+        .order("payment_date", desc=True)
+        .limit(limit)
+        .execute().data
+    )
+    audit = (
+        get_client().table("fee_audit_log")
+        .select("id, action, old_value, new_value, changed_by, reference, created_at, "
+                "player:players(name, avatar_emoji)")
+        .ilike("reference", pattern)
+        .order("created_at", desc=True)
+        .limit(limit)
+        .execute().data
+    )
+    return {"payments": payments, "audit": audit}
+
+
+class DuplicatePayment(Exception):
+    """The payment is already recorded: its UTR is taken, or a session it
+    pays changed since the form was shown (a double submit)."""
+
+
+def record_payment_with_audit(player_id: str, allocations: list[dict],
                               payment_date: str, changed_by: str = "player",
-                              notes: str | None = None):
-    """Player marks a session as paid. Records payment + audit log entry.
-    Also inserts into the payments table for the global ledger."""
-    # Get current state
-    row = get_client().table("attendance").select("amount_paid, fee_charged").eq(
-        "id", attendance_id
-    ).single().execute().data
-    old_paid = float(row["amount_paid"])
-    new_paid = old_paid + amount
-
-    # Update attendance
-    update_row("attendance", attendance_id, {"amount_paid": new_paid})
-
-    # Global payments ledger
-    insert_row("payments", {
-        "player_id": player_id,
-        "amount": float(amount),
-        "payment_date": payment_date,
-        "notes": notes,
-    })
+                              notes: str | None = None,
+                              reference: str | None = None):
+    """Record one payment and apply it to the player's sessions.
 
-    # Audit log
+    *allocations* is [{"attendance_id", "session_id", "amount",
+    "expected_paid"}], expected_paid being the amount_paid the payer saw.
+    The ledger row and every amount_paid update happen in one transaction
+    (record_payment, migration_v18.sql); DuplicatePayment means nothing was
+    written. One audit entry per session follows.
+    *reference* defaults to the UTR found in *notes*, if any."""
+    from postgrest.exceptions import APIError
+
+    from utils.audit import log_audit
+
+    reference = reference or extract_payment_reference(notes)
     try:
-        insert_row("fee_audit_log", {
-            "attendance_id": attendance_id,
+        applied = get_client().rpc("record_payment", {
+            "p_player_id": player_id,
+            "p_payment_date": payment_date,
+            "p_notes": notes,
+            "p_reference": reference,
+            "p_allocations": [
+                {"attendance_id": a["attendance_id"], "amount": float(a["amount"]),
+                 "expected_paid": float(a["expected_paid"])}
+                for a in allocations
+            ],
+        }).execute().data
+    except APIError as e:
+        if e.code == "23505":  # unique_violation
+            raise DuplicatePayment(e.message) from e
+        raise
+    invalidate_reads()
+
+    sessions = {a["attendance_id"]: a["session_id"] for a in allocations}
+    for row in applied:
+        entry = {
+            "attendance_id": row["paid_attendance_id"],
             "player_id": player_id,
-            "session_id": session_id,
+            "session_id": sessions[row["paid_attendance_id"]],
             "action": "payment_recorded",
-            "old_value": old_paid,
-            "new_value": new_paid,
+            "old_value": float(row["paid_before"]),
+            "new_value": float(row["paid_after"]),
             "changed_by": changed_by,
             "notes": notes,
-        })
-    except Exception:
-        # Keep payment recording available if fee_audit_log is missing.
-        pass
+        }
+        if reference:
+            entry["reference"] = reference
+        log_audit(entry)
+
+
+def fetch_audit_log(*, limit: int = 50, cursor: tuple[str, str] | None = None,
+                    player_id: str | None = None, session_id: str | None = None,
+                    action: str | None = None, date_from: date | None = None,
+                    date_to: date | None = None):
+    """Return one newest-first page of fee_audit_log and the next-page cursor.
+
+    Keyset pagination on (created_at, id): pass the returned cursor back to get
+    the next (older) page; it is None on the last page. Player names are
+    embedded so no separate players lookup is needed.
+    """
+    q = get_client().table("fee_audit_log").select(
+        "id, action, old_value, new_value, changed_by, notes, created_at, "
+        "player_id, session_id, player:players(name, avatar_emoji)"
+    )
+    if player_id:
+        q = q.eq("player_id", player_id)
+    if session_id:
+        q = q.eq("session_id", session_id)
+    if action:
+        q = q.eq("action", action)
+    if date_from:
+        q = q.gte("created_at", date_from.isoformat())
+    if date_to:
+        q = q.lt("created_at", (date_to + timedelta(days=1)).isoformat())
+    if cursor:
+        ts, last_id = cursor
+        q = q.or_(f'created_at.lt."{ts}",and(created_at.eq."{ts}",id.lt.{last_id})')
+
+    rows = (
+        q.order("created_at", desc=True)
+        .order("id", desc=True)
+        .limit(limit + 1)
+        .execute().data
+    )
+    if len(rows) > limit:
+        rows = rows[:limit]
+        return rows, (rows[-1]["created_at"], rows[-1]["id"])
+    return rows, None
+
+
+# ── Venues & courts (migration_v10) ─────────────────────────
+
+_VENUES_TTL = 300          # venues change rarely; re-read every 5 minutes
+_venues: dict[str, dict] = {}
+_venues_at = 0.0
+
+
+class CourtConflict(Exception):
+    """A session write would double-book a court (sessions_no_court_overlap)."""
+
+
+def _raising_court_conflicts(write):
+    from postgrest.exceptions import APIError
 
-
-# ── Venue / Court constants ─────────────────────────────────
-
-VENUES = {
-    "Pro-Sports": {"courts": [1, 2, 3]},
-    "Hermes":     {"courts": [1, 2, 3, 4, 5, 6, 7]},
-}
+    try:
+        return write()
+    except APIError as e:
+        if e.code == "23P01":  # exclusion_violation
+            raise CourtConflict(e.message) from e
+        raise
+
+
+def insert_session(data: dict | list[dict], *, skip_duplicates_on: str | None = None):
+    """Insert session row(s); raises CourtConflict if a court is already booked then.
+
+    With *skip_duplicates_on* (e.g. "series_id,date") rows hitting that unique
+    key are skipped via ON CONFLICT DO NOTHING and only inserted rows come back.
+    """
+    if skip_duplicates_on:
+        return _raising_court_conflicts(lambda: _written(get_client().table("sessions").upsert(
+            data, on_conflict=skip_duplicates_on, ignore_duplicates=True,
+        ).execute()))
+    return _raising_court_conflicts(lambda: insert_row("sessions", data))
+
+
+def update_session(session_id: str, data: dict):
+    return _raising_court_conflicts(lambda: update_row("sessions", session_id, data))
+
+
+def get_venues() -> dict[str, dict]:
+    """Active venues → {"courts": [court numbers]}, e.g. {"Hermes": {"courts": [1, …, 7]}}."""
+    global _venues, _venues_at
+    if not _venues or time.monotonic() - _venues_at > _VENUES_TTL:
+        rows = (
+            get_client().table("venues")
+            .select("name, courts(number)")
+            .eq("is_active", True).order("name")
+            .execute().data
+        )
+        _venues = {
+            v["name"]: {"courts": sorted(c["number"] for c in v.get("courts") or [])}
+            for v in rows
+        }
+        _venues_at = time.monotonic()
+    return _venues
+
+
+def free_courts(venue: str, on: date, start: dt_time, minutes: int = 120,
+                exclude_session: str | None = None) -> list[int]:
+    """Courts at *venue* not booked by any session overlapping the given period."""
+    rows = get_client().rpc("free_courts", {
+        "p_venue": venue,
+        "p_date": str(on),
+        "p_start": start.strftime("%H:%M"),
+        "p_minutes": minutes,
+        "p_exclude": exclude_session,
+    }).execute().data
+    return [r["number"] for r in rows]
 
 
 def accept_invite(attendance_id: str, fee: float):
     """Player accepts an invite → status='confirmed'."""
-    return update_row("attendance", attendance_id, {
+    return _confirmation_changed(update_row("attendance", attendance_id, {
         "status": "confirmed",
         "fee_charged": fee,
-    })
+    }))
 
 
 def decline_invite(attendance_id: str):
     """Player declines an invite → status='rejected'."""
-    return update_row("attendance", attendance_id, {"status": "rejected"})
+    return _confirmation_changed(update_row("attendance", attendance_id, {"status": "rejected"}))
 
 
 def bulk_confirm(attendance_ids: list[str]):
     """Coach bulk-confirms all pending requests."""
-    return bulk_update("attendance", attendance_ids, {"status": "confirmed"})
+    return _confirmation_changed(bulk_update("attendance", attendance_ids, {"status": "confirmed"}))